@@ -0,0 +1,6 @@
+import sys
+
+if __name__ == "__main__":
+    from benchmarks.run import benchmark_cli
+
+    sys.exit(benchmark_cli())
@@ -0,0 +1,333 @@
+"""Generate synthetic iXBRL and XBRL documents for benchmarking.
+
+The documents are made from a seeded random number generator, so the same
+`DocumentSpec` always gives the same document.
+"""
+
+import base64
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from xml.sax.saxutils import escape
+
+ENTITY_SCHEME = "http://www.companieshouse.gov.uk/"
+SCHEMA_URL = "https://xbrl.frc.org.uk/FRS-102/2014-09-01/FRS-102-2014-09-01.xsd"
+
+NAMESPACES = {
+    "iso4217": "http://www.xbrl.org/2003/iso4217",
+    "ix": "http://www.xbrl.org/2008/inlineXBRL",
+    "ixt": "http://www.xbrl.org/inlineXBRL/transformation/2010-04-20",
+    "ixt2": "http://www.xbrl.org/inlineXBRL/transformation/2011-07-31",
+    "link": "http://www.xbrl.org/2003/linkbase",
+    "uk-bus": "http://xbrl.frc.org.uk/cd/2014-09-01/business",
+    "uk-core": "http://xbrl.frc.org.uk/fr/2014-09-01/core",
+    "xbrldi": "http://xbrl.org/2006/xbrldi",
+    "xbrli": "http://www.xbrl.org/2003/instance",
+    "xlink": "http://www.w3.org/1999/xlink",
+}
+
+UNITS = {"GBP": "iso4217:GBP", "EUR": "iso4217:EUR", "shares": "xbrli:shares"}
+
+DIMENSIONS = [
+    "uk-bus:EntityOfficersDimension",
+    "uk-core:ShareClassesDimension",
+    "uk-core:PropertyPlantEquipmentClassesDimension",
+    "uk-core:AgeingOfFinancialInstrumentsDimension",
+]
+
+WORDS = (
+    "the company has been dormant throughout the year and the directors "
+    "confirm that the accounts have been prepared in accordance with the "
+    "provisions applicable to companies subject to the small companies regime"
+).split()
+
+NUMBER_WORDS = ["zero", "one", "two", "three", "four", "five", "six", "ten"]
+
+
+@dataclass(frozen=True)
+class DocumentSpec:
+    """The size and make-up of a synthetic document.
+
+    Attributes:
+        facts: The number of numeric facts.
+        nonnumeric: The number of non-numeric facts.
+        contexts: The number of contexts.
+        dimensional: The fraction of contexts which have segments.
+        segments: The maximum number of segments in a dimensional context.
+        continuations: The number of non-numeric facts continued with
+            `ix:continuation` elements (iXBRL only).
+        continuation_links: The number of links in each continuation chain.
+        images: The number of embedded base64 images (iXBRL only).
+        image_size: The size of each image in bytes, before encoding.
+        seed: The seed for the random number generator.
+    """
+
+    facts: int = 1_000
+    nonnumeric: int = 200
+    contexts: int = 50
+    dimensional: float = 0.3
+    segments: int = 2
+    continuations: int = 10
+    continuation_links: int = 5
+    images: int = 2
+    image_size: int = 20_000
+    seed: int = 0
+
+
+# named document sizes used by the benchmark runner
+SIZES = {
+    "small": DocumentSpec(facts=100, nonnumeric=30, contexts=10, images=1),
+    "medium": DocumentSpec(),
+    "large": DocumentSpec(
+        facts=20_000,
+        nonnumeric=4_000,
+        contexts=500,
+        continuations=100,
+        continuation_links=20,
+        images=10,
+        image_size=100_000,
+    ),
+}
+
+
+@dataclass(frozen=True)
+class _Context:
+    id: str
+    instant: date | None
+    startdate: date | None
+    enddate: date | None
+    segments: tuple[tuple[str, str], ...]
+
+
+def _contexts(rng: random.Random, spec: DocumentSpec) -> list[_Context]:
+    period_end = date(2023, 3, 31)
+    contexts = []
+    for i in range(max(spec.contexts, 1)):
+        end = period_end - timedelta(days=365 * (i % 3))
+        segments: tuple[tuple[str, str], ...] = ()
+        if i > 0 and rng.random() < spec.dimensional:
+            dimensions = rng.sample(DIMENSIONS, min(spec.segments, len(DIMENSIONS)))
+            segments = tuple(
+                (d, f"{d.split(':')[0]}:Member{rng.randint(1, 20)}")
+                for d in dimensions[: rng.randint(1, len(dimensions))]
+            )
+        if i % 2 == 0:
+            contexts.append(_Context(f"i{i}", end, None, None, segments))
+        else:
+            start = end - timedelta(days=364)
+            contexts.append(_Context(f"d{i}", None, start, end, segments))
+    return contexts
+
+
+def _numeric_value(rng: random.Random) -> tuple[str, str]:
+    """Get a format and the text of a numeric fact in that format."""
+    value = rng.randint(0, 10_000_000)
+    choice = rng.random()
+    if choice < 0.6:  # noqa: PLR2004
+        return "ixt2:numdotdecimal", f"{value:,}"
+    if choice < 0.75:  # noqa: PLR2004
+        return "ixt:numdotdecimal", f"{value:,}.{rng.randint(0, 99):02d}"
+    if choice < 0.85:  # noqa: PLR2004
+        return "ixt2:numcommadecimal", f"{value:,}".replace(",", ".") + ",00"
+    if choice < 0.97:  # noqa: PLR2004
+        return "ixt2:zerodash", "-"
+    return "ixt2:numwordsen", rng.choice(NUMBER_WORDS)
+
+
+def _nonnumeric_value(rng: random.Random) -> tuple[str | None, str]:
+    """Get a format (or None) and the text of a non-numeric fact."""
+    choice = rng.random()
+    day = date(2023, 3, 31) - timedelta(days=rng.randint(0, 1000))
+    if choice < 0.2:  # noqa: PLR2004
+        return "ixt2:datedaymonthyearen", day.strftime("%d %B %Y")
+    if choice < 0.3:  # noqa: PLR2004
+        return "ixt2:datedaymonthyear", day.strftime("%d/%m/%Y")
+    if choice < 0.4:  # noqa: PLR2004
+        return "ixt2:booleantrue", ""
+    if choice < 0.45:  # noqa: PLR2004
+        return "ixt2:nocontent", ""
+    return None, _sentence(rng)
+
+
+def _sentence(rng: random.Random, words: int = 12) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _concept(rng: random.Random, prefix: str = "uk-core") -> str:
+    return f"{prefix}:Concept{rng.randint(1, 300)}"
+
+
+def _image(rng: random.Random, size: int) -> str:
+    data = base64.b64encode(rng.randbytes(size)).decode("ascii")
+    return f'<img alt="" src="data:image/png;base64,{data}"/>'
+
+
+def generate_ixbrl(spec: DocumentSpec | None = None) -> str:
+    """Generate an iXBRL document.
+
+    Parameters:
+        spec:  The size and make-up of the document. Defaults to a
+            `DocumentSpec` with its default values.
+    """
+    spec = spec or DocumentSpec()
+    rng = random.Random(spec.seed)  # noqa: S311
+    contexts = _contexts(rng, spec)
+
+    resources = []
+    for c in contexts:
+        segment = ""
+        if c.segments:
+            members = "".join(
+                f'<xbrldi:explicitMember dimension="{d}">{m}</xbrldi:explicitMember>'
+                for d, m in c.segments
+            )
+            segment = f"<xbrli:segment>{members}</xbrli:segment>"
+        if c.instant is not None:
+            period = f"<xbrli:instant>{c.instant}</xbrli:instant>"
+        else:
+            period = (
+                f"<xbrli:startDate>{c.startdate}</xbrli:startDate>"
+                f"<xbrli:endDate>{c.enddate}</xbrli:endDate>"
+            )
+        resources.append(
+            f'<xbrli:context id="{c.id}"><xbrli:entity>'
+            f'<xbrli:identifier scheme="{ENTITY_SCHEME}">01234567</xbrli:identifier>'
+            f"{segment}</xbrli:entity><xbrli:period>{period}</xbrli:period>"
+            "</xbrli:context>"
+        )
+    resources.extend(
+        f'<xbrli:unit id="{unit_id}"><xbrli:measure>{measure}</xbrli:measure>'
+        "</xbrli:unit>"
+        for unit_id, measure in UNITS.items()
+    )
+
+    rows = []
+    image_every = spec.facts // spec.images + 1 if spec.images else 0
+    images = 0
+    for i in range(spec.facts):
+        fmt, text = _numeric_value(rng)
+        attrs = ""
+        if rng.random() < 0.1:  # noqa: PLR2004
+            attrs += ' sign="-"'
+        if rng.random() < 0.1:  # noqa: PLR2004
+            attrs += f' scale="{rng.choice([3, 6])}"'
+        unit = "shares" if rng.random() < 0.05 else "GBP"  # noqa: PLR2004
+        rows.append(
+            f"<tr><td>{escape(_sentence(rng, 4))}</td><td>"
+            f'<ix:nonFraction contextRef="{rng.choice(contexts).id}" decimals="0" '
+            f'format="{fmt}" name="{_concept(rng)}" unitRef="{unit}"{attrs}>'
+            f"{text}</ix:nonFraction></td></tr>"
+        )
+        if image_every and i % image_every == 0 and images < spec.images:
+            rows.append(f"<tr><td>{_image(rng, spec.image_size)}</td></tr>")
+            images += 1
+
+    paragraphs = []
+    continuations: list[str] = []
+    for _ in range(spec.nonnumeric):
+        nonnumeric_fmt, text = _nonnumeric_value(rng)
+        attrs = f' format="{nonnumeric_fmt}"' if nonnumeric_fmt else ""
+        # only continue text facts, as the continued text isn't a valid value
+        # for the other formats
+        i = len(continuations) // max(spec.continuation_links, 1)
+        if (
+            nonnumeric_fmt is None
+            and i < spec.continuations
+            and spec.continuation_links
+        ):
+            attrs += f' continuedAt="c{i}-0"'
+            for link in range(spec.continuation_links):
+                continued_at = (
+                    f' continuedAt="c{i}-{link + 1}"'
+                    if link < spec.continuation_links - 1
+                    else ""
+                )
+                continuations.append(
+                    f'<p><ix:continuation id="c{i}-{link}"{continued_at}>'
+                    f"{escape(_sentence(rng))}</ix:continuation></p>"
+                )
+        paragraphs.append(
+            f'<p><ix:nonNumeric contextRef="{rng.choice(contexts).id}" '
+            f'name="{_concept(rng, "uk-bus")}"{attrs}>'
+            f"{escape(text)}</ix:nonNumeric></p>"
+        )
+
+    xmlns = " ".join(f'xmlns:{k}="{v}"' for k, v in NAMESPACES.items())
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<html xmlns="http://www.w3.org/1999/xhtml" {xmlns}>'
+        "<head><title>Synthetic accounts</title></head><body>"
+        '<div style="display: none"><ix:header><ix:references>'
+        f'<link:schemaRef xlink:href="{SCHEMA_URL}" xlink:type="simple"/>'
+        f"</ix:references><ix:resources>{''.join(resources)}</ix:resources>"
+        "</ix:header></div>"
+        f"<table>{''.join(rows)}</table>"
+        f"{''.join(paragraphs)}"
+        f"{''.join(continuations)}"
+        "</body></html>"
+    )
+
+
+def generate_xbrl(spec: DocumentSpec | None = None) -> str:
+    """Generate an XBRL document.
+
+    Continuations and images are not used, as they are only part of iXBRL.
+
+    Parameters:
+        spec:  The size and make-up of the document. Defaults to a
+            `DocumentSpec` with its default values.
+    """
+    spec = spec or DocumentSpec()
+    rng = random.Random(spec.seed)  # noqa: S311
+    contexts = _contexts(rng, spec)
+
+    parts = [
+        f'<schemaRef xlink:href="{SCHEMA_URL}" xlink:type="simple"/>',
+    ]
+    parts.extend(
+        f'<unit id="{unit_id}"><measure>{measure}</measure></unit>'
+        for unit_id, measure in UNITS.items()
+    )
+    for c in contexts:
+        segment = ""
+        if c.segments:
+            members = "".join(
+                f'<xbrldi:explicitMember dimension="{d}">{m}</xbrldi:explicitMember>'
+                for d, m in c.segments
+            )
+            segment = f"<segment>{members}</segment>"
+        if c.instant is not None:
+            period = f"<instant>{c.instant}</instant>"
+        else:
+            period = (
+                f"<startDate>{c.startdate}</startDate><endDate>{c.enddate}</endDate>"
+            )
+        parts.append(
+            f'<context id="{c.id}"><entity>'
+            f'<identifier scheme="{ENTITY_SCHEME}">01234567</identifier>'
+            f"{segment}</entity><period>{period}</period></context>"
+        )
+    for _ in range(spec.facts):
+        name = _concept(rng, "ae")
+        unit = "shares" if rng.random() < 0.05 else "GBP"  # noqa: PLR2004
+        parts.append(
+            f'<{name} contextRef="{rng.choice(contexts).id}" unitRef="{unit}" '
+            f'decimals="0">{rng.randint(0, 10_000_000)}</{name}>'
+        )
+    for _ in range(spec.nonnumeric):
+        name = _concept(rng, "ae")
+        parts.append(
+            f'<{name} contextRef="{rng.choice(contexts).id}">'
+            f"{escape(_sentence(rng))}</{name}>"
+        )
+
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<xbrl xmlns="http://www.xbrl.org/2003/instance" '
+        'xmlns:ae="http://www.companieshouse.gov.uk/ef/xbrl/uk/fr/gaap/ae/2009-06-21" '
+        f'xmlns:iso4217="{NAMESPACES["iso4217"]}" '
+        f'xmlns:xbrldi="{NAMESPACES["xbrldi"]}" '
+        f'xmlns:xbrli="{NAMESPACES["xbrli"]}" '
+        f'xmlns:xlink="{NAMESPACES["xlink"]}">'
+        f"{''.join(parts)}</xbrl>"
+    )
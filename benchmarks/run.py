@@ -0,0 +1,275 @@
+"""Run the benchmarks and compare them with a saved baseline.
+
+Each case parses a synthetic document (see `benchmarks.generate`) with one of
+the parser engines, and reports the time and peak memory of each of the phases
+recorded in `IXBRL.stats`, along with the documents and facts parsed per
+second.
+"""
+
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import click
+
+from benchmarks.generate import SIZES, generate_ixbrl, generate_xbrl
+from ixbrlparse.__about__ import __version__
+from ixbrlparse.core import ENGINES, IXBRL
+from ixbrlparse.stats import ParseStats
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+# the slowdown compared with the baseline which counts as a regression
+DEFAULT_THRESHOLD = 1.2
+# phases quicker than this are too noisy to compare with the baseline
+MIN_COMPARE_SECONDS = 0.001
+
+DOCUMENT_TYPES: dict[str, Callable] = {
+    "ixbrl": generate_ixbrl,
+    "xbrl": generate_xbrl,
+}
+
+
+@dataclass
+class CaseResult:
+    """The results of one benchmark case.
+
+    Attributes:
+        seconds: The time taken by each phase, and in total, in seconds. This
+            is the fastest of the repeated runs.
+        peak_memory: The peak memory allocated during each phase, and in
+            total, in bytes.
+        facts: The number of facts in the document.
+        size: The size of the document in bytes."""
+
+    seconds: dict[str, float] = field(default_factory=dict)
+    peak_memory: dict[str, int] = field(default_factory=dict)
+    facts: int = 0
+    size: int = 0
+
+    @property
+    def docs_per_second(self) -> float:
+        return 1 / self.seconds["total"]
+
+    @property
+    def facts_per_second(self) -> float:
+        return self.facts / self.seconds["total"]
+
+
+class PhaseRecorder(ParseStats):
+    """Record the time or peak memory of each phase of a run.
+
+    This is passed to the parser in place of its `ParseStats`, so it records
+    the same phases as `IXBRL.stats`."""
+
+    def __init__(self, *, memory: bool = False) -> None:
+        super().__init__()
+        self.memory = memory
+        self.values: dict[str, float] = {}
+        # the highest memory seen so far in each open phase, as phases inside
+        # it reset the peak recorded by tracemalloc
+        self._peaks: list[int] = []
+
+    def _update_peaks(self) -> None:
+        _, peak = tracemalloc.get_traced_memory()
+        self._peaks = [max(p, peak) for p in self._peaks]
+
+    @contextmanager
+    def phase(self, name: str, parser: Any = None) -> Iterator[None]:  # noqa: ARG002
+        if self.memory:
+            self._update_peaks()
+            start, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            self._peaks.append(start)
+            try:
+                yield
+            finally:
+                self._update_peaks()
+                self.values[name] = self._peaks.pop() - start
+        else:
+            start_time = time.perf_counter()
+            yield
+            self.values[name] = time.perf_counter() - start_time
+
+
+def parse(data: bytes, engine: str, recorder: PhaseRecorder) -> IXBRL:
+    """Parse a document with an engine, recording each phase."""
+    return IXBRL(io.BytesIO(data), engine=engine, stats=recorder)
+
+
+def run_case(data: bytes, engine: str, repeat: int = 3) -> CaseResult:
+    """Run one benchmark case.
+
+    The document is parsed `repeat` times to measure the time of each phase,
+    then once more with `tracemalloc` running to measure memory, as tracing
+    slows down parsing."""
+    result = CaseResult(size=len(data))
+    for _ in range(repeat):
+        timer = PhaseRecorder()
+        with timer.phase("total"):
+            x = parse(data, engine, timer)
+        for phase, seconds in timer.values.items():
+            result.seconds[phase] = min(seconds, result.seconds.get(phase, seconds))
+    result.facts = len(x.numeric) + len(x.nonnumeric)
+
+    tracemalloc.start()
+    try:
+        memory = PhaseRecorder(memory=True)
+        with memory.phase("total"):
+            parse(data, engine, memory)
+        result.peak_memory = {k: int(v) for k, v in memory.values.items()}
+    finally:
+        tracemalloc.stop()
+    return result
+
+
+def run(
+    sizes: list[str], engines: list[str], repeat: int = 3
+) -> Iterator[tuple[str, CaseResult]]:
+    """Run the benchmark for each size, document type and engine, yielding
+    the name of each case and its result."""
+    for size in sizes:
+        for doctype, generate in DOCUMENT_TYPES.items():
+            data = generate(SIZES[size]).encode("utf-8")
+            for engine in engines:
+                yield f"{size}-{doctype}-{engine}", run_case(data, engine, repeat)
+
+
+def baseline_path(name: str) -> Path:
+    return BASELINE_DIR / f"{name}.json"
+
+
+def save_baseline(name: str, results: dict[str, CaseResult]) -> Path:
+    """Save the results as a named baseline."""
+    path = baseline_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as a:
+        json.dump(
+            {
+                "ixbrlparse": __version__,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": {case: asdict(r) for case, r in results.items()},
+            },
+            a,
+            indent=2,
+        )
+        a.write("\n")
+    return path
+
+
+def load_baseline(name: str) -> dict[str, CaseResult]:
+    """Load a saved baseline."""
+    with open(baseline_path(name), encoding="utf-8") as a:
+        baseline = json.load(a)
+    return {case: CaseResult(**r) for case, r in baseline["results"].items()}
+
+
+def compare(
+    results: dict[str, CaseResult],
+    baseline: dict[str, CaseResult],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[str]:
+    """Compare results with a baseline, returning the phases of each case
+    which are slower than the baseline by more than `threshold` times."""
+    regressions = []
+    for case, result in results.items():
+        if case not in baseline:
+            continue
+        for phase, seconds in result.seconds.items():
+            base = baseline[case].seconds.get(phase)
+            if (
+                base
+                and max(seconds, base) >= MIN_COMPARE_SECONDS
+                and seconds / base > threshold
+            ):
+                regressions.append(f"{case} {phase}")
+    return regressions
+
+
+def _format_phases(values: dict, fmt: Callable) -> str:
+    return ", ".join(f"{phase} {fmt(v)}" for phase, v in values.items())
+
+
+@click.command()
+@click.option(
+    "--size",
+    "sizes",
+    multiple=True,
+    type=click.Choice(list(SIZES)),
+    help="Document sizes to run (defaults to small and medium)",
+)
+@click.option(
+    "--engine",
+    "engines",
+    multiple=True,
+    type=click.Choice(ENGINES),
+    help="Parser engines to run (defaults to all)",
+)
+@click.option(
+    "--repeat",
+    default=3,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of times to parse each document",
+)
+@click.option("--save", default=None, help="Save the results as a named baseline")
+@click.option(
+    "--compare",
+    "compare_to",
+    default=None,
+    help="Compare the results with a named baseline",
+)
+@click.option(
+    "--threshold",
+    default=DEFAULT_THRESHOLD,
+    show_default=True,
+    type=click.FloatRange(min=1),
+    help="Slowdown compared with the baseline which counts as a regression",
+)
+def benchmark_cli(  # noqa: PLR0917
+    sizes: tuple[str, ...],
+    engines: tuple[str, ...],
+    repeat: int,
+    save: str | None,
+    compare_to: str | None,
+    threshold: float,
+):
+    """Benchmark parsing synthetic iXBRL and XBRL documents."""
+    baseline = load_baseline(compare_to) if compare_to else {}
+    results: dict[str, CaseResult] = {}
+    for case, result in run(
+        list(sizes or ("small", "medium")), list(engines or ENGINES), repeat
+    ):
+        results[case] = result
+        click.echo(
+            f"{case}: {result.docs_per_second:,.1f} docs/sec, "
+            f"{result.facts_per_second:,.0f} facts/sec, "
+            f"peak memory {result.peak_memory['total'] / 1024**2:,.1f} MB"
+        )
+        click.echo(
+            "  time: " + _format_phases(result.seconds, lambda v: f"{v * 1000:.1f}ms")
+        )
+        click.echo(
+            "  peak memory: "
+            + _format_phases(result.peak_memory, lambda v: f"{v / 1024**2:.1f}MB")
+        )
+        if case in baseline:
+            change = result.seconds["total"] / baseline[case].seconds["total"]
+            click.echo(f"  {change:.2f}x the time of baseline {compare_to}")
+
+    if save:
+        click.echo(f"Saved baseline to {save_baseline(save, results)}")
+    if compare_to:
+        regressions = compare(results, baseline, threshold)
+        if regressions:
+            click.echo(f"Slower than baseline {compare_to}: {', '.join(regressions)}")
+            sys.exit(1)
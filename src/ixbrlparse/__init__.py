@@ -1,14 +1,19 @@
-from ixbrlparse.components import (
-    ixbrlContext,
-    ixbrlFormat,
-    ixbrlNonNumeric,
-    ixbrlNumeric,
-)
-from ixbrlparse.core import IXBRL
-from ixbrlparse.hookspecs import hookimpl, hookspec
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ixbrlparse.components import (
+        ixbrlContext,
+        ixbrlFormat,
+        ixbrlNonNumeric,
+        ixbrlNumeric,
+    )
+    from ixbrlparse.core import IXBRL, IXBRLResult
+    from ixbrlparse.hookspecs import hookimpl, hookspec
 
 __all__ = [
     "IXBRL",
+    "IXBRLResult",
     "hookimpl",
     "hookspec",
     "ixbrlContext",
@@ -16,3 +21,29 @@ __all__ = [
     "ixbrlNonNumeric",
     "ixbrlNumeric",
 ]
+
+# the module each name is imported from when it is first used, so that
+# importing ixbrlparse doesn't import the parser and its dependencies
+_LAZY_IMPORTS = {
+    "IXBRL": "ixbrlparse.core",
+    "IXBRLResult": "ixbrlparse.core",
+    "hookimpl": "ixbrlparse.hookspecs",
+    "hookspec": "ixbrlparse.hookspecs",
+    "ixbrlContext": "ixbrlparse.components",
+    "ixbrlFormat": "ixbrlparse.components",
+    "ixbrlNonNumeric": "ixbrlparse.components",
+    "ixbrlNumeric": "ixbrlparse.components",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_IMPORTS:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,220 @@
+import glob
+import itertools
+import os
+import zipfile
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+from ixbrlparse.core import IXBRL, IXBRL_EXTENSIONS, zip_members
+from ixbrlparse.sqlite import document_tables
+from ixbrlparse.stats import ParseStats
+
+if TYPE_CHECKING:
+    from ixbrlparse.cache import ParseCache
+
+# zip archives are opened once per worker process and kept open
+ZIP_CACHE_SIZE = 4
+# the number of chunks of files sent to each worker before their results have
+# been collected, which limits how many results are held in memory
+PENDING_CHUNKS_PER_WORKER = 2
+
+
+@dataclass
+class BatchResult:
+    """The result of parsing one file in a batch.
+
+    Attributes:
+        filename: The path of the file. For members of a zip archive this is
+            the path of the archive joined with the name of the member.
+        rows: The rows from `IXBRL.to_table()`, or an empty list if the file
+            could not be parsed.
+        error: A description of the error if the file could not be parsed.
+        tables: The rows for each table of an SQLite database, from
+            `document_tables()`, if the file was parsed with `tables=True`.
+        schema: The schema of the document.
+        stats: The statistics for parsing the file."""
+
+    filename: str
+    rows: list[dict] = field(default_factory=list)
+    error: str | None = None
+    tables: dict[str, list[tuple]] | None = None
+    schema: str | None = None
+    stats: ParseStats | None = None
+
+
+class BatchTask(NamedTuple):
+    """A file to parse, or a member of a zip archive if `member` is set."""
+
+    path: str
+    member: str | None = None
+    error: str | None = None
+
+    @property
+    def filename(self) -> str:
+        if self.member is None:
+            return self.path
+        return os.path.join(self.path, self.member)
+
+
+def expand_paths(paths: Iterable[str | Path]) -> Iterator[str]:
+    """Expand a list of files, directories and glob patterns into file paths.
+
+    Directories are searched recursively for files with one of the
+    `IXBRL_EXTENSIONS`, and for zip archives. Each file is only returned once."""
+    seen: set[str] = set()
+    for path in paths:
+        path_str = str(path)
+        if os.path.isdir(path_str):
+            found = sorted(
+                str(p)
+                for p in Path(path_str).rglob("*")
+                if p.is_file() and p.suffix.lower() in (*IXBRL_EXTENSIONS, ".zip")
+            )
+        elif glob.has_magic(path_str):
+            found = sorted(
+                p for p in glob.glob(path_str, recursive=True) if os.path.isfile(p)
+            )
+        else:
+            found = [path_str]
+        for p in found:
+            if p not in seen:
+                seen.add(p)
+                yield p
+
+
+def expand_tasks(paths: Iterable[str | Path]) -> Iterator[BatchTask]:
+    """Expand files, directories and glob patterns into the files to parse,
+    including one task for each member of any zip archives."""
+    for path in expand_paths(paths):
+        if not path.lower().endswith(".zip"):
+            yield BatchTask(path)
+            continue
+        try:
+            with zipfile.ZipFile(path) as z:
+                members = zip_members(z)
+        except (OSError, zipfile.BadZipFile) as e:
+            yield BatchTask(path, error=f"{type(e).__name__}: {e}")
+            continue
+        for member in members:
+            yield BatchTask(path, member)
+
+
+@lru_cache(maxsize=ZIP_CACHE_SIZE)
+def _open_zip(path: str) -> zipfile.ZipFile:
+    return zipfile.ZipFile(path)
+
+
+def parse_file(
+    filename: str, fields: str = "all", cache: "ParseCache | None" = None
+) -> BatchResult:
+    """Parse a single file, catching any error so that it can be reported
+    alongside the results of the rest of the batch."""
+    return parse_task(BatchTask(filename), fields, cache)
+
+
+def parse_task(
+    task: BatchTask,
+    fields: str = "all",
+    cache: "ParseCache | None" = None,
+    *,
+    tables: bool = False,
+) -> BatchResult:
+    """Parse a file or zip archive member, catching any error so that it can be
+    reported alongside the results of the rest of the batch.
+
+    If `tables` is True the result has the rows for an SQLite database instead
+    of the rows from `IXBRL.to_table()`."""
+    if task.error is not None:
+        return BatchResult(task.filename, error=task.error)
+    try:
+        if task.member is None:
+            x = IXBRL.open(task.path, keep_source=False, cache=cache)
+        elif cache is not None:
+            x = cache.parse(_open_zip(task.path).read(task.member))
+        else:
+            with _open_zip(task.path).open(task.member) as a:
+                x = IXBRL(a, keep_source=False)
+        if tables:
+            return BatchResult(
+                task.filename,
+                tables=document_tables(x, fields),
+                schema=x.schema,
+                stats=x.stats,
+            )
+        return BatchResult(
+            task.filename, rows=x.to_table(fields), schema=x.schema, stats=x.stats
+        )
+    except Exception as e:
+        return BatchResult(task.filename, error=f"{type(e).__name__}: {e}")
+
+
+def _parse_chunk(
+    tasks: list[BatchTask],
+    fields: str = "all",
+    cache: "ParseCache | None" = None,
+    *,
+    tables: bool = False,
+) -> list[BatchResult]:
+    return [parse_task(task, fields, cache, tables=tables) for task in tasks]
+
+
+def parse_files(
+    paths: Iterable[str | Path],
+    fields: str = "all",
+    workers: int | None = None,
+    chunksize: int = 16,
+    cache: "ParseCache | None" = None,
+    *,
+    tables: bool = False,
+    max_pending: int | None = None,
+) -> Iterator[BatchResult]:
+    """Parse many files, using a pool of worker processes.
+
+    Zip archives are read directly, with each member parsed as a separate file.
+    Results are yielded in the same order as the files. Only `max_pending`
+    chunks of files are sent to the workers before their results are yielded,
+    so the results of quicker files don't pile up in memory behind a slow one.
+
+    Parameters:
+        paths:  Files, directories, zip archives or glob patterns to parse.
+        fields:  Which fields to include in the rows, "numeric", "nonnumeric"
+            or "all".
+        workers:  The number of worker processes. Defaults to the number of
+            CPUs. If 1 then the files are parsed in the current process.
+        chunksize:  The number of files sent to a worker at a time.
+        cache:  A `ParseCache` to use for files which have been parsed before.
+        tables:  Give the rows for an SQLite database in the `tables` of each
+            result, rather than the rows from `IXBRL.to_table()`.
+        max_pending:  The most chunks sent to the workers at once. Defaults to
+            `PENDING_CHUNKS_PER_WORKER` for each worker.
+    """
+    tasks = expand_tasks(paths)
+    if workers == 1:
+        for task in tasks:
+            yield parse_task(task, fields, cache, tables=tables)
+        return
+
+    if max_pending is None:
+        max_pending = PENDING_CHUNKS_PER_WORKER * (workers or os.cpu_count() or 1)
+    if max_pending < 1:
+        msg = "max_pending must be at least 1"
+        raise ValueError(msg)
+    chunks = iter(lambda: list(itertools.islice(tasks, chunksize)), [])
+    parse_chunk = partial(_parse_chunk, fields=fields, cache=cache, tables=tables)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: deque[Future[list[BatchResult]]] = deque(
+            executor.submit(parse_chunk, chunk)
+            for chunk in itertools.islice(chunks, max_pending)
+        )
+        while pending:
+            results = pending.popleft().result()
+            # keep the workers busy while these results are used
+            chunk = next(chunks, None)
+            if chunk is not None:
+                pending.append(executor.submit(parse_chunk, chunk))
+            yield from results
@@ -0,0 +1,204 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+from ixbrlparse.__about__ import __version__
+from ixbrlparse.core import ENGINE_BS4, IXBRL, BytesLike
+from ixbrlparse.plugins import pm
+from ixbrlparse.stats import ParseStats
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 1024**3  # 1 GB
+PICKLE_PROTOCOL = 5
+CACHE_SUFFIX = ".pickle"
+# when the cache is full, remove entries until it is this fraction of the size
+EVICT_TO = 0.9
+
+
+def _plugin_versions() -> list[str]:
+    # plugins installed with an entry point are only listed once loaded
+    pm.load_entrypoints()
+    versions = {
+        f"{dist.project_name}=={dist.version}" for _, dist in pm.list_plugin_distinfo()
+    }
+    names = {name for name, _ in pm.list_name_plugin() if name is not None}
+    return sorted(versions | names)
+
+
+class ParseCache:
+    """An on-disk cache of parsed documents.
+
+    Entries are keyed on a hash of the contents of the file, the version of
+    ixbrlparse, the plugins that are installed and the parsing options, so a
+    file is only parsed again if any of these change. Cached documents are
+    stored with pickle and do not keep their source document, as if they had
+    been opened with `keep_source=False`. The `stats` of a document read from
+    the cache have a single "cache" phase, for reading the cache entry.
+
+    When the total size of the cache is more than `max_size` the entries that
+    were least recently used are removed.
+
+    Parameters:
+        directory:  The directory to store the cache in. It is created if it
+            does not exist.
+        max_size:  The maximum size of the cache in bytes.
+    """
+
+    def __init__(
+        self, directory: str | Path, max_size: int = DEFAULT_CACHE_SIZE
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self._size: int | None = None
+
+    def __repr__(self) -> str:
+        return f"<ParseCache {self.directory}>"
+
+    def __getstate__(self) -> dict:
+        # the size is worked out again by each process
+        return {"directory": self.directory, "max_size": self.max_size, "_size": None}
+
+    def key(
+        self, data: BytesLike, *, engine: str = ENGINE_BS4, raise_on_error: bool = True
+    ) -> str:
+        """Get the cache key for the contents of a file and parsing options."""
+        h = hashlib.sha256(data)
+        for part in [
+            __version__,
+            *_plugin_versions(),
+            engine,
+            str(raise_on_error),
+            str(PICKLE_PROTOCOL),
+        ]:
+            h.update(b"\0" + part.encode("utf-8"))
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{CACHE_SUFFIX}"
+
+    def get(self, key: str) -> IXBRL | None:
+        """Get a parsed document from the cache, or None if it isn't cached."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as a:
+                x = pickle.load(a)  # noqa: S301
+        except FileNotFoundError:
+            return None
+        except Exception:  # corrupt or incompatible entries are treated as a miss
+            logger.warning("Could not read cache entry %s", path, exc_info=True)
+            path.unlink(missing_ok=True)
+            return None
+        try:
+            # mark the entry as recently used
+            os.utime(path)
+        except OSError:
+            pass
+        return x
+
+    def set(self, key: str, x: IXBRL) -> None:
+        """Add a parsed document to the cache.
+
+        The source document is released before the document is stored."""
+        x.release_source()
+        try:
+            data = pickle.dumps(x, protocol=PICKLE_PROTOCOL)
+        except Exception:  # e.g. an error which can't be pickled
+            logger.warning("Could not add document to cache", exc_info=True)
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, delete=False, suffix=".tmp"
+        ) as a:
+            a.write(data)
+        os.replace(a.name, path)
+
+        if self._size is None:
+            self._size = self.size()
+        else:
+            self._size += len(data)
+        if self._size > self.max_size:
+            self.evict()
+
+    def size(self) -> int:
+        """Get the total size of the cache entries in bytes."""
+        return sum(size for _, size, _ in self._scan())
+
+    def _scan(self) -> list[tuple[Path, int, float]]:
+        entries = []
+        for path in self.directory.glob(f"*/*{CACHE_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # removed by another process
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def evict(self, max_size: int | None = None) -> None:
+        """Remove the least recently used entries until the cache is smaller
+        than `max_size` (by default a little smaller than the maximum size of
+        the cache)."""
+        if max_size is None:
+            max_size = int(self.max_size * EVICT_TO)
+        entries = sorted(self._scan(), key=lambda e: e[2])
+        size = sum(e[1] for e in entries)
+        for path, entry_size, _ in entries:
+            if size <= max_size:
+                break
+            path.unlink(missing_ok=True)
+            size -= entry_size
+        self._size = size
+
+    def clear(self) -> None:
+        """Remove all the entries in the cache."""
+        self.evict(0)
+
+    def open(
+        self,
+        filename: str | Path,
+        raise_on_error: bool = True,  # noqa: FBT001, FBT002
+        engine: str = ENGINE_BS4,
+    ) -> IXBRL:
+        """Open an iXBRL file, using the cached result if the file has been
+        parsed before.
+
+        Parameters:
+            filename:  Path to file to parse.
+            raise_on_error:  Whether to raise an exception on error
+            engine:  The parser engine to use, either "bs4" or "lxml-stream"
+        """
+        with open(filename, "rb") as a:
+            return self.parse(a.read(), raise_on_error=raise_on_error, engine=engine)
+
+    def parse(
+        self,
+        data: BytesLike,
+        raise_on_error: bool = True,  # noqa: FBT001, FBT002
+        engine: str = ENGINE_BS4,
+    ) -> IXBRL:
+        """Parse the contents of an iXBRL file, using the cached result if the
+        same contents have been parsed before.
+
+        Parameters:
+            data:  The contents of the file, as bytes or any other buffer
+                accepted by `IXBRL.from_bytes()`.
+            raise_on_error:  Whether to raise an exception on error
+            engine:  The parser engine to use, either "bs4" or "lxml-stream"
+        """
+        key = self.key(data, engine=engine, raise_on_error=raise_on_error)
+        stats = ParseStats()
+        with stats.phase("cache"):
+            x = self.get(key)
+        if x is None:
+            x = IXBRL.from_bytes(data, raise_on_error=raise_on_error, engine=engine)
+            self.set(key, x)
+            return x
+        # the statistics are for reading the cache, not the original parse
+        stats.phases["cache"].facts = len(x.numeric) + len(x.nonnumeric)
+        stats.phases["cache"].errors = len(x.errors)
+        x.stats = stats
+        return x
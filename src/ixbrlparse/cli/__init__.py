@@ -2,20 +2,109 @@ import csv
 import json
 import logging
 import sys
+from collections.abc import Iterable
 from datetime import date
-from typing import Any
+from typing import IO
 
 import click
 
 from ixbrlparse.__about__ import __version__
-from ixbrlparse.core import IXBRL
+from ixbrlparse.stats import BatchStats
 
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s %(levelname)s:%(name)s:%(message)s"
-)
+
+def write_csv(values: Iterable[dict], outfile: IO, columns: list[str]) -> None:
+    writer = csv.DictWriter(outfile, columns)
+    writer.writeheader()
+    writer.writerows(values)
+
+
+def fit_segments(row: dict, segments: int) -> bool:
+    """Join any segment columns after the given number of segments into the
+    last segment column.
+
+    Returns True if any segments had to be joined."""
+    overflow = []
+    i = segments
+    while f"segment:{i}" in row:
+        overflow.append(row.pop(f"segment:{i}"))
+        i += 1
+    if overflow:
+        last = f"segment:{segments - 1}"
+        row[last] = "; ".join([row[last], *overflow])
+    return bool(overflow)
+
+
+def write_jsonl(values: Iterable[dict], outfile: IO) -> None:
+    for v in values:
+        if isinstance(v["value"], date):
+            v["value"] = str(v["value"])
+        json.dump(v, outfile)
+        outfile.write("\n")
+
+
+def write_stats(stats: dict) -> None:
+    click.echo(json.dumps(stats, indent=4), err=True)
+
+
+class IXBRLGroup(click.Group):
+    """Command group which takes a single file as an argument, unless the
+    first argument after any options is the name of a subcommand.
+
+    To parse a file with the same name as a subcommand, put `--` before it.
+    The options for parsing a single file can't be used with a subcommand,
+    which has options of its own."""
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        index = self._first_argument(ctx, args)
+        if index is not None and args[index] in self.commands:
+            # checked before the options are processed, so that --outfile
+            # isn't opened
+            eager = {
+                opt
+                for param in self.get_params(ctx)
+                if param.is_eager
+                for opt in param.opts
+            }
+            options = [
+                arg.split("=", 1)[0]
+                for arg in args[:index]
+                if arg.startswith("-")
+                and arg != "-"
+                and arg.split("=", 1)[0] not in eager
+            ]
+            if options:
+                msg = (
+                    f"{', '.join(options)} can't be used with the "
+                    f"{args[index]} command. Put its options after the command."
+                )
+                raise click.UsageError(msg, ctx)
+            args = [*args[:index], "-", *args[index:]]
+        return super().parse_args(ctx, args)
+
+    def _first_argument(self, ctx: click.Context, args: list[str]) -> int | None:
+        """Find the first argument which isn't an option or an option value."""
+        takes_value = {
+            opt
+            for param in self.get_params(ctx)
+            if isinstance(param, click.Option) and not (param.is_flag or param.count)
+            for opt in param.opts
+        }
+        i = 0
+        while i < len(args):
+            arg = args[i]
+            if arg == "--":
+                return None
+            if arg in takes_value:
+                i += 2
+            elif arg.startswith("-") and arg != "-":
+                i += 1
+            else:
+                return i
+        return None
 
 
 @click.group(
+    cls=IXBRLGroup,
     context_settings={"help_option_names": ["-h", "--help"]},
     invoke_without_command=True,
 )
@@ -40,24 +129,279 @@ logging.basicConfig(
     help="Where to output the file",
     type=click.File("w", encoding="UTF-8"),
 )
+@click.option(
+    "--context-refs",
+    is_flag=True,
+    default=False,
+    help="In json output, give the id of the context of each fact instead of "
+    "repeating the full context",
+)
+@click.option(
+    "--cache",
+    "cache_dir",
+    default=None,
+    type=click.Path(file_okay=False),
+    help="Directory to cache parsed files in, so they are only parsed once",
+)
+@click.option(
+    "--stats",
+    "show_stats",
+    is_flag=True,
+    default=False,
+    help="Print the time taken by each phase of parsing, and the facts and "
+    "errors found, as JSON to stderr",
+)
 @click.argument("infile", type=click.File("rb"), default=sys.stdin, nargs=1)
-def ixbrlparse_cli(output_format: str, fields: str, outfile, infile):
-    x = IXBRL(infile)
+@click.pass_context
+def ixbrlparse_cli(  # noqa: PLR0917
+    ctx: click.Context,
+    output_format: str,
+    fields: str,
+    outfile,
+    context_refs: bool,  # noqa: FBT001
+    cache_dir: str | None,
+    show_stats: bool,  # noqa: FBT001
+    infile,
+):
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s:%(name)s:%(message)s"
+    )
+    if ctx.invoked_subcommand is not None:
+        return
+
+    # imported here so that --help and --version don't load the parser
+    from ixbrlparse.cache import ParseCache  # noqa: PLC0415
+    from ixbrlparse.core import IXBRL  # noqa: PLC0415
+
+    if cache_dir is not None:
+        x = ParseCache(cache_dir).parse(infile.read())
+    else:
+        x = IXBRL(infile)
 
     if output_format == "csv":
-        values = x.to_table(fields)
-        columns: dict[str, Any] = {}
-        for r in values:
-            columns = {**dict.fromkeys(r.keys()), **columns}
-        writer = csv.DictWriter(outfile, columns.keys())
-        writer.writeheader()
-        writer.writerows(values)
+        write_csv(x.iter_table(fields), outfile, x.table_columns(fields))
     elif output_format in ["jsonlines", "jsonl"]:
-        values = x.to_table(fields)
-        for v in values:
-            if isinstance(v["value"], date):
-                v["value"] = str(v["value"])
-            json.dump(v, outfile)
-            outfile.write("\n")
+        write_jsonl(x.iter_table(fields), outfile)
     elif output_format == "json":
-        json.dump(x.to_json(), outfile, indent=4)
+        x.write_json(outfile, indent=4, inline_contexts=not context_refs)
+
+    if show_stats:
+        write_stats(x.stats.to_json())
+
+
+@ixbrlparse_cli.command("batch")
+@click.option(
+    "--format",
+    "-f",
+    "output_format",
+    default="csv",
+    help="Output format",
+    type=click.Choice(["csv", "jsonlines", "jsonl"]),
+)
+@click.option(
+    "--fields",
+    default="all",
+    type=click.Choice(["numeric", "nonnumeric", "all"]),
+    help="Which fields to output",
+)
+@click.option(
+    "--outfile",
+    default=sys.stdout,
+    help="Where to output the file",
+    type=click.File("w", encoding="UTF-8"),
+)
+@click.option(
+    "--errors",
+    "errors_file",
+    default=None,
+    help="Where to output a CSV of files which could not be parsed",
+    type=click.File("w", encoding="UTF-8"),
+)
+@click.option(
+    "--workers",
+    "-w",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Number of worker processes (defaults to the number of CPUs)",
+)
+@click.option(
+    "--segments",
+    default=4,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of segment columns in csv output. Any further segments are "
+    "joined into the last column",
+)
+@click.option(
+    "--cache",
+    "cache_dir",
+    default=None,
+    type=click.Path(file_okay=False),
+    help="Directory to cache parsed files in, so they are only parsed once",
+)
+@click.option(
+    "--stats",
+    "show_stats",
+    is_flag=True,
+    default=False,
+    help="Print the time taken by each phase of parsing, totalled across all "
+    "the files, and the slowest files, as JSON to stderr",
+)
+@click.argument("paths", nargs=-1, required=True)
+def batch_cli(  # noqa: PLR0917
+    output_format: str,
+    fields: str,
+    outfile,
+    errors_file,
+    workers: int | None,
+    segments: int,
+    cache_dir: str | None,
+    show_stats: bool,  # noqa: FBT001
+    paths: tuple[str, ...],
+):
+    """Parse many files, directories, zip archives or glob patterns into a
+    single output.
+
+    Members of zip archives are read without extracting them to disk. Each row
+    includes a "filename" column giving the file (or zip member) it came from.
+    Files which can't be parsed are reported at the end rather than stopping
+    the run.
+    """
+    from ixbrlparse.batch import parse_files  # noqa: PLC0415
+    from ixbrlparse.cache import ParseCache  # noqa: PLC0415
+    from ixbrlparse.core import TABLE_COLUMNS  # noqa: PLC0415
+
+    writer = None
+    if output_format == "csv":
+        writer = csv.DictWriter(
+            outfile,
+            [
+                "filename",
+                *TABLE_COLUMNS,
+                *(f"segment:{i}" for i in range(segments)),
+            ],
+        )
+        writer.writeheader()
+
+    errors: list[tuple[str, str]] = []
+    parsed = 0
+    stats = BatchStats()
+    cache = ParseCache(cache_dir) if cache_dir is not None else None
+    for result in parse_files(paths, fields=fields, workers=workers, cache=cache):
+        stats.add(result.filename, result.stats)
+        if result.error is not None:
+            logging.warning("Could not parse %s: %s", result.filename, result.error)
+            errors.append((result.filename, result.error))
+            continue
+        parsed += 1
+        rows = ({"filename": result.filename, **row} for row in result.rows)
+        if writer is None:
+            write_jsonl(rows, outfile)
+            continue
+        overflow = False
+        for row in rows:
+            overflow = fit_segments(row, segments) or overflow
+            writer.writerow(row)
+        if overflow:
+            logging.warning(
+                "%s has facts with more than %s segments, which have been joined "
+                "into the last segment column",
+                result.filename,
+                segments,
+            )
+
+    if errors_file is not None:
+        errors_writer = csv.writer(errors_file)
+        errors_writer.writerow(["filename", "error"])
+        errors_writer.writerows(errors)
+
+    if show_stats:
+        write_stats(stats.to_json())
+    logging.info("Parsed %s files, %s failed", parsed, len(errors))
+    if errors:
+        sys.exit(1)
+
+
+@ixbrlparse_cli.command("sqlite")
+@click.option(
+    "--fields",
+    default="all",
+    type=click.Choice(["numeric", "nonnumeric", "all"]),
+    help="Which fields to output",
+)
+@click.option(
+    "--workers",
+    "-w",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Number of worker processes (defaults to the number of CPUs)",
+)
+@click.option(
+    "--chunksize",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Number of files written to the database in each transaction "
+    "(defaults to 100)",
+)
+@click.option(
+    "--cache",
+    "cache_dir",
+    default=None,
+    type=click.Path(file_okay=False),
+    help="Directory to cache parsed files in, so they are only parsed once",
+)
+@click.option(
+    "--stats",
+    "show_stats",
+    is_flag=True,
+    default=False,
+    help="Print the time taken by each phase of parsing, totalled across all "
+    "the files, and the slowest files, as JSON to stderr",
+)
+@click.argument("database", type=click.Path(dir_okay=False))
+@click.argument("paths", nargs=-1, required=True)
+def sqlite_cli(  # noqa: PLR0917
+    fields: str,
+    workers: int | None,
+    chunksize: int | None,
+    cache_dir: str | None,
+    show_stats: bool,  # noqa: FBT001
+    database: str,
+    paths: tuple[str, ...],
+):
+    """Parse many files, directories, zip archives or glob patterns into an
+    SQLite database.
+
+    The database has a table of documents, and tables of the contexts,
+    segments, units, numeric facts and non-numeric facts in each document.
+    Files are parsed in worker processes, and written to the database by a
+    single process. If the database already exists the files are added to it.
+    """
+    from ixbrlparse.batch import parse_files  # noqa: PLC0415
+    from ixbrlparse.cache import ParseCache  # noqa: PLC0415
+    from ixbrlparse.sqlite import DEFAULT_CHUNK_SIZE, SQLiteWriter  # noqa: PLC0415
+
+    if chunksize is None:
+        chunksize = DEFAULT_CHUNK_SIZE
+    parsed = failed = 0
+    stats = BatchStats()
+    cache = ParseCache(cache_dir) if cache_dir is not None else None
+    with SQLiteWriter(database, chunksize=chunksize) as writer:
+        for result in parse_files(
+            paths, fields=fields, workers=workers, cache=cache, tables=True
+        ):
+            stats.add(result.filename, result.stats)
+            if result.error is not None:
+                logging.warning("Could not parse %s: %s", result.filename, result.error)
+                failed += 1
+            else:
+                parsed += 1
+            writer.add(
+                result.filename, result.tables, schema=result.schema, error=result.error
+            )
+
+    if show_stats:
+        write_stats(stats.to_json())
+    logging.info("Parsed %s files, %s failed", parsed, failed)
+    if failed:
+        sys.exit(1)
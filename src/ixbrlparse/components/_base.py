@@ -1,15 +1,106 @@
+from collections.abc import Sequence
 from copy import deepcopy
 from dataclasses import dataclass
 from datetime import date
+from typing import TYPE_CHECKING, Any
 
-from bs4 import Tag
+if TYPE_CHECKING:
+    from bs4 import Tag
+
+
+@dataclass(frozen=True)
+class ixbrlSource:  # noqa: N801
+    """A lightweight pointer to the element a fact or error came from.
+
+    Attributes:
+        name: The tag name of the element, including any namespace prefix.
+        id: The id attribute of the element, if present.
+        line: The line number of the element, if known. This is only recorded
+            by the lxml-stream engine.
+        index: The index of the element among all the elements of the
+            document, in document order, starting from 0 for the root
+            element. This is recorded by every engine."""
+
+    name: str | None = None
+    id: str | None = None
+    line: int | None = None
+    index: int | None = None
+
+    @classmethod
+    def from_tag(cls, tag: "Tag", index: int | None = None) -> "ixbrlSource":
+        element_id = tag.get("id")
+        return cls(
+            name=f"{tag.prefix}:{tag.name}" if tag.prefix else tag.name,
+            id=element_id if isinstance(element_id, str) else None,
+            line=tag.sourceline,
+            index=index,
+        )
 
 
 @dataclass
 class ixbrlError:  # noqa: N801
     error: Exception
-    element: Tag | None = None
+    element: "Tag | None" = None
     context: str | None = None
+    source: ixbrlSource | None = None
+
+    def release_source(self, index: int | None = None) -> None:
+        """Replace the reference to the source element with an `ixbrlSource`,
+        and drop the traceback of the error, whose frames refer to the parsed
+        document.
+
+        Parameters:
+            index:  The index of the element in the document, if known."""
+        if self.element is not None:
+            self.source = ixbrlSource.from_tag(self.element, index)
+            self.element = None
+        self.error.with_traceback(None)
+        self.error.__cause__ = None
+        self.error.__context__ = None
+
+
+@dataclass(frozen=True)
+class ixbrlErrorSummary:  # noqa: N801
+    """A summary of an error found while parsing, which doesn't refer to the
+    exception or the parsed document, so it can be pickled cheaply.
+
+    Attributes:
+        type: The name of the type of the exception.
+        message: The exception message.
+        context: The context of the fact, if known.
+        source: The element the error came from, if known."""
+
+    type: str
+    message: str
+    context: str | None = None
+    source: ixbrlSource | None = None
+
+    @classmethod
+    def from_error(
+        cls,
+        error: "ixbrlError | ixbrlErrorSummary | Exception",
+        index: int | None = None,
+    ) -> "ixbrlErrorSummary":
+        """Summarise an error.
+
+        Parameters:
+            error:  The error to summarise.
+            index:  The index in the document of the element the error came
+                from, if the error still refers to it.
+        """
+        if isinstance(error, ixbrlErrorSummary):
+            return error
+        if isinstance(error, ixbrlError):
+            source = error.source
+            if error.element is not None:
+                source = ixbrlSource.from_tag(error.element, index)
+            return cls(
+                type=type(error.error).__name__,
+                message=str(error.error),
+                context=error.context,
+                source=source,
+            )
+        return cls(type=type(error).__name__, message=str(error))
 
 
 class ixbrlFormat:  # noqa: N801
@@ -17,9 +108,17 @@ class ixbrlFormat:  # noqa: N801
 
     This class should generally be subclassed to provide additional functionality.
 
+    Format objects from `get_format_instance()` are shared between facts, so
+    are frozen once they have been created, and setting an attribute on them
+    raises an `AttributeError`.
+
     Attributes:
         format_names: A tuple of format names that this class should be used for."""
 
+    # whether the object is frozen is kept in a slot, so it isn't part of the
+    # attributes given by `to_json()`
+    __slots__ = ("__dict__", "_frozen")
+
     format_names: tuple[str, ...] = ()
 
     def __init__(
@@ -61,6 +160,22 @@ class ixbrlFormat:  # noqa: N801
         self.scale = int(scale)
         self.sign = sign
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        if getattr(self, "_frozen", False):
+            msg = f"Can't set {name!r}, as {type(self).__name__} objects are shared"
+            raise AttributeError(msg)
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name: str) -> None:
+        if getattr(self, "_frozen", False):
+            msg = f"Can't delete {name!r}, as {type(self).__name__} objects are shared"
+            raise AttributeError(msg)
+        super().__delattr__(name)
+
+    def _freeze(self) -> None:
+        """Stop any more attributes being set on the object."""
+        self._frozen = True
+
     def to_json(self):
         """Convert the object to a JSON serialisable dictionary."""
         return deepcopy(self.__dict__)
@@ -92,3 +207,42 @@ class ixbrlFormat:  # noqa: N801
                 value_numeric = value_numeric * (10**self.scale)
 
             return value_numeric
+
+    def parse_values(
+        self, values: Sequence[str | int | float]
+    ) -> list[int | float | bool | date | str | None]:
+        """Parse a list of values using the format.
+
+        This gives the same results as calling `parse_value()` for each value,
+        but can be overridden to parse many values at once more quickly. If
+        any value can't be parsed an error is raised for the whole list.
+
+        Parameters:
+            values: The values to parse.
+
+        Returns:
+            The parsed values, in the same order.
+        """
+        if type(self).parse_value is not ixbrlFormat.parse_value:
+            return [self.parse_value(value) for value in values]
+        return self._parse_numbers(values)
+
+    def _parse_numbers(
+        self, values: Sequence[str | int | float]
+    ) -> list[int | float | bool | date | str | None]:
+        # the sign and scale are combined into a single multiplication, which
+        # gives exactly the same result as applying them one at a time
+        multiplier: int | float = -1 if self.sign == "-" else 1
+        if self.scale != 0:
+            multiplier = multiplier * (10**self.scale)
+
+        try:
+            # quickest when every value is a string
+            return [
+                0
+                if value in ("-", "")
+                else float(value.replace(" ", "").replace(",", "")) * multiplier  # type: ignore[union-attr]
+                for value in values
+            ]
+        except AttributeError:
+            return [ixbrlFormat.parse_value(self, value) for value in values]
@@ -1,7 +1,43 @@
 import datetime
+import re
+import sys
 from copy import deepcopy
+from functools import lru_cache
 from typing import Any
 
+ISO_DATE_REGEX = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+DIMENSION_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=1024)
+def _parse_date(value: str) -> datetime.date:
+    """Parse a context date in `YYYY-MM-DD` format.
+
+    Most dates are in strict ISO format and use the fast `date.fromisoformat`
+    path. Anything else is passed to `strptime`, which accepts some variations
+    (such as single digit months) and raises ValueError for malformed dates.
+    Results are cached as documents use only a small number of period dates."""
+    value = value.strip()
+    if ISO_DATE_REGEX.fullmatch(value):
+        try:
+            return datetime.date.fromisoformat(value)
+        except ValueError:
+            pass  # use strptime to give the usual error
+    return datetime.datetime.strptime(value, "%Y-%m-%d").date()  # noqa: DTZ007
+
+
+@lru_cache(maxsize=DIMENSION_CACHE_SIZE)
+def _get_dimension(dimension: str, member: str) -> tuple[str, str]:
+    """Get a shared (dimension, member) tuple, so that contexts with the same
+    dimensions don't each hold their own copy."""
+    return (sys.intern(dimension), sys.intern(member))
+
+
+def _segment_dimension(segment: dict[str, Any]) -> tuple[str, str]:
+    dimension = segment.get("dimension") or segment.get("tag") or ""
+    member = segment.get("value") or ""
+    return _get_dimension(str(dimension), str(member))
+
 
 class ixbrlContext:  # noqa: N801
     """Class to represent an ixbrl context.
@@ -12,10 +48,24 @@ class ixbrlContext:  # noqa: N801
         id: The id of the context.
         entity: A dictionary of the entity information.
         segments: A list of dictionaries of the segment information.
+        dimensions: A tuple of `(dimension, member)` tuples, one for each segment.
+            For typed members the member is the value of the segment.
         instant: The instant date of the context.
         startdate: The start date of the context.
         enddate: The end date of the context."""
 
+    __slots__ = (
+        "dimensions",
+        "enddate",
+        "entity",
+        "id",
+        "instant",
+        "segments",
+        "startdate",
+    )
+    # attributes in the order they are output by to_json()
+    _fields = ("id", "entity", "segments", "instant", "startdate", "enddate")
+
     def __init__(
         self,
         _id: str,
@@ -28,6 +78,9 @@ class ixbrlContext:  # noqa: N801
         self.id = _id
         self.entity = entity
         self.segments = segments
+        self.dimensions: tuple[tuple[str, str], ...] = tuple(
+            _segment_dimension(segment) for segment in segments or []
+        )
         self.instant: datetime.date | None = None
         self.startdate: datetime.date | None = None
         self.enddate: datetime.date | None = None
@@ -39,12 +92,7 @@ class ixbrlContext:  # noqa: N801
         }
         for field, value in date_fields.items():
             if value:
-                datevalue = (
-                    datetime.datetime.strptime(value.strip(), "%Y-%m-%d")
-                    .astimezone()
-                    .date()
-                )
-                setattr(self, field, datevalue)
+                setattr(self, field, _parse_date(value))
 
     def __repr__(self) -> str:
         if self.startdate and self.enddate:
@@ -58,7 +106,7 @@ class ixbrlContext:  # noqa: N801
 
     def to_json(self) -> dict[str, list[dict[str, Any]]]:
         """Convert the object to a JSON serialisable dictionary."""
-        values = deepcopy(self.__dict__)
+        values = {k: deepcopy(getattr(self, k)) for k in self._fields}
         for i in ["startdate", "enddate", "instant"]:
             if isinstance(values[i], datetime.date):
                 values[i] = str(values[i])
@@ -2,8 +2,7 @@ import datetime
 import re
 import warnings
 from collections.abc import Sequence
-
-from word2number import w2n
+from functools import lru_cache
 
 from ixbrlparse.components._base import ixbrlFormat
 from ixbrlparse.hookspecs import hookimpl
@@ -82,6 +81,18 @@ class ixtNumComma(ixbrlFormat):  # noqa: N801
         warnings.warn(msg, stacklevel=2)  # pragma: no cover
         return None  # pragma: no cover
 
+    def parse_values(
+        self, values: Sequence[str | int | float]
+    ) -> list[int | float | bool | datetime.date | str | None]:
+        # subclasses which override parse_value() parse one value at a time
+        if type(self).parse_value is not ixtNumComma.parse_value or not all(
+            isinstance(value, str) for value in values
+        ):
+            return super().parse_values(values)
+        return self._parse_numbers(
+            [value.replace(".", "").replace(",", ".") for value in values]  # type: ignore[union-attr]
+        )
+
 
 class ixtNumWordsEn(ixbrlFormat):  # noqa: N801
     format_names = (
@@ -95,6 +106,9 @@ class ixtNumWordsEn(ixbrlFormat):  # noqa: N801
             if value in ("no", "none"):
                 return 0
 
+            # word2number is only imported if this format is used
+            from word2number import w2n  # noqa: PLC0415
+
             return w2n.word_to_num(value)
         parsed_value = super().parse_value(value)
         if isinstance(parsed_value, float | int):
@@ -117,6 +131,131 @@ class ixtNumDotDecimal(ixbrlFormat):  # noqa: N801
 
 DATE_ORDINAL_SUFFIX_REGEX = re.compile(r"([0-9]{1,2})(st|nd|rd|th)\b")
 DATE_NON_ALPHANUMERIC_REGEX = re.compile(r"[\/\.\-\\–— ]")  # noqa: RUF001
+DATE_CACHE_SIZE = 4096
+
+MONTH_NAMES = {
+    name: number
+    for number, name in enumerate(
+        (
+            "january",
+            "february",
+            "march",
+            "april",
+            "may",
+            "june",
+            "july",
+            "august",
+            "september",
+            "october",
+            "november",
+            "december",
+        ),
+        start=1,
+    )
+}
+MONTH_ABBREVIATIONS = {name[:3]: number for name, number in MONTH_NAMES.items()}
+
+# regexes matching the same text as the `strptime` directives. Month names are
+# matched as words and then looked up in MONTH_NAMES or MONTH_ABBREVIATIONS
+DATE_DIRECTIVES = {
+    "d": r"(?P<d>3[01]|[12]\d|0[1-9]|[1-9]| [1-9])",
+    "m": r"(?P<m>1[0-2]|0[1-9]|[1-9])",
+    "y": r"(?P<y>\d\d)",
+    "Y": r"(?P<Y>\d\d\d\d)",
+    "B": r"(?P<B>[a-z]+)",
+    "b": r"(?P<b>[a-z]+)",
+}
+
+
+@lru_cache(maxsize=256)
+def _compile_date_format(date_format: str) -> re.Pattern | None:
+    """Convert a `strptime` format into a regex which matches the same dates.
+
+    Returns None if the format uses any other directives, or more than one
+    directive for the day, month or year."""
+    pattern: list[str] = []
+    directives: list[str] = []
+    chars = iter(date_format)
+    for char in chars:
+        if char == "%":
+            directive = next(chars, "")
+            if directive == "%":
+                pattern.append("%")
+            elif directive in DATE_DIRECTIVES:
+                pattern.append(DATE_DIRECTIVES[directive])
+                directives.append(directive)
+            else:
+                return None
+        elif char.isspace():
+            pattern.append(r"\s+")
+        else:
+            pattern.append(re.escape(char))
+    parts = ("d", "mBb", "yY")
+    if any(sum(d in part for d in directives) > 1 for part in parts):
+        return None
+    return re.compile("".join(pattern), re.IGNORECASE)
+
+
+def _match_date(match: re.Match) -> datetime.date | None:
+    groups = match.groupdict()
+    year = 1900
+    if groups.get("Y"):
+        year = int(groups["Y"])
+    elif groups.get("y"):
+        year = int(groups["y"])
+        # the same pivot as strptime
+        year += 2000 if year <= 68 else 1900  # noqa: PLR2004
+    month = 1
+    if groups.get("m"):
+        month = int(groups["m"])
+    elif groups.get("B"):
+        month = MONTH_NAMES.get(groups["B"].lower(), 0)
+    elif groups.get("b"):
+        month = MONTH_ABBREVIATIONS.get(groups["b"].lower(), 0)
+    if not month:
+        return None
+    day = int(groups["d"]) if groups.get("d") else 1
+    try:
+        return datetime.date(year, month, day)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_date(value: str, date_formats: tuple[str, ...]) -> datetime.date | None:
+    """Parse a date with the first of `date_formats` that matches.
+
+    Each format is converted to a regex, so that most dates are parsed without
+    calling `strptime` or raising an exception for the formats that don't
+    match. If none of the regexes give a date then `strptime` is used, which
+    raises the usual error. Results are cached as the same dates are repeated
+    throughout a document, and between documents."""
+    value = value.lower()
+    # remove ordinal suffixes with regex
+    value = DATE_ORDINAL_SUFFIX_REGEX.sub(r"\1", value)
+    # replace non-alphanumeric characters with dashes
+    value = DATE_NON_ALPHANUMERIC_REGEX.sub("-", value)
+
+    patterns = [_compile_date_format(date_format) for date_format in date_formats]
+    if all(patterns):
+        for pattern in patterns:
+            match = pattern.fullmatch(value)  # type: ignore[union-attr]
+            if match:
+                parsed = _match_date(match)
+                if parsed is not None:
+                    return parsed
+
+    error: Exception | None = None
+    for date_format in date_formats:
+        try:
+            return datetime.datetime.strptime(value, date_format).date()  # noqa: DTZ007
+        except ValueError as e:
+            error = e
+            continue
+    # if we get here, we couldn't parse the date. Raise the last error
+    if error:  # pragma: no cover
+        raise error
+    return None
 
 
 class ixtDateFormat(ixbrlFormat):  # noqa: N801
@@ -130,23 +269,9 @@ class ixtDateFormat(ixbrlFormat):  # noqa: N801
 
     def parse_value(self, value: str | int | float) -> datetime.date | None:
         if isinstance(value, str):
-            value = value.lower()
-            # remove ordinal suffixes with regex
-            value = DATE_ORDINAL_SUFFIX_REGEX.sub(r"\1", value)
-            # replace non-alphanumeric characters with dashes
-            value = DATE_NON_ALPHANUMERIC_REGEX.sub("-", value)
-
-            date_formats = self._get_date_formats()
-            error: Exception | None = None
-            for date_format in date_formats:
-                try:
-                    return datetime.datetime.strptime(value, date_format).date()  # noqa: DTZ007
-                except ValueError as e:
-                    error = e
-                    continue
-            # if we get here, we couldn't parse the date. Raise the last error
-            if error:  # pragma: no cover
-                raise error
+            parsed = _parse_date(value, tuple(self._get_date_formats()))
+            if parsed is not None:
+                return parsed
         msg = f"Could not parse value {value} as a date"
         warnings.warn(msg, stacklevel=2)
         return None
@@ -237,3 +362,10 @@ def ixbrl_add_formats() -> list[type[ixbrlFormat]]:
         ixtDateDayMonthYear,
         ixtDateSlashUS,
     ]
+
+
+@hookimpl(trylast=True)
+def ixbrl_parse_values(
+    format_: ixbrlFormat, values: list[str | int | float]
+) -> list[int | float | bool | datetime.date | str | None]:
+    return format_.parse_values(values)
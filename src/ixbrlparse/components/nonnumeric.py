@@ -1,13 +1,16 @@
+import sys
 import warnings
 from copy import deepcopy
 from datetime import date
-from typing import Any
-
-from bs4 import Tag
+from typing import TYPE_CHECKING, Any
 
 from ixbrlparse.components import ixbrlContext
+from ixbrlparse.components._base import ixbrlSource
 from ixbrlparse.components.constants import NAME_SPLIT_EXPECTED
-from ixbrlparse.components.transform import get_format, ixbrlFormat
+from ixbrlparse.components.transform import get_format_instance, ixbrlFormat
+
+if TYPE_CHECKING:
+    from bs4 import Tag
 
 
 class ixbrlNonNumeric:  # noqa: N801
@@ -18,13 +21,28 @@ class ixbrlNonNumeric:  # noqa: N801
     The value of non-numeric elements is always a string, so we don't need to
     worry about parsing the string."""
 
+    __slots__ = (
+        "context",
+        "format",
+        "name",
+        "schema",
+        "soup_tag",
+        "source",
+        "text",
+        "value",
+    )
+    # attributes in the order they are output by to_json()
+    _fields = ("schema", "name", "context", "format", "text", "value")
+
     def __init__(
         self,
         context: ixbrlContext | str | None = None,
         name: str | None = None,
         format_: str | None = None,
         value: str | None = None,
-        soup_tag: Tag | None = None,
+        soup_tag: "Tag | None" = None,
+        *,
+        source: ixbrlSource | None = None,
     ) -> None:
         """Constructor for the ixbrlNonNumeric class.
 
@@ -34,15 +52,17 @@ class ixbrlNonNumeric:  # noqa: N801
             format_ (str): The format of the non-numeric element
             value (str): The value of the non-numeric element
             soup_tag (Tag): The source tag in beautiful soup
+            source (ixbrlSource): A lightweight pointer to the source element,
+                used when the source tag is not kept
         """
         if isinstance(name, str):
             name_split: list[str] = name.split(":", maxsplit=1)
             if len(name_split) == NAME_SPLIT_EXPECTED:
-                self.schema = name_split[0]
-                self.name = name_split[1]
+                self.schema = sys.intern(name_split[0])
+                self.name = sys.intern(name_split[1])
             else:
                 self.schema = "unknown"
-                self.name = name_split[0]
+                self.name = sys.intern(name_split[0])
 
         self.context = context
         self.format: ixbrlFormat | None = None
@@ -50,19 +70,35 @@ class ixbrlNonNumeric:  # noqa: N801
         self.value: str | int | float | None | date | None = value
         if isinstance(format_, str) and format_ != "" and self.text is not None:
             try:
-                self.format = get_format(format_)(format_=format_)
+                self.format = get_format_instance(format_)
                 self.value = self.format.parse_value(self.text)
             except NotImplementedError:
                 msg = f"Format {format_} not implemented - value '{value}' not parsed"
                 warnings.warn(msg, stacklevel=2)
         self.soup_tag = soup_tag
+        self.source = source
+
+    def release_source(self, index: int | None = None) -> None:
+        """Replace the reference to the source tag with an `ixbrlSource`, so
+        that the parsed document can be freed.
+
+        Parameters:
+            index:  The index of the tag in the document, if known."""
+        if self.soup_tag is not None:
+            self.source = ixbrlSource.from_tag(self.soup_tag, index)
+            self.soup_tag = None
 
     def to_json(self) -> dict[str, Any]:
-        values = {k: deepcopy(v) for k, v in self.__dict__.items() if k != "soup_tag"}
+        values = {}
+        for k in self._fields:
+            if not hasattr(self, k):
+                continue
+            value = getattr(self, k)
+            # the format and context are converted rather than copied
+            if isinstance(value, ixbrlFormat | ixbrlContext):
+                values[k] = value.to_json()
+            else:
+                values[k] = deepcopy(value)
         if isinstance(self.value, date):
             values["value"] = self.value.isoformat()
-        if isinstance(self.format, ixbrlFormat):
-            values["format"] = self.format.to_json()
-        if isinstance(self.context, ixbrlContext):
-            values["context"] = self.context.to_json()
         return values
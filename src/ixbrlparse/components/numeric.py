@@ -1,16 +1,40 @@
 import logging
+import sys
+from collections import defaultdict
+from collections.abc import Sequence
 from copy import deepcopy
+from typing import TYPE_CHECKING
 
-from bs4 import Tag
-
+from ixbrlparse.components._base import ixbrlSource
 from ixbrlparse.components.constants import NAME_SPLIT_EXPECTED
 from ixbrlparse.components.context import ixbrlContext
-from ixbrlparse.components.transform import get_format, ixbrlFormat
+from ixbrlparse.components.transform import (
+    get_format_instance,
+    ixbrlFormat,
+    parse_values,
+)
+
+if TYPE_CHECKING:
+    from bs4 import Tag
 
 
 class ixbrlNumeric:  # noqa: N801
     """Models a numeric element in an iXBRL document"""
 
+    __slots__ = (
+        "context",
+        "format",
+        "name",
+        "schema",
+        "soup_tag",
+        "source",
+        "text",
+        "unit",
+        "value",
+    )
+    # attributes in the order they are output by to_json()
+    _fields = ("name", "schema", "text", "context", "unit", "value", "format")
+
     def __init__(
         self,
         name: str | None = None,
@@ -18,7 +42,10 @@ class ixbrlNumeric:  # noqa: N801
         value: str | int | float | None = None,
         text: str | int | float | None = None,
         context: ixbrlContext | str | None = None,
-        soup_tag: Tag | None = None,
+        soup_tag: "Tag | None" = None,
+        *,
+        source: ixbrlSource | None = None,
+        parse: bool = True,
         **attrs,
     ) -> None:
         """Constructor for the ixbrlNumeric class.
@@ -30,17 +57,22 @@ class ixbrlNumeric:  # noqa: N801
             text (str): The text of the numeric element
             context (ixbrlContext): The context of the numeric element
             soup_tag (Tag): The source tag in beautiful soup
+            source (ixbrlSource): A lightweight pointer to the source element,
+                used when the source tag is not kept
+            parse (bool): Whether to parse the value. If False the value is
+                left as None, to be parsed in a batch with other facts by
+                `parse_numeric_values()`
         """
         self.name: str | None = name
         self.schema: str = "unknown"
         if isinstance(name, str):
             name_value = name.split(":", maxsplit=1)
             if len(name_value) == NAME_SPLIT_EXPECTED:
-                self.schema = name_value[0]
-                self.name = name_value[1]
+                self.schema = sys.intern(name_value[0])
+                self.name = sys.intern(name_value[1])
             else:
                 self.schema = "unknown"
-                self.name = name_value[0]
+                self.name = sys.intern(name_value[0])
 
         if not isinstance(value, str | int | float):
             value = text
@@ -52,28 +84,86 @@ class ixbrlNumeric:  # noqa: N801
         self.unit: str | None = unit
         self.value: int | float | None = None
         self.soup_tag = soup_tag
+        self.source = source
 
-        format_ = {
-            "format_": attrs.get("format"),
-            "decimals": attrs.get("decimals", "0"),
-            "scale": attrs.get("scale", 0),
-            "sign": attrs.get("sign", ""),
-        }
-        self.format: ixbrlFormat | None = get_format(format_["format_"])(**format_)
+        self.format: ixbrlFormat | None = get_format_instance(
+            attrs.get("format"),
+            decimals=attrs.get("decimals", "0"),
+            scale=attrs.get("scale", 0),
+            sign=attrs.get("sign", ""),
+        )
 
         try:
-            if isinstance(self.format, ixbrlFormat):
-                parsed_value = self.format.parse_value(self.text)
-                if isinstance(parsed_value, int | float):
-                    self.value = parsed_value
+            if parse and isinstance(self.format, ixbrlFormat):
+                self.value = _numeric_value(self.format.parse_value(self.text))
         except ValueError:
             logging.info(attrs)
             raise
 
+    def release_source(self, index: int | None = None) -> None:
+        """Replace the reference to the source tag with an `ixbrlSource`, so
+        that the parsed document can be freed.
+
+        Parameters:
+            index:  The index of the tag in the document, if known."""
+        if self.soup_tag is not None:
+            self.source = ixbrlSource.from_tag(self.soup_tag, index)
+            self.soup_tag = None
+
     def to_json(self) -> dict:
-        values = {k: deepcopy(v) for k, v in self.__dict__.items() if k != "soup_tag"}
-        if isinstance(self.format, ixbrlFormat):
-            values["format"] = self.format.to_json()
-        if isinstance(self.context, ixbrlContext):
-            values["context"] = self.context.to_json()
+        values = {}
+        for k in self._fields:
+            if not hasattr(self, k):
+                continue
+            value = getattr(self, k)
+            # the format and context are converted rather than copied
+            if isinstance(value, ixbrlFormat | ixbrlContext):
+                values[k] = value.to_json()
+            else:
+                values[k] = deepcopy(value)
         return values
+
+
+def _numeric_value(value: object) -> int | float | None:
+    if isinstance(value, int | float):
+        return value
+    return None
+
+
+def parse_numeric_values(facts: Sequence[ixbrlNumeric]) -> list[Exception | None]:
+    """Parse the values of numeric facts created with `parse=False`.
+
+    The facts are grouped by their format, and the values in each group are
+    parsed together with `parse_values()`. If a group can't be parsed together
+    its values are parsed one at a time, so the values and errors are the same
+    as if each fact had been parsed when it was created.
+
+    Parameters:
+        facts: The facts to parse.
+
+    Returns:
+        The error raised when parsing each fact, or None if it was parsed.
+    """
+    groups: defaultdict[ixbrlFormat, list[ixbrlNumeric]] = defaultdict(list)
+    for fact in facts:
+        if fact.format is not None:
+            groups[fact.format].append(fact)
+
+    errors: dict[int, Exception] = {}
+    for format_, group in groups.items():
+        try:
+            values = parse_values(format_, [fact.text for fact in group])
+        except Exception:
+            values = []
+        if len(values) == len(group):
+            for fact, value in zip(group, values, strict=True):
+                fact.value = value if isinstance(value, int | float) else None
+            continue
+        for fact in group:
+            try:
+                fact.value = _numeric_value(format_.parse_value(fact.text))
+            except Exception as e:
+                errors[id(fact)] = e
+    if not errors:
+        return [None] * len(facts)
+    return [errors.get(id(fact)) for fact in facts]
@@ -1,31 +1,126 @@
+from datetime import date
+from functools import lru_cache
+
 from ixbrlparse.components._base import ixbrlFormat
-from ixbrlparse.plugins import pm
+from ixbrlparse.plugins import IXBRLPluginManager, pm
+
+FORMAT_CACHE_SIZE = 4096
+
+
+class FormatRegistry:
+    """Lookup from format names to format classes.
+
+    The lookup is built from the `ixbrl_add_formats` plugin hook the first time
+    it is needed, and rebuilt if plugins are registered or unregistered."""
+
+    def __init__(self, plugin_manager: IXBRLPluginManager) -> None:
+        self.plugin_manager = plugin_manager
+        self._generation: int | None = None
+        self._formats: dict[str, type[ixbrlFormat]] = {}
+        self._lookup: dict[str, type[ixbrlFormat]] = {}
+
+    @property
+    def formats(self) -> dict[str, type[ixbrlFormat]]:
+        if self._generation != self.plugin_manager.generation:
+            formats: dict[str, type[ixbrlFormat]] = {}
+            for additional_formats in self.plugin_manager.hook.ixbrl_add_formats():
+                for format_class in additional_formats:
+                    for format_str in format_class.format_names:
+                        formats[format_str] = format_class
+            self._formats = formats
+            self._lookup = {}
+            self._generation = self.plugin_manager.generation
+        return self._formats
+
+    def get(self, format_: str) -> type[ixbrlFormat]:
+        formats = self.formats
+        if format_ in self._lookup:
+            return self._lookup[format_]
+
+        format_list: list[str] = format_.split(":")
+        if len(format_list) > 1:
+            namespace = format_list[0]
+            format_name = ":".join(format_list[1:])
+        else:
+            namespace = None
+            format_name = ":".join(format_list)
+
+        format_name = format_name.replace("-", "")
+
+        if format_name in formats:
+            self._lookup[format_] = formats[format_name]
+            return formats[format_name]
+
+        msg = f'Format "{format_}" not implemented (namespace "{namespace}")'
+        raise NotImplementedError(msg)
+
+
+format_registry = FormatRegistry(pm)
 
 
 def get_format(format_: str | None) -> type[ixbrlFormat]:
     if not isinstance(format_, str):
         return ixbrlFormat
+    return format_registry.get(format_)
+
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def _get_cached_format(
+    format_: str | None,
+    decimals: int | str | None,
+    scale: int,
+    sign: str | None,
+    generation: int,  # noqa: ARG001
+) -> ixbrlFormat:
+    # `generation` is part of the cache key so that plugin changes are picked up
+    instance = get_format(format_)(
+        format_=format_,  # type: ignore[arg-type]
+        decimals=decimals,
+        scale=scale,
+        sign=sign,
+    )
+    instance._freeze()
+    return instance
+
+
+def get_format_instance(
+    format_: str | None,
+    decimals: int | str | None = None,
+    scale: int | str = 0,
+    sign: str | None = None,
+) -> ixbrlFormat:
+    """Get a format object for a set of format attributes.
 
-    original_format: str = format_
+    Format objects are cached and shared between every fact (and document)
+    that uses the same attributes, so they are frozen: setting an attribute on
+    one raises an `AttributeError`. Format names are normalised by removing
+    surrounding whitespace before they are looked up.
 
-    format_list: list[str] = format_.split(":")
-    if len(format_list) > 1:
-        namespace = format_list[0]
-        format_ = ":".join(format_list[1:])
-    else:
-        namespace = None
-        format_ = ":".join(format_list)
+    Parameters:
+        format_: The name of the format.
+        decimals: The number of decimal places.
+        scale: The scale of the format.
+        sign: The sign of the format.
+    """
+    if isinstance(format_, str):
+        format_ = format_.strip()
+    return _get_cached_format(format_, decimals, int(scale), sign, pm.generation)
 
-    format_ = format_.replace("-", "")
 
-    formats = {}
-    for additional_formats in pm.hook.ixbrl_add_formats():
-        for format_class in additional_formats:
-            for format_str in format_class.format_names:
-                formats[format_str] = format_class
+def parse_values(
+    format_: ixbrlFormat, values: list[str | int | float]
+) -> list[int | float | bool | date | str | None]:
+    """Parse the values of many facts which use the same format.
 
-    if format_ in formats:
-        return formats[format_]
+    Plugins can provide a quicker way of parsing a batch of values with the
+    `ixbrl_parse_values` hook, otherwise `format_.parse_values()` is used.
 
-    msg = f'Format "{original_format}" not implemented (namespace "{namespace}")'
-    raise NotImplementedError(msg)
+    Parameters:
+        format_: The format shared by the values.
+        values: The values to parse.
+    """
+    pm.load_entrypoints()
+    parsed = pm.hook.ixbrl_parse_values(format_=format_, values=values)
+    if parsed is None:
+        return format_.parse_values(values)
+    return parsed
@@ -1,15 +1,44 @@
-from collections.abc import Generator, Iterable
+import copy
+import io
+import itertools
+import mmap
+import os
+import zipfile
+from collections.abc import Callable, Generator, Iterable, Iterator
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import IO
+from typing import IO, TYPE_CHECKING, Any, ClassVar, TypeVar, cast
 
 from bs4 import BeautifulSoup, Tag
 
 from ixbrlparse.components import ixbrlContext, ixbrlNonNumeric, ixbrlNumeric
-from ixbrlparse.components._base import ixbrlError
+from ixbrlparse.components._base import ixbrlError, ixbrlErrorSummary
+from ixbrlparse.components.numeric import parse_numeric_values
+from ixbrlparse.index import FactIndex
+from ixbrlparse.serialise import write_json
+from ixbrlparse.stats import ParseStats
+
+if TYPE_CHECKING:
+    from ixbrlparse.cache import ParseCache
 
 FILETYPE_IXBRL = "ixbrl"
 FILETYPE_XBRL = "xbrl"
 
+ENGINE_BS4 = "bs4"
+ENGINE_LXML_STREAM = "lxml-stream"
+ENGINES = (ENGINE_BS4, ENGINE_LXML_STREAM)
+
+# file extensions of documents which can be parsed
+IXBRL_EXTENSIONS = (".html", ".htm", ".xhtml", ".xml")
+
+# columns output by IXBRL.to_table(), followed by one or more segment columns
+TABLE_COLUMNS = ("schema", "name", "value", "unit", "instant", "startdate", "enddate")
+
+FactT = TypeVar("FactT", ixbrlNonNumeric, ixbrlNumeric)
+
+# objects which IXBRL.from_bytes() can read without copying
+BytesLike = bytes | bytearray | memoryview | mmap.mmap
+
 
 class IXBRLParseError(Exception):
     pass
@@ -57,12 +86,50 @@ class BaseParser:
     def _get_numeric(self) -> None:
         pass
 
+    def parse(self, stats: ParseStats | None = None) -> None:
+        """Collect the schema, contexts, units and facts from the document.
+
+        Parameters:
+            stats:  Where to record the time taken by each phase.
+        """
+        if stats is None:
+            stats = ParseStats()
+        for phase, method in [
+            ("schema", self._get_schema),
+            ("contexts", self._get_contexts),
+            ("units", self._get_units),
+            ("nonnumeric", self._get_nonnumeric),
+            ("numeric", self._get_numeric),
+        ]:
+            with stats.phase(phase, self):
+                method()
+
+    def release_source(self) -> None:
+        pass
+
+    def get_index(self, tag: Tag) -> int | None:  # noqa: ARG002
+        """Get the index of a tag among all the elements of the document, in
+        document order, if it is known."""
+        return None
+
 
 class IXBRLParser(BaseParser):
     root_element: str = "html"
 
+    # the element names each part of the parser needs, keyed by tag name
+    element_groups: ClassVar[dict[str, str]] = {
+        "schemaRef": "schema",
+        "schemaref": "schema",
+        "resources": "resources",
+        "context": "context",
+        "unit": "unit",
+        "nonNumeric": "nonnumeric",
+        "nonFraction": "numeric",
+        "continuation": "continuation",
+    }
+
     def __init__(self, soup: BeautifulSoup, raise_on_error: bool = True) -> None:  # noqa: FBT001, FBT002
-        self.soup = soup
+        self.soup: BeautifulSoup | None = soup
         self.raise_on_error = raise_on_error
         self.errors: list = []
         self.contexts: dict[str, ixbrlContext] = {}
@@ -70,19 +137,102 @@ class IXBRLParser(BaseParser):
         self.namespaces: dict[str, str | list[str]] = {}
         self.nonnumeric: list[ixbrlNonNumeric] = []
         self.numeric: list[ixbrlNumeric] = []
+        self._elements: dict[str, list[Tag]] | None = None
+        self._continuations: dict[str, Tag] | None = None
+        # the index in the document of each element found by the walk, as
+        # bs4 doesn't record line numbers when parsing XML
+        self._indexes: dict[int, int] = {}
+
+    def _is_descendant(self, s: Tag, ancestor: Tag | None) -> bool:
+        if ancestor is None:
+            return False
+        return any(parent is ancestor for parent in s.parents)
+
+    def release_source(self) -> None:
+        """Drop all references to the parsed document, keeping only an
+        `ixbrlSource` for each fact and error."""
+        for nonnumeric in self.nonnumeric:
+            if nonnumeric.soup_tag is not None:
+                nonnumeric.release_source(self.get_index(nonnumeric.soup_tag))
+        for numeric in self.numeric:
+            if numeric.soup_tag is not None:
+                numeric.release_source(self.get_index(numeric.soup_tag))
+        for error in self.errors:
+            if isinstance(error, ixbrlError):
+                error.release_source(
+                    None if error.element is None else self.get_index(error.element)
+                )
+        self.soup = None
+        self._elements = None
+        self._continuations = None
+        self._indexes = {}
+
+    def get_index(self, tag: Tag) -> int | None:
+        return self._indexes.get(id(tag))
+
+    def parse(self, stats: ParseStats | None = None) -> None:
+        """Walk the document, then collect the schema, contexts, units and
+        facts from it.
+
+        Parameters:
+            stats:  Where to record the time taken by each phase.
+        """
+        if stats is None:
+            stats = ParseStats()
+        if self._elements is None:
+            with stats.phase("walk", self):
+                self._elements = self._walk()
+        super().parse(stats)
+
+    def _walk(self) -> dict[str, list[Tag]]:
+        """Walk the whole document once, sorting the elements into the groups
+        used by each part of the parser."""
+        if self.soup is None:
+            msg = "The source document has been released"
+            raise IXBRLParseError(msg)
+        elements: dict[str, list[Tag]] = {
+            "root": [],
+            "schema": [],
+            "resources": [],
+            "context": [],
+            "unit": [],
+            "nonnumeric": [],
+            "numeric": [],
+            "continuation": [],
+        }
+        index = 0
+        for s in self.soup.descendants:
+            if not isinstance(s, Tag):
+                continue
+            if s.name == self.root_element:
+                elements["root"].append(s)
+            group = self._get_element_group(s, elements["root"])
+            if group is not None:
+                elements[group].append(s)
+                self._indexes[id(s)] = index
+            index += 1
+        return elements
+
+    def _get_element_group(self, s: Tag, root_tags: list[Tag]) -> str | None:  # noqa: ARG002
+        return self.element_groups.get(s.name)
+
+    def _get_elements_by_group(self, group: str) -> list:
+        if self._elements is None:
+            self._elements = self._walk()
+        return self._elements[group]
 
     def _get_schema(self) -> None:
         self.schema = None
-        schema_tag = self.soup.find(
-            ["link:schemaRef", "schemaRef", "link:schemaref", "schemaref"]
-        )
+        schema_tags = self._get_elements_by_group("schema")
+        schema_tag = schema_tags[0] if schema_tags else None
         if isinstance(schema_tag, Tag) and schema_tag.get("xlink:href"):
             schema = schema_tag["xlink:href"]
             if isinstance(schema, str):
                 self.schema = schema.strip()
 
         self.namespaces = {}
-        namespace_tag = self.soup.find(self.root_element)
+        root_tags = self._get_elements_by_group("root")
+        namespace_tag = root_tags[0] if root_tags else None
         if isinstance(namespace_tag, Tag):
             for k in namespace_tag.attrs:
                 if isinstance(k, str) and (k.startswith("xmlns") or ":" in k):
@@ -90,14 +240,17 @@ class IXBRLParser(BaseParser):
                     if isinstance(namespace_value, str):
                         self.namespaces[k] = namespace_value.split(" ")
 
+    def _get_resources_elements(self, group: str) -> Generator[Tag, None, None]:
+        resources_tags = self._get_elements_by_group("resources")
+        resources = resources_tags[0] if resources_tags else None
+        for s in self._get_elements_by_group(group):
+            if self._is_descendant(s, resources):
+                yield s
+
     def _get_context_elements(
         self,
     ) -> Generator[Tag, None, None]:
-        resources = self.soup.find(["ix:resources", "resources"])
-        if isinstance(resources, Tag):
-            for s in resources.find_all(["xbrli:context", "context"]):
-                if isinstance(s, Tag):
-                    yield s
+        yield from self._get_resources_elements("context")
 
     def _get_contexts(self) -> None:
         self.contexts = {}
@@ -137,11 +290,7 @@ class IXBRLParser(BaseParser):
                     raise
 
     def _get_unit_elements(self) -> Generator[Tag, None, None]:
-        resources = self.soup.find(["ix:resources", "resources"])
-        if isinstance(resources, Tag):
-            for s in resources.find_all(["xbrli:unit", "unit"]):
-                if isinstance(s, Tag):
-                    yield s
+        yield from self._get_resources_elements("unit")
 
     def _get_units(self) -> None:
         self.units: dict[str, str | None] = {}
@@ -150,22 +299,35 @@ class IXBRLParser(BaseParser):
             if isinstance(s_id, str):
                 self.units[s_id] = self._get_tag_text(s, ["xbrli:measure", "measure"])
 
+    def _get_continuations(self) -> dict[str, Tag]:
+        """Index the continuation elements in the document by their id."""
+        if self._continuations is None:
+            self._continuations = {}
+            for s in self._get_elements_by_group("continuation"):
+                s_id = s.get("id")
+                if isinstance(s_id, str):
+                    self._continuations.setdefault(s_id, s)
+        return self._continuations
+
     def _get_tag_continuation(self, s: BeautifulSoup | Tag, start_str: str = "") -> str:
-        if not isinstance(s, Tag):
-            return start_str
-        start_str += s.text
-        if s.attrs.get("continuedAt"):
-            continuation_tag = self.soup.find(id=s.attrs.get("continuedAt"))
-            if (
-                isinstance(continuation_tag, Tag)
-                and continuation_tag.name == "continuation"
-            ):
-                return self._get_tag_continuation(continuation_tag, start_str)
+        continuations = self._get_continuations()
+        seen: set[str] = set()
+        tag: BeautifulSoup | Tag | None = s
+        while isinstance(tag, Tag):
+            start_str += tag.text
+            continued_at = tag.attrs.get("continuedAt")
+            if not isinstance(continued_at, str) or not continued_at:
+                break
+            if continued_at in seen:
+                msg = f"Continuation {continued_at} is part of a loop"
+                raise IXBRLParseError(msg)
+            seen.add(continued_at)
+            tag = continuations.get(continued_at)
         return start_str
 
     def _get_nonnumeric(self) -> None:
         self.nonnumeric = []
-        for s in self.soup.find_all({"nonNumeric"}):
+        for s in self._get_elements_by_group("nonnumeric"):
             try:
                 context = self.contexts.get(s["contextRef"], s["contextRef"])
                 format_ = s.get("format")
@@ -201,85 +363,101 @@ class IXBRLParser(BaseParser):
                     raise
 
     def _get_numeric(self) -> None:
-        self.numeric = []
-        for s in self.soup.find_all({"nonFraction"}):
+        pending: list[tuple[Tag, ixbrlNumeric | Exception]] = []
+        for s in self._get_elements_by_group("numeric"):
             try:
-                self.numeric.append(
-                    ixbrlNumeric(
-                        text=s.text,
-                        context=self.contexts.get(s["contextRef"], s["contextRef"]),
-                        unit=self.units.get(s["unitRef"], s["unitRef"]),
-                        soup_tag=s,
-                        **s.attrs,
-                    )
+                fact = ixbrlNumeric(
+                    text=s.text,
+                    context=self.contexts.get(s["contextRef"], s["contextRef"]),
+                    unit=self.units.get(s["unitRef"], s["unitRef"]),
+                    soup_tag=s,
+                    parse=False,
+                    **s.attrs,
                 )
             except Exception as e:
-                self.errors.append(
-                    ixbrlError(
-                        error=e,
-                        element=s,
-                    )
+                pending.append((s, e))
+            else:
+                pending.append((s, fact))
+        self._add_numeric(pending)
+
+    def _add_numeric(self, pending: list[tuple[Tag, ixbrlNumeric | Exception]]) -> None:
+        """Parse the values of the numeric facts in batches, then add the facts
+        and any errors in the order they appear in the document."""
+        self.numeric = []
+        value_errors = iter(
+            parse_numeric_values([f for _, f in pending if isinstance(f, ixbrlNumeric)])
+        )
+        for s, fact in pending:
+            if isinstance(fact, Exception):
+                error = fact
+            else:
+                value_error = next(value_errors)
+                if value_error is None:
+                    self.numeric.append(fact)
+                    continue
+                error = value_error
+            self.errors.append(
+                ixbrlError(
+                    error=error,
+                    element=s,
                 )
-                if self.raise_on_error:
-                    raise
+            )
+            if self.raise_on_error:
+                raise error
 
 
 class XBRLParser(IXBRLParser):
     root_element = "xbrl"
 
+    element_groups: ClassVar[dict[str, str]] = {
+        "schemaRef": "schema",
+        "schemaref": "schema",
+        "context": "context",
+        "unit": "unit",
+    }
+
+    def _get_element_group(self, s: Tag, root_tags: list[Tag]) -> str | None:
+        group = self.element_groups.get(s.name)
+        if group is not None:
+            return group
+        # facts are any element below the root with a context
+        if root_tags and s is not root_tags[0] and s.get("contextRef"):
+            return "numeric" if s.get("unitRef") else "nonnumeric"
+        return None
+
     def _get_context_elements(self) -> Generator[Tag, None, None]:
-        for s in self.soup.find_all(["xbrli:context", "context"]):
-            if isinstance(s, Tag):
-                yield s
+        yield from self._get_elements_by_group("context")
 
     def _get_unit_elements(self) -> Generator[Tag, None, None]:
-        for s in self.soup.find_all(["xbrli:unit", "unit"]):
-            if isinstance(s, Tag):
-                yield s
-
-    def _get_elements(self) -> Generator[Tag, None, None]:
-        resource = self.soup.find(self.root_element)
-        if isinstance(resource, Tag):
-            for s in resource.find_all(True):
-                if isinstance(s, Tag):
-                    yield s
+        yield from self._get_elements_by_group("unit")
 
     def _get_numeric(self) -> None:
-        self.numeric = []
-        for s in self._get_elements():
-            if not s.get("contextRef") or not s.get("unitRef"):
-                continue
+        pending: list[tuple[Tag, ixbrlNumeric | Exception]] = []
+        for s in self._get_elements_by_group("numeric"):
             context_ref = s["contextRef"]
             unit_ref = s["unitRef"]
             if not isinstance(context_ref, str) or not isinstance(unit_ref, str):
                 continue  # pragma: no cover
             try:
-                self.numeric.append(
-                    ixbrlNumeric(
-                        name=s.name,
-                        text=s.text,
-                        context=self.contexts.get(context_ref, context_ref),
-                        unit=self.units.get(unit_ref, unit_ref),
-                        soup_tag=s,
-                        **s.attrs,
-                    )
+                fact = ixbrlNumeric(
+                    name=s.name,
+                    text=s.text,
+                    context=self.contexts.get(context_ref, context_ref),
+                    unit=self.units.get(unit_ref, unit_ref),
+                    soup_tag=s,
+                    parse=False,
+                    **s.attrs,
                 )
             except Exception as e:
-                self.errors.append(
-                    {
-                        "error": e,
-                        "element": s,
-                    }
-                )
-                if self.raise_on_error:
-                    raise
+                pending.append((s, e))
+            else:
+                pending.append((s, fact))
+        self._add_numeric(pending)
 
     def _get_nonnumeric(self) -> None:
         self.nonnumeric = []
-        for s in self._get_elements():
+        for s in self._get_elements_by_group("nonnumeric"):
             try:
-                if not s.get("contextRef") or s.get("unitRef"):
-                    continue
                 context_ref = s["contextRef"]
                 if not isinstance(context_ref, str):
                     continue  # pragma: no cover
@@ -312,52 +490,44 @@ class XBRLParser(IXBRLParser):
                     raise
 
 
-class IXBRL:
+class IXBRLDocument:
     """
-    Parse an iXBRL file.
+    The contexts, units and facts of a parsed iXBRL or XBRL file.
+
+    This is the base of `IXBRL` and `IXBRLResult`, and provides the ways of
+    looking up and outputting the facts.
     """
 
-    def __init__(self, f: IO, raise_on_error: bool = True) -> None:  # noqa: FBT001, FBT002
-        """Constructor for the IXBRL class.
+    filetype: str | None
+    schema: str | None
+    namespaces: dict[str, str | list[str]]
+    contexts: dict[str, ixbrlContext]
+    units: dict[str, str | None]
+    nonnumeric: list[ixbrlNonNumeric]
+    numeric: list[ixbrlNumeric]
+    errors: list
+    stats: ParseStats
+    _facts: FactIndex | None
 
-        Parameters:
-            f:  File-like object to parse.
-            raise_on_error:  Whether to raise an exception on error
-        """
-        self.soup = BeautifulSoup(f.read(), "xml", multi_valued_attributes=None)
-        self.raise_on_error = raise_on_error
-        self._get_parser()
-        self.parser._get_schema()
-        self.parser._get_contexts()
-        self.parser._get_units()
-        self.parser._get_nonnumeric()
-        self.parser._get_numeric()
+    @property
+    def facts(self) -> FactIndex:
+        """An index of the numeric and non-numeric facts, for looking up facts
+        by name, context, period, schema or dimension.
 
-    @classmethod
-    def open(cls, filename: str | Path, raise_on_error: bool = True):  # noqa: FBT001, FBT002
-        """Open an iXBRL file.
+        The index is built the first time it is used.
 
-        Parameters:
-            filename:  Path to file to parse.
-            raise_on_error:  Whether to raise an exception on error
+        Examples:
+            >>> x = IXBRL.open("tests/test_accounts/account_1.html")
+            >>> x.facts.by_name("CurrentAssets")
+            >>> x.facts.value("CurrentAssets")  # value for the current period
+            2909.0
         """
-        with open(filename, "rb") as a:
-            return cls(a, raise_on_error=raise_on_error)
-
-    def _get_parser(self) -> None:
-        if self.soup.find("html"):
-            self.filetype = FILETYPE_IXBRL
-            parser = IXBRLParser
-        elif self.soup.find("xbrl"):
-            self.filetype = FILETYPE_XBRL
-            parser = XBRLParser
-        else:
-            msg = "Filetype not recognised"
-            raise IXBRLParseError(msg)
-        self.parser: BaseParser = parser(self.soup, raise_on_error=self.raise_on_error)
-
-    def __getattr__(self, name: str):
-        return getattr(self.parser, name)
+        if self._facts is None:
+            self._facts = FactIndex(
+                itertools.chain(self.nonnumeric, self.numeric),
+                self.contexts.values(),
+            )
+        return self._facts
 
     def to_json(self) -> dict:
         """Return a JSON representation of the iXBRL file.
@@ -383,6 +553,38 @@ class IXBRL:
             "errors": len(self.errors),
         }
 
+    def write_json(
+        self,
+        outfile: IO,
+        *,
+        indent: int | None = None,
+        inline_contexts: bool = False,
+        use_orjson: bool | None = None,
+    ) -> None:
+        """Write the iXBRL file to a text stream as JSON.
+
+        This is much faster than converting the output of `to_json()`, as the
+        facts are written one at a time without being copied. By default each
+        fact gives the id of its context instead of repeating the full context.
+        [`orjson`](https://github.com/ijl/orjson) is used if it is installed.
+
+        Parameters:
+            outfile:  The text stream to write to.
+            indent:  Indent the output by this number of spaces, or write it on
+                one line if None.
+            inline_contexts:  Include the full context with each fact, giving
+                the same structure as `to_json()`.
+            use_orjson:  Whether to use `orjson`. By default it is used if it is
+                installed and `indent` is None or 2.
+        """
+        write_json(
+            self,
+            outfile,
+            indent=indent,
+            inline_contexts=inline_contexts,
+            use_orjson=use_orjson,
+        )
+
     def to_table(self, fields: str = "numeric") -> list[dict]:
         """Return a list of dictionaries representing the iXBRL file.
 
@@ -415,43 +617,441 @@ class IXBRL:
             >>> df = pd.DataFrame.from_records(i.to_table(fields="numeric"))
             >>> df.head()
         """
+        return list(self.iter_table(fields))
+
+    def _iter_facts(self, fields: str) -> Iterable[ixbrlNonNumeric | ixbrlNumeric]:
         if fields == "nonnumeric":
-            values = self.nonnumeric
-        elif fields == "numeric":
-            values = self.numeric
-        else:
-            values = self.nonnumeric + self.numeric
-
-        ret = []
-        for v in values:
-            if isinstance(v.context, ixbrlContext) and v.context.segments:
-                segments = {
-                    f"segment:{i}": "{} {} {}".format(
-                        s.get("tag", ""), s.get("dimension"), s.get("value")
-                    ).strip()
-                    for i, s in enumerate(v.context.segments)
-                }
+            return self.nonnumeric
+        if fields == "numeric":
+            return self.numeric
+        return itertools.chain(self.nonnumeric, self.numeric)
+
+    def table_columns(self, fields: str = "numeric") -> list[str]:
+        """Get the columns of the rows returned by `to_table()`.
+
+        This finds the largest number of segments in the contexts of the facts,
+        so the columns are known before any rows are created.
+
+        Parameters:
+            fields:  Which fields to include in the output.  Can be "numeric",
+                "nonnumeric" or "all".
+        """
+        segments = max(
+            (
+                len(v.context.segments)
+                for v in self._iter_facts(fields)
+                if isinstance(v.context, ixbrlContext) and v.context.segments
+            ),
+            default=1,
+        )
+        return [*TABLE_COLUMNS, *(f"segment:{i}" for i in range(segments))]
+
+    def iter_table(self, fields: str = "numeric") -> Iterator[dict]:
+        """Yield a dictionary representing each fact in the iXBRL file.
+
+        This gives the same rows as `to_table()`, but creates each row only when
+        it is needed, so it can be used to write large tables without holding
+        them in memory.
+
+        Parameters:
+            fields:  Which fields to include in the output.  Can be "numeric",
+                "nonnumeric" or "all".
+        """
+        # the context and schema columns are shared by many facts, so are only
+        # worked out once for each context and schema
+        context_columns: dict[str, dict[str, str | None]] = {}
+        schema_columns: dict[str, str] = {}
+        no_context: dict[str, str | None] = {
+            "instant": None,
+            "startdate": None,
+            "enddate": None,
+            "segment:0": "",
+        }
+        for v in self._iter_facts(fields):
+            if isinstance(v.context, ixbrlContext):
+                columns = context_columns.get(v.context.id)
+                if columns is None:
+                    columns = self._get_context_columns(v.context)
+                    context_columns[v.context.id] = columns
             else:
-                segments = {"segment:0": ""}
-
-            ret.append(
-                {
-                    "schema": " ".join(
-                        self.namespaces.get(f"xmlns:{v.schema}", [v.schema])
-                    ),
-                    "name": v.name,
-                    "value": v.value,
-                    "unit": v.unit if hasattr(v, "unit") else None,
-                    "instant": str(v.context.instant)
-                    if isinstance(v.context, ixbrlContext) and v.context.instant
-                    else None,
-                    "startdate": str(v.context.startdate)
-                    if isinstance(v.context, ixbrlContext) and v.context.startdate
-                    else None,
-                    "enddate": str(v.context.enddate)
-                    if isinstance(v.context, ixbrlContext) and v.context.enddate
-                    else None,
-                    **segments,
-                }
+                columns = no_context
+
+            schema = schema_columns.get(v.schema)
+            if schema is None:
+                schema = " ".join(self.namespaces.get(f"xmlns:{v.schema}", [v.schema]))
+                schema_columns[v.schema] = schema
+
+            yield {
+                "schema": schema,
+                "name": v.name,
+                "value": v.value,
+                "unit": v.unit if hasattr(v, "unit") else None,
+                **columns,
+            }
+
+    @staticmethod
+    def _get_context_columns(context: ixbrlContext) -> dict[str, str | None]:
+        if context.segments:
+            segments = {
+                f"segment:{i}": "{} {} {}".format(
+                    s.get("tag", ""), s.get("dimension"), s.get("value")
+                ).strip()
+                for i, s in enumerate(context.segments)
+            }
+        else:
+            segments = {"segment:0": ""}
+        return {
+            "instant": str(context.instant) if context.instant else None,
+            "startdate": str(context.startdate) if context.startdate else None,
+            "enddate": str(context.enddate) if context.enddate else None,
+            **segments,
+        }
+
+
+class IXBRL(IXBRLDocument):
+    """
+    Parse an iXBRL file.
+    """
+
+    def __init__(
+        self,
+        f: IO,
+        raise_on_error: bool = True,  # noqa: FBT001, FBT002
+        engine: str = ENGINE_BS4,
+        keep_source: bool = True,  # noqa: FBT001, FBT002
+        *,
+        on_fact: Callable[[ixbrlNumeric | ixbrlNonNumeric], Any] | None = None,
+        stats: ParseStats | None = None,
+    ) -> None:
+        """Constructor for the IXBRL class.
+
+        Parameters:
+            f:  File-like object to parse.
+            raise_on_error:  Whether to raise an exception on error
+            engine:  The parser engine to use. "bs4" (the default) builds a
+                BeautifulSoup tree of the whole document, which is kept in
+                `.soup`. "lxml-stream" reads the document in a single pass
+                with lxml and discards elements once they have been processed,
+                which is faster and uses much less memory, but facts will not
+                have a `soup_tag`.
+            keep_source:  Whether to keep the parsed document in `.soup`, and
+                the source tag of each fact and error. If False these are
+                replaced with a lightweight `ixbrlSource` (in `.source`) once
+                the document has been parsed, so the document can be freed.
+            on_fact:  A function to call with each fact as soon as it has been
+                parsed, for documents too large to hold every fact in memory.
+                The facts are not kept, so `.numeric` and `.nonnumeric` will be
+                empty. Only works with the "lxml-stream" engine.
+            stats:  Where to record the time taken by each phase of parsing,
+                which is kept in `.stats`. Defaults to a new `ParseStats`.
+        """
+        if engine not in ENGINES:
+            msg = f"Engine {engine} not recognised - must be one of {ENGINES}"
+            raise ValueError(msg)
+        if on_fact is not None and engine != ENGINE_LXML_STREAM:
+            msg = f'on_fact can only be used with the "{ENGINE_LXML_STREAM}" engine'
+            raise ValueError(msg)
+        self.raise_on_error = raise_on_error
+        self.engine = engine
+        self._facts = None
+        self.stats = ParseStats() if stats is None else stats
+        if engine == ENGINE_LXML_STREAM:
+            from ixbrlparse.streaming import LXMLStreamParser  # noqa: PLC0415
+
+            self.soup: BeautifulSoup | None = None
+            parser = LXMLStreamParser(f, raise_on_error=raise_on_error)
+            parser.parse(self.stats, on_fact=on_fact)
+            self.filetype = parser.filetype
+            self.parser: BaseParser = parser
+        else:
+            with self.stats.phase("soup"):
+                self.soup = BeautifulSoup(f.read(), "xml", multi_valued_attributes=None)
+                self._get_parser(self.soup)
+            self.parser.parse(self.stats)
+        if not keep_source:
+            with self.stats.phase("release"):
+                self.release_source()
+
+    @classmethod
+    def open(
+        cls,
+        filename: str | Path,
+        raise_on_error: bool = True,  # noqa: FBT001, FBT002
+        engine: str = ENGINE_BS4,
+        keep_source: bool = True,  # noqa: FBT001, FBT002
+        cache: "ParseCache | str | Path | None" = None,
+        *,
+        mmap: bool = False,
+        on_fact: Callable[[ixbrlNumeric | ixbrlNonNumeric], Any] | None = None,
+        stats: ParseStats | None = None,
+    ):
+        """Open an iXBRL file.
+
+        Parameters:
+            filename:  Path to file to parse.
+            raise_on_error:  Whether to raise an exception on error
+            engine:  The parser engine to use, either "bs4" or "lxml-stream"
+            keep_source:  Whether to keep the parsed document and source tags
+            cache:  A `ParseCache`, or the directory of one, to get the parsed
+                document from if the file has been parsed before. Documents
+                from the cache never keep their source, whatever the value of
+                `keep_source`.
+            mmap:  Map the file into memory and parse it with `from_bytes()`,
+                rather than reading it. This avoids holding a copy of large
+                files with the "lxml-stream" engine.
+            on_fact:  A function to call with each fact instead of keeping the
+                facts. Can't be used with `cache`.
+            stats:  Where to record the time taken by each phase of parsing.
+                Can't be used with `cache`.
+        """
+        if cache is not None:
+            if on_fact is not None or stats is not None:
+                msg = "on_fact and stats can't be used with a cache"
+                raise ValueError(msg)
+            from ixbrlparse.cache import ParseCache  # noqa: PLC0415
+
+            if not isinstance(cache, ParseCache):
+                cache = ParseCache(cache)
+            return cache.open(filename, raise_on_error=raise_on_error, engine=engine)
+
+        with open(filename, "rb") as a:
+            # empty files can't be mapped
+            if mmap and os.fstat(a.fileno()).st_size > 0:
+                with _map_file(a) as buffer:
+                    return cls.from_bytes(
+                        buffer,
+                        raise_on_error=raise_on_error,
+                        engine=engine,
+                        keep_source=keep_source,
+                        on_fact=on_fact,
+                        stats=stats,
+                    )
+            return cls(
+                a,
+                raise_on_error=raise_on_error,
+                engine=engine,
+                keep_source=keep_source,
+                on_fact=on_fact,
+                stats=stats,
             )
-        return ret
+
+    @classmethod
+    def from_bytes(
+        cls,
+        buffer: BytesLike,
+        raise_on_error: bool = True,  # noqa: FBT001, FBT002
+        engine: str = ENGINE_BS4,
+        keep_source: bool = True,  # noqa: FBT001, FBT002
+        *,
+        on_fact: Callable[[ixbrlNumeric | ixbrlNonNumeric], Any] | None = None,
+        stats: ParseStats | None = None,
+    ) -> "IXBRL":
+        """Parse the contents of an iXBRL file.
+
+        The buffer is read in place rather than copied. The "lxml-stream"
+        engine reads it in small chunks, so only the parsed facts are held in
+        memory. The "bs4" engine needs the whole document as one bytes object,
+        so a bytes object is used as it is and any other buffer is copied once.
+
+        Parameters:
+            buffer:  The contents of the file, as bytes, a bytearray, a
+                memoryview or an mmap.
+            raise_on_error:  Whether to raise an exception on error
+            engine:  The parser engine to use, either "bs4" or "lxml-stream"
+            keep_source:  Whether to keep the parsed document and source tags
+            on_fact:  A function to call with each fact instead of keeping the
+                facts. Only works with the "lxml-stream" engine.
+            stats:  Where to record the time taken by each phase of parsing.
+        """
+        with BufferReader(buffer) as reader:
+            return cls(
+                cast(IO, reader),
+                raise_on_error=raise_on_error,
+                engine=engine,
+                keep_source=keep_source,
+                on_fact=on_fact,
+                stats=stats,
+            )
+
+    @classmethod
+    def iter_zip(
+        cls,
+        filename: str | Path,
+        raise_on_error: bool = True,  # noqa: FBT001, FBT002
+        engine: str = ENGINE_BS4,
+        keep_source: bool = True,  # noqa: FBT001, FBT002
+    ) -> Iterator[tuple[str, "IXBRL"]]:
+        """Parse each iXBRL file in a zip archive.
+
+        Members are read straight from the archive, without extracting them to
+        disk. Members which don't have one of the `IXBRL_EXTENSIONS` are skipped.
+
+        Parameters:
+            filename:  Path to the zip file.
+            raise_on_error:  Whether to raise an exception on error
+            engine:  The parser engine to use, either "bs4" or "lxml-stream"
+            keep_source:  Whether to keep the parsed document and source tags
+
+        Yields:
+            The name of each member in the archive and the parsed document.
+        """
+        with zipfile.ZipFile(filename) as z:
+            for member in zip_members(z):
+                with z.open(member) as a:
+                    yield (
+                        member,
+                        cls(
+                            a,
+                            raise_on_error=raise_on_error,
+                            engine=engine,
+                            keep_source=keep_source,
+                        ),
+                    )
+
+    def release_source(self) -> None:
+        """Free the parsed document.
+
+        The source tag of each fact and error is replaced with an `ixbrlSource`
+        giving the tag name, id, index and line number (if known) of the
+        element."""
+        self.soup = None
+        self.parser.release_source()
+
+    def to_result(self) -> "IXBRLResult":
+        """Get a detached copy of the parsed file, for sending to another process.
+
+        The result has the same contexts, units and facts, and the same methods
+        for looking up and outputting them, but no reference to the parser or
+        the parsed document. Each fact has an `ixbrlSource` instead of its
+        source tag, and errors are replaced with an `ixbrlErrorSummary`. This
+        object is left unchanged.
+        """
+        return IXBRLResult(
+            filetype=self.filetype,
+            schema=self.schema,
+            namespaces={
+                str(k): v if isinstance(v, list) else str(v)
+                for k, v in self.namespaces.items()
+            },
+            contexts=dict(self.contexts),
+            units=dict(self.units),
+            nonnumeric=[_detach(fact, self.parser) for fact in self.nonnumeric],
+            numeric=[_detach(fact, self.parser) for fact in self.numeric],
+            errors=[
+                ixbrlErrorSummary.from_error(
+                    e,
+                    self.parser.get_index(e.element)
+                    if isinstance(e, ixbrlError) and e.element is not None
+                    else None,
+                )
+                for e in self.errors
+            ],
+            stats=self.stats,
+        )
+
+    def _get_parser(self, soup: BeautifulSoup) -> None:
+        # check the root element first to avoid searching the whole document
+        root = soup.find(True)
+        root_name = root.name if isinstance(root, Tag) else None
+        if root_name == "html" or (root_name != "xbrl" and soup.find("html")):
+            self.filetype = FILETYPE_IXBRL
+            parser = IXBRLParser
+        elif root_name == "xbrl" or soup.find("xbrl"):
+            self.filetype = FILETYPE_XBRL
+            parser = XBRLParser
+        else:
+            msg = "Filetype not recognised"
+            raise IXBRLParseError(msg)
+        self.parser = parser(soup, raise_on_error=self.raise_on_error)
+
+    def __getattr__(self, name: str):
+        if name == "parser":
+            # the parser isn't set yet, for example while unpickling
+            raise AttributeError(name)
+        return getattr(self.parser, name)
+
+
+@dataclass(eq=False)
+class IXBRLResult(IXBRLDocument):
+    """A parsed iXBRL file, detached from the parser and the parsed document.
+
+    This is returned by `IXBRL.to_result()`. It only holds the contexts,
+    units, facts, namespaces, schema and a summary of any errors, so it is
+    cheap to pickle and send between processes.
+    """
+
+    filetype: str | None
+    schema: str | None
+    namespaces: dict[str, str | list[str]]
+    contexts: dict[str, ixbrlContext]
+    units: dict[str, str | None]
+    nonnumeric: list[ixbrlNonNumeric]
+    numeric: list[ixbrlNumeric]
+    errors: list[ixbrlErrorSummary] = field(default_factory=list)
+    stats: ParseStats = field(default_factory=ParseStats)
+    _facts: FactIndex | None = field(default=None, init=False, repr=False)
+
+    def __getstate__(self) -> dict:
+        # the fact index is quicker to build again than to pickle
+        return {**self.__dict__, "_facts": None}
+
+
+def _detach(fact: FactT, parser: BaseParser) -> FactT:
+    """Get a copy of a fact without its source tag."""
+    if fact.soup_tag is None:
+        return fact
+    index = parser.get_index(fact.soup_tag)
+    fact = copy.copy(fact)
+    fact.release_source(index)
+    return fact
+
+
+class BufferReader(io.RawIOBase):
+    """A read-only file over a bytes-like object, which reads the object in
+    place rather than copying it.
+
+    Reading the whole of a bytes object gives the object itself. The reader
+    must be closed before an mmap it reads from can be closed."""
+
+    def __init__(self, buffer: BytesLike) -> None:
+        self._source = buffer
+        self._view = memoryview(buffer)
+        self._buffer = self._view.cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int | None = -1) -> bytes:
+        start = self._position
+        end = len(self._buffer)
+        if size is not None and size >= 0:
+            end = min(start + size, end)
+        self._position = end
+        if start == 0 and end == len(self._buffer) and isinstance(self._source, bytes):
+            return self._source
+        return self._buffer[start:end].tobytes()
+
+    def readinto(self, b) -> int:
+        data = self.read(len(b))
+        b[: len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._buffer.release()
+            self._view.release()
+        super().close()
+
+
+def _map_file(f: IO) -> mmap.mmap:
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def zip_members(z: zipfile.ZipFile) -> list[str]:
+    """Get the names of the members of a zip archive that can be parsed."""
+    return [
+        info.filename
+        for info in z.infolist()
+        if not info.is_dir() and info.filename.lower().endswith(IXBRL_EXTENSIONS)
+    ]
@@ -1,15 +1,41 @@
+from typing import TYPE_CHECKING
+
 import pluggy
 
-from ixbrlparse.components.transform import ixbrlFormat
+if TYPE_CHECKING:
+    from ixbrlparse.components._base import ixbrlFormat
 
 hookimpl = pluggy.HookimplMarker("ixbrlparse")
 hookspec = pluggy.HookspecMarker("ixbrlparse")
 
 
 @hookspec
-def ixbrl_add_formats() -> list[type[ixbrlFormat]]:  # type: ignore
+def ixbrl_add_formats() -> "list[type[ixbrlFormat]]":  # type: ignore
     """Add new formats to the ixbrlparse library.
 
     Returns:
         list[[ixbrlFormat]]: A list of ixbrlFormat classes.
     """
+
+
+@hookspec(firstresult=True)
+def ixbrl_parse_values(  # type: ignore
+    format_: "ixbrlFormat", values: list[str | int | float]
+) -> list | None:
+    """Parse the values of many facts which use the same format.
+
+    Facts are grouped by their format object, and each group is parsed with a
+    single call of this hook. The first implementation that doesn't return
+    None is used, falling back to `format_.parse_values(values)`.
+
+    If an error is raised, each value in the group is parsed on its own with
+    `format_.parse_value()` so that the error is recorded against the right fact.
+
+    Parameters:
+        format_: The format shared by the values.
+        values: The text of each fact.
+
+    Returns:
+        list: The parsed values, in the same order, or None to use the
+            default implementation.
+    """
@@ -0,0 +1,237 @@
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from datetime import date
+from typing import Any
+
+from ixbrlparse.components import ixbrlContext, ixbrlNonNumeric, ixbrlNumeric
+
+Fact = ixbrlNumeric | ixbrlNonNumeric
+
+
+def _period_end(context: ixbrlContext | str | None) -> date | None:
+    if not isinstance(context, ixbrlContext):
+        return None
+    return context.instant or context.enddate
+
+
+def _context_id(context: ixbrlContext | str | None) -> str | None:
+    if isinstance(context, ixbrlContext):
+        return context.id
+    return context
+
+
+def _is_dimensional(context: ixbrlContext | str | None) -> bool:
+    return isinstance(context, ixbrlContext) and bool(context.segments)
+
+
+def _local_name(name: str) -> str:
+    return name.rpartition(":")[2]
+
+
+def _dimension_keys(dimension: str, member: str) -> set[tuple[str, str | None]]:
+    """Get the keys used to find a dimension and member, both with and
+    without their prefixes, and for any member of the dimension."""
+    keys: set[tuple[str, str | None]] = set()
+    for d in (dimension, _local_name(dimension)):
+        keys.add((d, None))
+        keys.add((d, member))
+        keys.add((d, _local_name(member)))
+    return keys
+
+
+def _as_date(value: date | str) -> date:
+    if isinstance(value, str):
+        return date.fromisoformat(value.strip())
+    return value
+
+
+class FactIndex:
+    """An index of the facts in a document, so that facts can be looked up
+    without searching through every fact.
+
+    The index is built once, when it is created. Each lookup returns a tuple of
+    facts in document order, with non-numeric facts before numeric facts.
+
+    Parameters:
+        facts:  The facts to index.
+        contexts:  The contexts to index by dimension. Any contexts used by the
+            facts are also included.
+    """
+
+    def __init__(
+        self, facts: Iterable[Fact], contexts: Iterable[ixbrlContext] = ()
+    ) -> None:
+        self._facts: list[Fact] = []
+        self._by_name: dict[str, list[Fact]] = defaultdict(list)
+        self._by_context: dict[str | None, list[Fact]] = defaultdict(list)
+        self._by_period: dict[date | None, list[Fact]] = defaultdict(list)
+        self._by_schema: dict[str, list[Fact]] = defaultdict(list)
+        self._by_dimension: dict[tuple[str, str | None], list[Fact]] = defaultdict(list)
+        self._contexts_by_dimension: dict[
+            tuple[str, str | None], dict[str, ixbrlContext]
+        ] = defaultdict(dict)
+        # the dimension keys of each context, keyed by context id
+        context_keys: dict[str, set[tuple[str, str | None]]] = {}
+
+        def _get_context_keys(context: ixbrlContext) -> set[tuple[str, str | None]]:
+            keys = context_keys.get(context.id)
+            if keys is None:
+                keys = set()
+                for dimension, member in context.dimensions:
+                    keys |= _dimension_keys(dimension, member)
+                for key in keys:
+                    self._contexts_by_dimension[key][context.id] = context
+                context_keys[context.id] = keys
+            return keys
+
+        for context in contexts:
+            _get_context_keys(context)
+        for fact in facts:
+            self._facts.append(fact)
+            if fact.name is not None:
+                self._by_name[fact.name].append(fact)
+            self._by_context[_context_id(fact.context)].append(fact)
+            self._by_period[_period_end(fact.context)].append(fact)
+            self._by_schema[fact.schema].append(fact)
+            if isinstance(fact.context, ixbrlContext) and fact.context.dimensions:
+                for key in _get_context_keys(fact.context):
+                    self._by_dimension[key].append(fact)
+        self._current_period: date | None = max(
+            (
+                period
+                for period, period_facts in self._by_period.items()
+                if period is not None
+                and any(
+                    isinstance(f, ixbrlNumeric) and not _is_dimensional(f.context)
+                    for f in period_facts
+                )
+            ),
+            default=None,
+        )
+
+    def __len__(self) -> int:
+        return len(self._facts)
+
+    def __iter__(self) -> Iterator[Fact]:
+        return iter(self._facts)
+
+    @property
+    def current_period(self) -> date | None:
+        """The end date of the current period of the document.
+
+        This is the latest period end date of any numeric fact without
+        dimensions, which avoids using dates like the date the accounts were
+        approved."""
+        return self._current_period
+
+    def by_name(self, name: str) -> tuple[Fact, ...]:
+        """Get the facts for a concept.
+
+        Parameters:
+            name:  The name of the concept, e.g. "Turnover". This can include
+                the schema prefix, e.g. "uk-core:Turnover", to only get the
+                facts from that schema.
+        """
+        schema, _, local_name = name.rpartition(":")
+        facts = self._by_name.get(local_name, [])
+        if schema:
+            return tuple(f for f in facts if f.schema == schema)
+        return tuple(facts)
+
+    def by_context(self, context_id: str) -> tuple[Fact, ...]:
+        """Get the facts which use a context.
+
+        Parameters:
+            context_id:  The id of the context.
+        """
+        return tuple(self._by_context.get(context_id, []))
+
+    def by_period(self, end_date: date | str) -> tuple[Fact, ...]:
+        """Get the facts for a period.
+
+        Parameters:
+            end_date:  The end date of the period, as a date or in `YYYY-MM-DD`
+                format. This matches both the instant date of instant contexts
+                and the end date of duration contexts.
+        """
+        return tuple(self._by_period.get(_as_date(end_date), []))
+
+    def by_schema(self, prefix: str) -> tuple[Fact, ...]:
+        """Get the facts for a schema.
+
+        Parameters:
+            prefix:  The schema prefix, e.g. "uk-core".
+        """
+        return tuple(self._by_schema.get(prefix, []))
+
+    def by_dimension(
+        self, dimension: str, member: str | None = None
+    ) -> tuple[Fact, ...]:
+        """Get the facts with a dimension, or with a member of a dimension.
+
+        For example `x.facts.by_dimension("ShareClassesDimension",
+        "OrdinaryShareClass1")` gives all the facts for the first class of
+        ordinary shares.
+
+        Parameters:
+            dimension:  The name of the dimension, with or without its prefix.
+            member:  The name of the member (or the value of a typed member),
+                with or without its prefix. If not given, facts with any member
+                of the dimension are returned.
+        """
+        return tuple(self._by_dimension.get((dimension, member), []))
+
+    def contexts_by_dimension(
+        self, dimension: str, member: str | None = None
+    ) -> tuple[ixbrlContext, ...]:
+        """Get the contexts with a dimension, or with a member of a dimension.
+
+        Parameters:
+            dimension:  The name of the dimension, with or without its prefix.
+            member:  The name of the member (or the value of a typed member),
+                with or without its prefix. If not given, contexts with any
+                member of the dimension are returned.
+        """
+        return tuple(self._contexts_by_dimension.get((dimension, member), {}).values())
+
+    def get(self, name: str, period: date | str | None = None) -> Fact | None:
+        """Get the non-dimensional fact for a concept in a period.
+
+        Facts with dimensions (for example a value for one class of shares) are
+        ignored. If there is more than one matching fact the first one in the
+        document is returned.
+
+        Parameters:
+            name:  The name of the concept, with or without a schema prefix.
+            period:  The end date of the period. Defaults to the current period.
+        """
+        end_date = self._current_period if period is None else _as_date(period)
+        if end_date is None:
+            return None
+        for fact in self.by_name(name):
+            if _period_end(fact.context) == end_date and not _is_dimensional(
+                fact.context
+            ):
+                return fact
+        return None
+
+    def value(
+        self,
+        name: str,
+        period: date | str | None = None,
+        default: Any = None,
+    ) -> Any:
+        """Get the value of the non-dimensional fact for a concept in a period.
+
+        For example `x.facts.value("Turnover")` gives the turnover for the
+        current period.
+
+        Parameters:
+            name:  The name of the concept, with or without a schema prefix.
+            period:  The end date of the period. Defaults to the current period.
+            default:  The value to return if there is no matching fact.
+        """
+        fact = self.get(name, period)
+        if fact is None:
+            return default
+        return fact.value
@@ -1,4 +1,5 @@
 import importlib
+from typing import Any
 
 import pluggy
 
@@ -6,12 +7,50 @@ from ixbrlparse import hookspecs
 
 DEFAULT_PLUGINS = ["ixbrlparse.components.formats"]
 
-pm = pluggy.PluginManager("ixbrlparse")
-pm.add_hookspecs(hookspecs)
 
-pm.load_setuptools_entrypoints("ixbrlparse")
+class IXBRLPluginManager(pluggy.PluginManager):
+    """Plugin manager which counts changes to the registered plugins.
+
+    Anything built from the results of a plugin hook can be cached until
+    `generation` changes.
+
+    Plugins installed with an entry point are only loaded the first time
+    `generation` is used (or `load_entrypoints()` is called), so that importing
+    ixbrlparse doesn't need to search the installed packages."""
+
+    def __init__(self, project_name: str) -> None:
+        super().__init__(project_name)
+        self._generation = 0
+        self._entrypoints_loaded = False
+
+    @property
+    def generation(self) -> int:
+        self.load_entrypoints()
+        return self._generation
+
+    def load_entrypoints(self) -> None:
+        """Load the plugins installed with an entry point, if they haven't
+        been loaded already."""
+        if not self._entrypoints_loaded:
+            self._entrypoints_loaded = True
+            self.load_setuptools_entrypoints(self.project_name)
+
+    def register(self, plugin: object, name: str | None = None) -> str | None:
+        plugin_name = super().register(plugin, name=name)
+        self._generation += 1
+        return plugin_name
+
+    def unregister(self, plugin: Any | None = None, name: str | None = None) -> Any:
+        unregistered = super().unregister(plugin=plugin, name=name)
+        self._generation += 1
+        return unregistered
+
+
+pm = IXBRLPluginManager("ixbrlparse")
+pm.add_hookspecs(hookspecs)
 
-# Load default plugins
+# Load default plugins. Plugins installed with an entry point are loaded
+# when they are first needed
 for plugin in DEFAULT_PLUGINS:
     mod = importlib.import_module(plugin)
     pm.register(mod, plugin)
@@ -0,0 +1,229 @@
+import json
+import re
+from collections.abc import Callable
+from datetime import date
+from typing import IO, TYPE_CHECKING, Any
+
+from ixbrlparse.components import (
+    ixbrlContext,
+    ixbrlFormat,
+    ixbrlNonNumeric,
+    ixbrlNumeric,
+)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from ixbrlparse.core import IXBRLDocument
+
+# indents supported by orjson
+ORJSON_INDENTS = (None, 2)
+
+NON_ASCII = re.compile(r"[^\x00-\x7f]")
+
+
+def _escape_character(match: re.Match) -> str:
+    code = ord(match.group())
+    if code > 0xFFFF:  # noqa: PLR2004
+        # characters outside the basic plane are written as a surrogate pair
+        code -= 0x10000
+        return f"\\u{0xD800 + (code >> 10):04x}\\u{0xDC00 + (code & 0x3FF):04x}"
+    return f"\\u{code:04x}"
+
+
+def _escape_non_ascii(value: str) -> str:
+    """Escape any non-ASCII characters in a JSON string, in the same way as
+    `json.dumps()` does by default."""
+    if value.isascii():
+        return value
+    return NON_ASCII.sub(_escape_character, value)
+
+
+def context_to_dict(context: ixbrlContext) -> dict[str, Any]:
+    """Convert a context to a dictionary, in the same form as
+    `ixbrlContext.to_json()` but without copying the segments."""
+    values = {k: getattr(context, k) for k in context._fields}
+    for i in ["startdate", "enddate", "instant"]:
+        if isinstance(values[i], date):
+            values[i] = values[i].isoformat()
+    return values
+
+
+def format_to_dict(format_: ixbrlFormat) -> dict[str, Any]:
+    """Convert a format to a dictionary, in the same form as
+    `ixbrlFormat.to_json()` but without copying it."""
+    return dict(format_.__dict__)
+
+
+class FactSerialiser:
+    """Convert facts to dictionaries in the same form as their `to_json()`
+    method, without making deep copies.
+
+    Each context and format is only converted once, as they are shared
+    between many facts.
+
+    Parameters:
+        inline_contexts:  If True the context of each fact is included in
+            full, as in `to_json()`. Otherwise the id of the context is given.
+    """
+
+    def __init__(self, *, inline_contexts: bool = True) -> None:
+        self.inline_contexts = inline_contexts
+        self._contexts: dict[int, dict[str, Any]] = {}
+        self._formats: dict[int, dict[str, Any]] = {}
+
+    def context(self, context: ixbrlContext) -> dict[str, Any]:
+        key = id(context)
+        if key not in self._contexts:
+            self._contexts[key] = context_to_dict(context)
+        return self._contexts[key]
+
+    def format(self, format_: ixbrlFormat) -> dict[str, Any]:
+        key = id(format_)
+        if key not in self._formats:
+            self._formats[key] = format_to_dict(format_)
+        return self._formats[key]
+
+    def fact(self, fact: ixbrlNumeric | ixbrlNonNumeric) -> dict[str, Any]:
+        values = {k: getattr(fact, k) for k in fact._fields if hasattr(fact, k)}
+        if isinstance(values.get("value"), date):
+            values["value"] = values["value"].isoformat()
+        if isinstance(fact.format, ixbrlFormat):
+            values["format"] = self.format(fact.format)
+        if isinstance(fact.context, ixbrlContext):
+            if self.inline_contexts:
+                values["context"] = self.context(fact.context)
+            else:
+                values["context"] = fact.context.id
+        return values
+
+
+def get_dumps(
+    indent: int | None = None, *, use_orjson: bool | None = None
+) -> Callable[[Any], str]:
+    """Get a function which converts an object to a JSON string.
+
+    `orjson` is used if it is installed and supports the indent, unless
+    `use_orjson` is False. Either way non-ASCII characters are escaped, as
+    `json.dumps()` does by default."""
+    if use_orjson is None:
+        use_orjson = orjson is not None and indent in ORJSON_INDENTS
+    if use_orjson:
+        if orjson is None:
+            msg = "orjson is not installed"
+            raise ImportError(msg)
+        if indent not in ORJSON_INDENTS:
+            msg = f"orjson does not support an indent of {indent}"
+            raise ValueError(msg)
+        # keys such as namespace attributes may be subclasses of str
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return lambda obj: _escape_non_ascii(
+            orjson.dumps(obj, option=option).decode("utf-8")
+        )
+    separators = (",", ": ") if indent is not None else (",", ":")
+    return lambda obj: json.dumps(obj, indent=indent, separators=separators)
+
+
+class _StreamWriter:
+    """Write JSON to a stream one item at a time, formatted in the same way as
+    the whole object would have been."""
+
+    def __init__(
+        self, outfile: IO, dumps: Callable[[Any], str], indent: int | None
+    ) -> None:
+        self.outfile = outfile
+        self.dumps = dumps
+        self.indent = indent
+        self.colon = ": " if indent is not None else ":"
+        # whether each open container is still empty
+        self._empty: list[bool] = []
+
+    def _newline(self) -> str:
+        if self.indent is None:
+            return ""
+        return "\n" + " " * (self.indent * len(self._empty))
+
+    def begin(self, bracket: str) -> None:
+        self.outfile.write(bracket)
+        self._empty.append(True)
+
+    def end(self, bracket: str) -> None:
+        empty = self._empty.pop()
+        if not empty:
+            self.outfile.write(self._newline())
+        self.outfile.write(bracket)
+
+    def item(self, key: str | None = None) -> None:
+        """Start a new item in the current container, with a key if the
+        container is an object."""
+        if not self._empty[-1]:
+            self.outfile.write(",")
+        self._empty[-1] = False
+        self.outfile.write(self._newline())
+        if key is not None:
+            self.outfile.write(self.dumps(key) + self.colon)
+
+    def value(self, obj: Any) -> None:
+        value = self.dumps(obj)
+        if self.indent is not None and "\n" in value:
+            value = value.replace("\n", self._newline())
+        self.outfile.write(value)
+
+
+def write_json(
+    x: "IXBRLDocument",
+    outfile: IO,
+    *,
+    indent: int | None = None,
+    inline_contexts: bool = False,
+    use_orjson: bool | None = None,
+) -> None:
+    """Write a parsed document to a text stream as JSON.
+
+    The output has the same structure as `IXBRL.to_json()`, but is written one
+    fact at a time without making deep copies of each fact. By default the
+    context of each fact is given by its id, which refers to the `contexts`
+    object, rather than repeating the full context for every fact.
+
+    Parameters:
+        x:  The parsed document.
+        outfile:  The text stream to write to.
+        indent:  Indent the output by this number of spaces, or write it on one
+            line if None.
+        inline_contexts:  Include the full context with each fact, as in
+            `IXBRL.to_json()`.
+        use_orjson:  Whether to use `orjson` to encode the output. By default
+            it is used if it is installed and `indent` is None or 2. Note that
+            `orjson` writes infinite numbers as `null`.
+    """
+    writer = _StreamWriter(outfile, get_dumps(indent, use_orjson=use_orjson), indent)
+    serialiser = FactSerialiser(inline_contexts=inline_contexts)
+
+    writer.begin("{")
+    writer.item("schema")
+    writer.value(x.schema)
+    writer.item("namespaces")
+    writer.value(x.namespaces)
+    writer.item("contexts")
+    writer.begin("{")
+    for context_id, context in x.contexts.items():
+        writer.item(context_id)
+        writer.value(serialiser.context(context))
+    writer.end("}")
+    writer.item("units")
+    writer.value(x.units)
+    for field in ["nonnumeric", "numeric"]:
+        writer.item(field)
+        writer.begin("[")
+        for fact in getattr(x, field):
+            writer.item()
+            writer.value(serialiser.fact(fact))
+        writer.end("]")
+    writer.item("errors")
+    writer.value(len(x.errors))
+    writer.end("}")
@@ -0,0 +1,310 @@
+import sqlite3
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from ixbrlparse.components import (
+    ixbrlContext,
+    ixbrlFormat,
+    ixbrlNonNumeric,
+    ixbrlNumeric,
+)
+
+if TYPE_CHECKING:
+    from ixbrlparse.core import IXBRL
+
+# the number of documents written in each transaction
+DEFAULT_CHUNK_SIZE = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    document_id INTEGER PRIMARY KEY,
+    filename TEXT NOT NULL,
+    schema TEXT,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS contexts (
+    document_id INTEGER NOT NULL REFERENCES documents (document_id),
+    context_id TEXT NOT NULL,
+    entity_scheme TEXT,
+    entity TEXT,
+    instant TEXT,
+    startdate TEXT,
+    enddate TEXT
+);
+CREATE TABLE IF NOT EXISTS segments (
+    document_id INTEGER NOT NULL REFERENCES documents (document_id),
+    context_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    tag TEXT,
+    dimension TEXT,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS units (
+    document_id INTEGER NOT NULL REFERENCES documents (document_id),
+    unit_id TEXT NOT NULL,
+    measure TEXT
+);
+CREATE TABLE IF NOT EXISTS numeric (
+    document_id INTEGER NOT NULL REFERENCES documents (document_id),
+    schema TEXT,
+    name TEXT,
+    context_id TEXT,
+    unit TEXT,
+    value REAL,
+    text TEXT,
+    format TEXT,
+    decimals TEXT,
+    scale INTEGER,
+    sign TEXT
+);
+CREATE TABLE IF NOT EXISTS nonnumeric (
+    document_id INTEGER NOT NULL REFERENCES documents (document_id),
+    schema TEXT,
+    name TEXT,
+    context_id TEXT,
+    format TEXT,
+    value TEXT,
+    text TEXT
+);
+"""
+
+# created once the data has been loaded, as this is quicker than updating
+# them for every row
+INDEXES = """
+CREATE INDEX IF NOT EXISTS documents_filename ON documents (filename);
+CREATE INDEX IF NOT EXISTS contexts_document ON contexts (document_id, context_id);
+CREATE INDEX IF NOT EXISTS segments_document ON segments (document_id, context_id);
+CREATE INDEX IF NOT EXISTS segments_dimension ON segments (dimension, value);
+CREATE INDEX IF NOT EXISTS units_document ON units (document_id, unit_id);
+CREATE INDEX IF NOT EXISTS numeric_document ON numeric (document_id, context_id);
+CREATE INDEX IF NOT EXISTS numeric_name ON numeric (name, schema);
+CREATE INDEX IF NOT EXISTS nonnumeric_document ON nonnumeric (document_id, context_id);
+CREATE INDEX IF NOT EXISTS nonnumeric_name ON nonnumeric (name, schema);
+"""
+
+# the columns of each table apart from document_id, in the order of the
+# values returned by document_tables()
+TABLES = {
+    "contexts": (
+        "context_id",
+        "entity_scheme",
+        "entity",
+        "instant",
+        "startdate",
+        "enddate",
+    ),
+    "segments": ("context_id", "position", "tag", "dimension", "value"),
+    "units": ("unit_id", "measure"),
+    "numeric": (
+        "schema",
+        "name",
+        "context_id",
+        "unit",
+        "value",
+        "text",
+        "format",
+        "decimals",
+        "scale",
+        "sign",
+    ),
+    "nonnumeric": ("schema", "name", "context_id", "format", "value", "text"),
+}
+
+
+def _context_id(context: ixbrlContext | str | None) -> str | None:
+    if isinstance(context, ixbrlContext):
+        return context.id
+    return context
+
+
+def _date(value: date | str | None) -> str | None:
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _format_name(format_: ixbrlFormat | None) -> str | None:
+    if not isinstance(format_, ixbrlFormat) or format_.format is None:
+        return None
+    if format_.namespace:
+        return f"{format_.namespace}:{format_.format}"
+    return format_.format
+
+
+def _text(value: Any) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def document_tables(x: "IXBRL", fields: str = "all") -> dict[str, list[tuple]]:
+    """Convert a parsed document into rows for each of the tables in the
+    database.
+
+    The rows are plain tuples, so they can be sent cheaply from a worker
+    process to the process writing the database. They don't include the
+    `document_id` column, which is added when they are written.
+
+    Parameters:
+        x:  The parsed document.
+        fields:  Which facts to include, "numeric", "nonnumeric" or "all".
+    """
+    tables: dict[str, list[tuple]] = {table: [] for table in TABLES}
+    for context in x.contexts.values():
+        entity = context.entity if isinstance(context.entity, dict) else {}
+        tables["contexts"].append(
+            (
+                context.id,
+                entity.get("scheme"),
+                entity.get("identifier"),
+                _date(context.instant),
+                _date(context.startdate),
+                _date(context.enddate),
+            )
+        )
+        for position, segment in enumerate(context.segments or []):
+            tables["segments"].append(
+                (
+                    context.id,
+                    position,
+                    segment.get("tag"),
+                    segment.get("dimension"),
+                    _text(segment.get("value")),
+                )
+            )
+    tables["units"].extend(x.units.items())
+    if fields in ("numeric", "all"):
+        tables["numeric"].extend(_numeric_row(fact) for fact in x.numeric)
+    if fields in ("nonnumeric", "all"):
+        tables["nonnumeric"].extend(_nonnumeric_row(fact) for fact in x.nonnumeric)
+    return tables
+
+
+def _numeric_row(fact: ixbrlNumeric) -> tuple:
+    format_ = fact.format if isinstance(fact.format, ixbrlFormat) else None
+    return (
+        fact.schema,
+        fact.name,
+        _context_id(fact.context),
+        fact.unit,
+        fact.value,
+        _text(fact.text),
+        _format_name(format_),
+        _text(format_.decimals) if format_ else None,
+        format_.scale if format_ else None,
+        format_.sign if format_ else None,
+    )
+
+
+def _nonnumeric_row(fact: ixbrlNonNumeric) -> tuple:
+    return (
+        fact.schema,
+        fact.name,
+        _context_id(fact.context),
+        _format_name(fact.format),
+        _text(fact.value),
+        _text(fact.text),
+    )
+
+
+class SQLiteWriter:
+    """Write parsed documents to normalised tables in an SQLite database.
+
+    Rows are collected in memory and written with `executemany()`, with one
+    transaction for each chunk of documents. The indexes are created when the
+    writer is closed, after all the data has been loaded. Documents are added
+    to any that are already in the database.
+
+    Only one writer should be used for a database at a time. To load many files
+    in parallel, use `parse_files(..., tables=True)`, which converts each
+    document with `document_tables()` in the worker processes, and add the
+    results to a single writer.
+
+    Parameters:
+        database:  The path of the database, or an open connection.
+        chunksize:  The number of documents written in each transaction.
+    """
+
+    def __init__(
+        self,
+        database: str | Path | sqlite3.Connection,
+        chunksize: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        if isinstance(database, sqlite3.Connection):
+            self.connection = database
+        else:
+            self.connection = sqlite3.connect(database)
+        self.chunksize = chunksize
+        self.connection.executescript(SCHEMA)
+        (last_id,) = self.connection.execute(
+            "SELECT MAX(document_id) FROM documents"
+        ).fetchone()
+        self._next_id: int = (last_id or 0) + 1
+        self._documents: list[tuple] = []
+        self._rows: dict[str, list[tuple]] = {table: [] for table in TABLES}
+
+    def __enter__(self) -> "SQLiteWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def add(
+        self,
+        filename: str,
+        tables: dict[str, list[tuple]] | None = None,
+        schema: str | None = None,
+        error: str | None = None,
+    ) -> int:
+        """Add a document to be written, returning its `document_id`.
+
+        Parameters:
+            filename:  The name of the file the document came from.
+            tables:  The rows for each table, from `document_tables()`.
+            schema:  The schema of the document.
+            error:  A description of the error if the file could not be parsed.
+        """
+        document_id = self._next_id
+        self._next_id += 1
+        self._documents.append((document_id, filename, schema, error))
+        for table, rows in (tables or {}).items():
+            self._rows[table].extend((document_id, *row) for row in rows)
+        if len(self._documents) >= self.chunksize:
+            self.flush()
+        return document_id
+
+    def add_document(self, filename: str, x: "IXBRL", fields: str = "all") -> int:
+        """Add a parsed document to be written, returning its `document_id`."""
+        return self.add(filename, document_tables(x, fields), schema=x.schema)
+
+    def flush(self) -> None:
+        """Write the documents that have been added in a single transaction."""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO documents (document_id, filename, schema, error) "
+                "VALUES (?, ?, ?, ?)",
+                self._documents,
+            )
+            for table, columns in TABLES.items():
+                self.connection.executemany(
+                    "INSERT INTO {} (document_id, {}) VALUES ({})".format(  # noqa: S608
+                        table, ", ".join(columns), ", ".join("?" * (len(columns) + 1))
+                    ),
+                    self._rows[table],
+                )
+        self._documents = []
+        self._rows = {table: [] for table in TABLES}
+
+    def create_indexes(self) -> None:
+        """Create the indexes on the tables, if they don't already exist."""
+        self.connection.executescript(INDEXES)
+
+    def close(self) -> None:
+        """Write any remaining documents, create the indexes and close the
+        database."""
+        self.flush()
+        self.create_indexes()
+        self.connection.close()
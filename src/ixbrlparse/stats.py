@@ -0,0 +1,162 @@
+import heapq
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+# the number of slowest documents reported by BatchStats
+SLOWEST_DOCUMENTS = 10
+
+
+@dataclass
+class PhaseStats:
+    """The time taken by a phase of parsing, and the facts and errors it found.
+
+    Attributes:
+        seconds: The wall time of the phase in seconds.
+        facts: The number of numeric and non-numeric facts found.
+        errors: The number of errors recorded."""
+
+    seconds: float = 0.0
+    facts: int = 0
+    errors: int = 0
+
+    def add(self, other: "PhaseStats") -> None:
+        self.seconds += other.seconds
+        self.facts += other.facts
+        self.errors += other.errors
+
+
+def _counts(parser: Any) -> tuple[int, int]:
+    facts = len(getattr(parser, "numeric", ())) + len(getattr(parser, "nonnumeric", ()))
+    return facts, len(getattr(parser, "errors", ()))
+
+
+@dataclass
+class ParseStats:
+    """Statistics for each phase of parsing one or more documents.
+
+    Each document parsed by `IXBRL` has its statistics in `.stats`. The
+    statistics for many documents can be combined with `add()`.
+
+    Attributes:
+        phases: The statistics for each phase, in the order they ran.
+        documents: The number of documents included."""
+
+    phases: dict[str, PhaseStats] = field(default_factory=dict)
+    documents: int = 1
+
+    @contextmanager
+    def phase(self, name: str, parser: Any = None) -> Iterator[None]:
+        """Time a phase of parsing.
+
+        Parameters:
+            name:  The name of the phase.
+            parser:  The parser, which is used to count the facts and errors
+                added during the phase.
+        """
+        facts, errors = _counts(parser)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end_facts, end_errors = _counts(parser)
+            self.phases.setdefault(name, PhaseStats()).add(
+                PhaseStats(
+                    seconds=time.perf_counter() - start,
+                    facts=end_facts - facts,
+                    errors=end_errors - errors,
+                )
+            )
+
+    @property
+    def seconds(self) -> float:
+        """The total time of all the phases in seconds."""
+        return sum(p.seconds for p in self.phases.values())
+
+    @property
+    def facts(self) -> int:
+        """The total number of facts found."""
+        return sum(p.facts for p in self.phases.values())
+
+    @property
+    def errors(self) -> int:
+        """The total number of errors recorded."""
+        return sum(p.errors for p in self.phases.values())
+
+    def add(self, other: "ParseStats") -> None:
+        """Add the statistics for other documents to these statistics."""
+        self.documents += other.documents
+        for name, phase in other.phases.items():
+            self.phases.setdefault(name, PhaseStats()).add(phase)
+
+    def to_json(self) -> dict:
+        """Convert the statistics to a JSON serialisable dictionary."""
+        return {
+            "documents": self.documents,
+            "seconds": self.seconds,
+            "facts": self.facts,
+            "errors": self.errors,
+            "phases": {
+                name: {
+                    "seconds": phase.seconds,
+                    "facts": phase.facts,
+                    "errors": phase.errors,
+                }
+                for name, phase in self.phases.items()
+            },
+        }
+
+
+class BatchStats:
+    """Combine the statistics for many documents, keeping track of the
+    documents which took the longest to parse.
+
+    Parameters:
+        slowest:  The number of slowest documents to keep.
+    """
+
+    def __init__(self, slowest: int = SLOWEST_DOCUMENTS) -> None:
+        self.total = ParseStats(documents=0)
+        self.failed = 0
+        self._slowest_count = slowest
+        # a heap of the slowest documents, with the quickest first
+        self._slowest: list[tuple[float, int, str, ParseStats]] = []
+
+    def add(self, filename: str, stats: ParseStats | None) -> None:
+        """Add the statistics for a document, or count it as failed if there
+        are no statistics."""
+        if stats is None:
+            self.failed += 1
+            return
+        self.total.add(stats)
+        item = (stats.seconds, self.total.documents, filename, stats)
+        if len(self._slowest) < self._slowest_count:
+            heapq.heappush(self._slowest, item)
+        elif self._slowest and item[0] > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, item)
+
+    @property
+    def slowest(self) -> list[tuple[str, ParseStats]]:
+        """The documents which took the longest to parse, slowest first."""
+        return [
+            (filename, stats)
+            for _, _, filename, stats in sorted(self._slowest, reverse=True)
+        ]
+
+    def to_json(self) -> dict:
+        """Convert the statistics to a JSON serialisable dictionary."""
+        return {
+            **self.total.to_json(),
+            "failed": self.failed,
+            "slowest": [
+                {
+                    "filename": filename,
+                    "seconds": stats.seconds,
+                    "facts": stats.facts,
+                    "errors": stats.errors,
+                }
+                for filename, stats in self.slowest
+            ],
+        }
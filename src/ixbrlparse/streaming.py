@@ -0,0 +1,571 @@
+import itertools
+import logging
+from collections.abc import Callable, Iterator
+from typing import IO, Any
+
+from lxml import etree
+
+from ixbrlparse.components import ixbrlContext, ixbrlNonNumeric, ixbrlNumeric
+from ixbrlparse.components._base import ixbrlError, ixbrlSource
+from ixbrlparse.core import (
+    FILETYPE_IXBRL,
+    FILETYPE_XBRL,
+    BaseParser,
+    IXBRLParseError,
+)
+from ixbrlparse.stats import ParseStats
+
+logger = logging.getLogger(__name__)
+
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+XLINK_HREF = "{http://www.w3.org/1999/xlink}href"
+
+ROOT_ELEMENTS = {"html": FILETYPE_IXBRL, "xbrl": FILETYPE_XBRL}
+SCHEMA_ELEMENTS = ("schemaRef", "schemaref")
+
+# elements whose children are needed once the element itself has been read,
+# so nothing inside them can be cleared until they are finished
+IXBRL_CAPTURE_ELEMENTS = frozenset(
+    ["context", "unit", "nonNumeric", "nonFraction", "continuation"]
+)
+XBRL_CAPTURE_ELEMENTS = frozenset(["context", "unit"])
+
+# the most facts held back by LXMLStreamParser.iter_facts() while waiting for
+# a context or unit to be defined
+DEFAULT_MAX_SPILL = 10_000
+
+Fact = ixbrlNumeric | ixbrlNonNumeric
+
+
+def _localname(tag: Any) -> str:
+    if not isinstance(tag, str):
+        return ""
+    return tag.rpartition("}")[2]
+
+
+def _prefixed_name(key: str, element: etree._Element) -> str:
+    """Convert an lxml `{namespace}name` key into the `prefix:name` form
+    used by BeautifulSoup."""
+    if not key.startswith("{"):
+        return key
+    namespace, _, name = key[1:].partition("}")
+    if namespace == XML_NAMESPACE:
+        return f"xml:{name}"
+    for prefix, uri in element.nsmap.items():
+        if uri == namespace and prefix:
+            return f"{prefix}:{name}"
+    return name
+
+
+def _source(element: etree._Element, index: int | None = None) -> ixbrlSource:
+    element_id = element.get("id")
+    return ixbrlSource(
+        name=_prefixed_name(element.tag, element),
+        id=element_id if isinstance(element_id, str) else None,
+        line=element.sourceline,
+        index=index,
+    )
+
+
+def _attributes(element: etree._Element, *, namespaces: bool = False) -> dict[str, str]:
+    attrs: dict[str, str] = {}
+    if namespaces:
+        parent = element.getparent()
+        parent_nsmap = parent.nsmap if parent is not None else {}
+        for prefix, uri in element.nsmap.items():
+            if parent_nsmap.get(prefix) != uri:
+                attrs[f"xmlns:{prefix}" if prefix else "xmlns"] = uri
+    for key, value in element.attrib.items():
+        attrs[_prefixed_name(key, element)] = value
+    return attrs
+
+
+def _find(element: etree._Element, name: str) -> etree._Element | None:
+    for child in element.iterdescendants():
+        if _localname(child.tag) == name:
+            return child
+    return None
+
+
+def _find_text(element: etree._Element, name: str) -> str | None:
+    found = _find(element, name)
+    if found is None:
+        return None
+    return "".join(found.itertext()).strip()
+
+
+def _find_attribute(element: etree._Element, name: str, attribute: str) -> str | None:
+    found = _find(element, name)
+    if found is None:
+        return None
+    value = found.get(attribute)
+    if isinstance(value, str):
+        return value.strip()
+    return None
+
+
+def _remove_keeping_tail(element: etree._Element) -> None:
+    parent = element.getparent()
+    if parent is None:
+        return  # pragma: no cover
+    if element.tail:
+        previous = element.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or "") + element.tail
+        else:
+            parent.text = (parent.text or "") + element.tail
+    parent.remove(element)
+
+
+class _TextReader:
+    """Wrap a text-mode file so that lxml receives UTF-8 encoded bytes."""
+
+    def __init__(self, f: IO) -> None:
+        self.f = f
+
+    def read(self, size: int = -1) -> bytes:
+        return self.f.read(size).encode("utf-8")
+
+
+class LXMLStreamParser(BaseParser):
+    """Parse an iXBRL or XBRL document in a single streaming pass.
+
+    Elements are read with `lxml.etree.iterparse` and cleared as soon as
+    they have been processed, so the whole document tree is never held in
+    memory. The parser produces the same `ixbrlContext`, `ixbrlNumeric` and
+    `ixbrlNonNumeric` objects as the BeautifulSoup based parsers, but facts
+    do not keep a reference to their source tag."""
+
+    def __init__(self, f: IO, raise_on_error: bool = True) -> None:  # noqa: FBT001, FBT002
+        self.f: IO | None = f
+        self.raise_on_error = raise_on_error
+        self.filetype: str | None = None
+        self.errors: list = []
+        self.contexts: dict[str, ixbrlContext] = {}
+        self.units: dict[str, str | None] = {}
+        self.schema: str | None = None
+        self.namespaces: dict[str, str | list[str]] = {}
+        self.nonnumeric: list[ixbrlNonNumeric] = []
+        self.numeric: list[ixbrlNumeric] = []
+        self._continuations: dict[str, tuple[str, str | None]] = {}
+        self._unresolved: list[tuple[ixbrlNumeric | ixbrlNonNumeric, str | None]] = []
+        # used by iter_facts(): the facts held back in the spill buffer, in the
+        # order they were read, and the keys of the facts in the buffer which
+        # are waiting for each missing context and unit id
+        self._spill: dict[int, tuple[Fact, str | None, list[tuple[str, str]]]] = {}
+        self._waiting: dict[tuple[str, str], dict[int, None]] = {}
+
+    def release_source(self) -> None:
+        """Drop the reference to the source file, and the tracebacks of any
+        errors."""
+        self.f = None
+        for error in self.errors:
+            if isinstance(error, ixbrlError):
+                error.release_source()
+        self._continuations = {}
+
+    def _events(self) -> Iterator[tuple[str, etree._Element]]:
+        if self.f is None:
+            msg = "The source document has been released"
+            raise IXBRLParseError(msg)
+        source: Any = self.f
+        encoding = None
+        if isinstance(self.f.read(0), str):
+            source = _TextReader(self.f)
+            encoding = "utf-8"
+        yield from etree.iterparse(
+            source,
+            events=("start", "end"),
+            encoding=encoding,
+            recover=True,
+            huge_tree=True,
+            remove_comments=True,
+            remove_pis=True,
+        )
+
+    def _get_root(self, element: etree._Element) -> None:
+        root_name = _localname(element.tag)
+        if root_name not in ROOT_ELEMENTS:
+            msg = "Filetype not recognised"
+            raise IXBRLParseError(msg)
+        self.filetype = ROOT_ELEMENTS[root_name]
+        self.namespaces = {}
+        for k, v in _attributes(element, namespaces=True).items():
+            if k.startswith("xmlns") or ":" in k:
+                self.namespaces[k] = v.split(" ")
+
+    def _add_error(self, error: Exception, source: ixbrlSource | None = None) -> None:
+        self.errors.append(ixbrlError(error=error, source=source))
+        if self.raise_on_error:
+            raise error
+
+    def _get_context(self, element: etree._Element, index: int | None = None) -> None:
+        s_id = element.get("id")
+        if not s_id:
+            return
+        try:
+            segment = _find(element, "segment")
+            self.contexts[s_id] = ixbrlContext(
+                _id=s_id,
+                entity={
+                    "scheme": _find_attribute(element, "identifier", "scheme"),
+                    "identifier": _find_text(element, "identifier"),
+                },
+                segments=[
+                    {
+                        "tag": _localname(x.tag),
+                        "value": "".join(x.itertext()).strip(),
+                        **_attributes(x, namespaces=True),
+                    }
+                    for x in segment.iterdescendants()
+                    if isinstance(x.tag, str)
+                ]
+                if segment is not None
+                else [],
+                instant=_find_text(element, "instant"),
+                startdate=_find_text(element, "startDate"),
+                enddate=_find_text(element, "endDate"),
+            )
+        except Exception as e:
+            self._add_error(e, _source(element, index))
+
+    def _get_unit(self, element: etree._Element) -> None:
+        s_id = element.get("id")
+        if isinstance(s_id, str):
+            self.units[s_id] = _find_text(element, "measure")
+
+    def _get_continuation(self, element: etree._Element) -> None:
+        s_id = element.get("id")
+        if isinstance(s_id, str) and s_id not in self._continuations:
+            self._continuations[s_id] = (
+                "".join(element.itertext()),
+                element.get("continuedAt"),
+            )
+
+    def _get_tag_continuation(self, start_str: str, continued_at: str | None) -> str:
+        seen: set[str] = set()
+        while continued_at and continued_at in self._continuations:
+            if continued_at in seen:
+                msg = f"Continuation {continued_at} is part of a loop"
+                raise IXBRLParseError(msg)
+            seen.add(continued_at)
+            text, continued_at = self._continuations[continued_at]
+            start_str += text
+        return start_str
+
+    def _make_nonnumeric(
+        self,
+        attrs: dict[str, str],
+        name: str,
+        text: str,
+        source: ixbrlSource | None = None,
+    ) -> ixbrlNonNumeric:
+        fact = ixbrlNonNumeric(
+            context=self.contexts.get(attrs["contextRef"], attrs["contextRef"]),
+            name=name,
+            format_=attrs.get("format"),
+            value=text.strip().replace("\n", ""),
+            source=source,
+        )
+        if isinstance(fact.context, str):
+            self._unresolved.append((fact, None))
+        return fact
+
+    def _make_numeric(
+        self,
+        attrs: dict[str, Any],
+        text: str,
+        name: str | None = None,
+        source: ixbrlSource | None = None,
+    ) -> ixbrlNumeric:
+        context_ref = attrs["contextRef"]
+        unit_ref = attrs["unitRef"]
+        if name is not None:
+            attrs["name"] = name
+        fact = ixbrlNumeric(
+            text=text,
+            context=self.contexts.get(context_ref, context_ref),
+            unit=self.units.get(unit_ref, unit_ref),
+            source=source,
+            **attrs,
+        )
+        if isinstance(fact.context, str) or unit_ref not in self.units:
+            self._unresolved.append((fact, unit_ref))
+        return fact
+
+    def _get_fact(
+        self, element: etree._Element, name: str, source: ixbrlSource
+    ) -> ixbrlNumeric | ixbrlNonNumeric | tuple[dict[str, str], str]:
+        """Create a fact from an element.
+
+        Returns the attributes and text of the element instead if the fact is
+        continued elsewhere in the document."""
+        attrs = _attributes(element)
+        if self.filetype == FILETYPE_XBRL:
+            text = "".join(element.itertext())
+            if attrs.get("unitRef"):
+                return self._make_numeric(attrs, text, name=name, source=source)
+            return self._make_nonnumeric(attrs, name, text, source=source)
+
+        if name == "nonFraction":
+            return self._make_numeric(attrs, "".join(element.itertext()), source=source)
+
+        exclusion = _find(element, "exclude")
+        if exclusion is not None:
+            _remove_keeping_tail(exclusion)
+        text = "".join(element.itertext())
+        if attrs.get("continuedAt"):
+            return attrs, text
+        return self._make_nonnumeric(attrs, attrs["name"], text, source=source)
+
+    def _iter_facts(
+        self,
+    ) -> Iterator[tuple[int, ixbrlNumeric | ixbrlNonNumeric]]:
+        """Yield each fact with its position in the document as soon as it
+        has been parsed.
+
+        Facts which are continued elsewhere in the document are held back
+        until the end of the document."""
+        root: etree._Element | None = None
+        capture_elements = IXBRL_CAPTURE_ELEMENTS
+        capture_depth = 0
+        schema_seen = False
+        resources_state = 0  # 0 = not seen yet, 1 = inside, 2 = finished
+        open_facts: list[int] = []
+        position = 0
+        # the index in the document of each open element, as the source of
+        # facts and errors
+        open_elements: list[int] = []
+        element_count = 0
+        continued: list[tuple[int, dict[str, str], str, ixbrlSource]] = []
+
+        try:
+            for event, element in self._events():
+                name = _localname(element.tag)
+                if root is None:
+                    root = element
+                    element_count += 1
+                    self._get_root(element)
+                    if self.filetype == FILETYPE_XBRL:
+                        capture_elements = XBRL_CAPTURE_ELEMENTS
+                    continue
+                if element is root:
+                    continue
+
+                if self.filetype == FILETYPE_IXBRL:
+                    is_fact = name in ("nonNumeric", "nonFraction")
+                else:
+                    is_fact = bool(element.get("contextRef"))
+
+                if event == "start":
+                    open_elements.append(element_count)
+                    element_count += 1
+                    if name in SCHEMA_ELEMENTS and not schema_seen:
+                        schema_seen = True
+                        schema = element.get(XLINK_HREF)
+                        if schema:
+                            self.schema = schema.strip()
+                    elif name == "resources" and resources_state == 0:
+                        resources_state = 1
+                    if is_fact:
+                        open_facts.append(position)
+                        position += 1
+                    if is_fact or name in capture_elements:
+                        capture_depth += 1
+                    continue
+
+                element_index = open_elements.pop()
+                if is_fact or name in capture_elements:
+                    capture_depth -= 1
+
+                if is_fact:
+                    fact_position = open_facts.pop()
+                    source = _source(element, element_index)
+                    try:
+                        fact = self._get_fact(element, name, source)
+                        if isinstance(fact, tuple):
+                            continued.append((fact_position, *fact, source))
+                        else:
+                            yield fact_position, fact
+                    except Exception as e:
+                        self._add_error(e, source)
+                elif self.filetype == FILETYPE_XBRL:
+                    if name == "context":
+                        self._get_context(element, element_index)
+                    elif name == "unit":
+                        self._get_unit(element)
+                elif name == "continuation":
+                    self._get_continuation(element)
+                elif resources_state == 1:
+                    if name == "context":
+                        self._get_context(element, element_index)
+                    elif name == "unit":
+                        self._get_unit(element)
+                    elif name == "resources":
+                        resources_state = 2
+
+                if capture_depth == 0:
+                    # free the memory used by everything read so far
+                    element.clear(keep_tail=True)
+                    parent = element.getparent()
+                    if parent is not None:
+                        while element.getprevious() is not None:
+                            del parent[0]
+        except etree.XMLSyntaxError as e:
+            if root is None:
+                msg = "Filetype not recognised"
+                raise IXBRLParseError(msg) from e
+            raise
+
+        if root is None:
+            msg = "Filetype not recognised"
+            raise IXBRLParseError(msg)
+
+        for fact_position, attrs, start_text, source in continued:
+            try:
+                text = self._get_tag_continuation(start_text, attrs.get("continuedAt"))
+                yield (
+                    fact_position,
+                    self._make_nonnumeric(attrs, attrs["name"], text, source=source),
+                )
+            except Exception as e:
+                self._add_error(e, source)
+
+    def _resolve(self, fact: Fact, unit_ref: str | None) -> None:
+        """Link a fact to a context or unit defined after the fact."""
+        if isinstance(fact.context, str):
+            fact.context = self.contexts.get(fact.context, fact.context)
+        if isinstance(fact, ixbrlNumeric) and unit_ref is not None:
+            fact.unit = self.units.get(unit_ref, unit_ref)
+
+    def _resolve_references(self) -> None:
+        """Link facts to contexts and units defined after the fact."""
+        for fact, unit_ref in self._unresolved:
+            self._resolve(fact, unit_ref)
+        self._unresolved = []
+
+    def _missing_references(
+        self, fact: Fact, unit_ref: str | None
+    ) -> list[tuple[str, str]]:
+        missing = []
+        if isinstance(fact.context, str) and fact.context not in self.contexts:
+            missing.append(("context", fact.context))
+        if unit_ref is not None and unit_ref not in self.units:
+            missing.append(("unit", unit_ref))
+        return missing
+
+    def iter_facts(self, max_spill: int = DEFAULT_MAX_SPILL) -> Iterator[Fact]:
+        """Read the whole document, yielding each fact as soon as it has been
+        parsed.
+
+        The facts are not kept in `.numeric` and `.nonnumeric`, so only the
+        contexts, units and errors are held in memory however large the
+        document is.
+
+        Facts are yielded in the order they appear in the document, apart from
+        facts which refer to a context or unit that hasn't been defined yet.
+        These are held back in a spill buffer until the context and unit have
+        been read. Any still waiting at the end of the document, or when more
+        than `max_spill` facts are waiting, are yielded with the id of the
+        missing context or unit, as `parse()` does.
+
+        Parameters:
+            max_spill:  The most facts to hold back at once.
+        """
+        spill = self._spill
+        waiting = self._waiting
+        counter = itertools.count()
+        defined = {"context": len(self.contexts), "unit": len(self.units)}
+        overflowed = False
+
+        def take(key: int) -> Fact:
+            """Remove a fact from the spill buffer, resolving what it can."""
+            fact, unit_ref, missing = spill.pop(key)
+            for ref in missing:
+                keys = waiting.get(ref)
+                if keys is not None:
+                    keys.pop(key, None)
+                    if not keys:
+                        del waiting[ref]
+            self._resolve(fact, unit_ref)
+            return fact
+
+        for _, fact in self._iter_facts():
+            for unresolved, unit_ref in self._unresolved:
+                missing = self._missing_references(unresolved, unit_ref)
+                if not missing:
+                    self._resolve(unresolved, unit_ref)
+                    continue
+                key = next(counter)
+                spill[key] = (unresolved, unit_ref, missing)
+                for ref in missing:
+                    waiting.setdefault(ref, {})[key] = None
+            if not self._unresolved:
+                yield fact
+            self._unresolved = []
+
+            # release the facts waiting for any contexts or units read since
+            for kind, table in (("context", self.contexts), ("unit", self.units)):
+                new = len(table) - defined[kind]
+                if new <= 0:
+                    continue
+                defined[kind] = len(table)
+                for ref_id in itertools.islice(reversed(table), new):
+                    for key in waiting.pop((kind, ref_id), {}):
+                        if key in spill and not self._missing_references(
+                            *spill[key][:2]
+                        ):
+                            yield take(key)
+
+            while len(spill) > max_spill:
+                if not overflowed:
+                    overflowed = True
+                    logger.warning(
+                        "More than %d facts refer to a context or unit which "
+                        "hasn't been defined yet",
+                        max_spill,
+                    )
+                yield take(next(iter(spill)))
+
+        while spill:
+            yield take(next(iter(spill)))
+
+    def parse(
+        self,
+        stats: ParseStats | None = None,
+        on_fact: Callable[[Fact], Any] | None = None,
+    ) -> None:
+        """Read the whole document, collecting the contexts, units and facts.
+
+        The document is read in a single pass, which is recorded in `stats`
+        as one "parse" phase.
+
+        Parameters:
+            stats:  Where to record the time taken to parse the document.
+            on_fact:  A function to call with each fact as soon as it has been
+                parsed, instead of keeping the facts in `.numeric` and
+                `.nonnumeric`. See `iter_facts()`.
+        """
+        if stats is None:
+            stats = ParseStats()
+        if on_fact is not None:
+            facts = 0
+            with stats.phase("parse", self):
+                for fact in self.iter_facts():
+                    on_fact(fact)
+                    facts += 1
+            stats.phases["parse"].facts += facts
+            return
+        with stats.phase("parse", self):
+            numeric: list[tuple[int, ixbrlNumeric]] = []
+            nonnumeric: list[tuple[int, ixbrlNonNumeric]] = []
+            for fact_position, fact in self._iter_facts():
+                if isinstance(fact, ixbrlNumeric):
+                    numeric.append((fact_position, fact))
+                else:
+                    nonnumeric.append((fact_position, fact))
+            self._resolve_references()
+            self.numeric = [fact for _, fact in sorted(numeric, key=lambda x: x[0])]
+            self.nonnumeric = [
+                fact for _, fact in sorted(nonnumeric, key=lambda x: x[0])
+            ]
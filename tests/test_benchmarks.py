@@ -0,0 +1,72 @@
+import io
+import tracemalloc
+
+import pytest
+
+from benchmarks.generate import DocumentSpec, generate_ixbrl, generate_xbrl
+from benchmarks.run import CaseResult, PhaseRecorder, compare, run_case
+from ixbrlparse import IXBRL
+
+SPEC = DocumentSpec(
+    facts=50,
+    nonnumeric=20,
+    contexts=8,
+    dimensional=0.5,
+    continuations=3,
+    continuation_links=3,
+    images=1,
+    image_size=100,
+)
+
+
+@pytest.mark.parametrize("generate", [generate_ixbrl, generate_xbrl])
+@pytest.mark.parametrize("engine", ["bs4", "lxml-stream"])
+def test_generate(generate, engine):
+    document = generate(SPEC)
+    assert document == generate(SPEC)
+    assert document != generate(DocumentSpec(**{**SPEC.__dict__, "seed": 1}))
+
+    x = IXBRL(io.BytesIO(document.encode("utf-8")), engine=engine)
+    assert len(x.numeric) == SPEC.facts
+    assert len(x.nonnumeric) == SPEC.nonnumeric
+    assert len(x.contexts) == SPEC.contexts
+    assert any(c.segments for c in x.contexts.values())
+    assert not x.errors
+
+
+@pytest.mark.parametrize("engine", ["bs4", "lxml-stream"])
+def test_run_case(engine):
+    data = generate_ixbrl(SPEC).encode("utf-8")
+    result = run_case(data, engine, repeat=1)
+    assert result.facts == SPEC.facts + SPEC.nonnumeric
+    assert result.seconds["total"] > 0
+    assert set(result.seconds) == set(result.peak_memory)
+    if engine == "bs4":
+        assert "numeric" in result.seconds
+    assert result.facts_per_second > result.docs_per_second
+
+
+def test_compare():
+    baseline = {"case": CaseResult(seconds={"total": 0.1, "tiny": 0.0001})}
+    results = {"case": CaseResult(seconds={"total": 0.2, "tiny": 0.0005})}
+    assert compare(results, baseline) == ["case total"]
+    assert compare(results, baseline, threshold=3) == []
+
+
+def test_phase_recorder_memory():
+    tracemalloc.start()
+    try:
+        recorder = PhaseRecorder(memory=True)
+        with recorder.phase("total"):
+            with recorder.phase("first"):
+                data = bytearray(1_000_000)
+                del data
+            with recorder.phase("second"):
+                pass
+    finally:
+        tracemalloc.stop()
+    # the peak of the first phase is part of the total, even though the
+    # second phase started after it
+    assert recorder.values["first"] >= 1_000_000
+    assert recorder.values["second"] < 1_000_000
+    assert recorder.values["total"] >= recorder.values["first"]
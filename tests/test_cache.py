@@ -0,0 +1,167 @@
+import io
+import os
+import pickle
+
+import pytest
+from click.testing import CliRunner
+
+import ixbrlparse.cache
+from ixbrlparse import IXBRL
+from ixbrlparse.cache import ParseCache
+from ixbrlparse.cli import ixbrlparse_cli
+from ixbrlparse.plugins import IXBRLPluginManager
+
+TEST_ACCOUNTS = [
+    "tests/test_accounts/account_1.html",
+    "tests/test_accounts/account_1.xml",
+    "tests/test_accounts/account_5.html",
+    "tests/test_accounts/account_6.xhtml",
+]
+
+
+def _no_parse(*_args, **_kwargs):
+    msg = "file should have been read from the cache"
+    raise AssertionError(msg)
+
+
+@pytest.mark.parametrize("account", TEST_ACCOUNTS)
+@pytest.mark.parametrize("engine", ["bs4", "lxml-stream"])
+def test_cache_hit(tmp_path, monkeypatch, account, engine):
+    expected = IXBRL.open(account, engine=engine).to_json()
+
+    x = IXBRL.open(account, engine=engine, cache=tmp_path)
+    assert x.to_json() == expected
+    assert x.soup is None
+
+    monkeypatch.setattr(ixbrlparse.cache, "IXBRL", _no_parse)
+    y = IXBRL.open(account, engine=engine, cache=ParseCache(tmp_path))
+    assert y.to_json() == expected
+    assert y.facts.value("CurrentAssets") == x.facts.value("CurrentAssets")
+
+
+def test_cache_errors(tmp_path):
+    x = IXBRL.open(
+        "tests/test_accounts/account_errors.html", raise_on_error=False, cache=tmp_path
+    )
+    y = IXBRL.open(
+        "tests/test_accounts/account_errors.html", raise_on_error=False, cache=tmp_path
+    )
+    assert len(x.errors) == len(y.errors) == 1
+    assert y.errors[0].source.name == "ix:nonFraction"
+    # the document parsed on a cache miss doesn't keep its tree alive
+    assert x.errors[0].error.__traceback__ is None
+
+    with pytest.raises(NotImplementedError):
+        IXBRL.open("tests/test_accounts/account_errors.html", cache=tmp_path)
+
+
+def test_cache_key_plugins(tmp_path, monkeypatch):
+    # plugins installed with an entry point are part of the first key, even
+    # though they are loaded lazily
+    pm = IXBRLPluginManager("ixbrlparse")
+
+    def load(_group):
+        pm.register(object(), name="fakeplugin")
+
+    monkeypatch.setattr(pm, "load_setuptools_entrypoints", load)
+    monkeypatch.setattr(ixbrlparse.cache, "pm", pm)
+    cache = ParseCache(tmp_path)
+    key = cache.key(b"<html></html>")
+    assert "fakeplugin" in ixbrlparse.cache._plugin_versions()
+    assert cache.key(b"<html></html>") == key
+
+
+def test_cache_key(tmp_path):
+    cache = ParseCache(tmp_path)
+    with open(TEST_ACCOUNTS[0], "rb") as a:
+        data = a.read()
+    assert cache.key(data) == cache.key(data)
+    assert cache.key(data) != cache.key(data + b" ")
+    assert cache.key(data) != cache.key(data, engine="lxml-stream")
+    assert cache.key(data) != cache.key(data, raise_on_error=False)
+
+
+def test_cache_corrupt_entry(tmp_path):
+    cache = ParseCache(tmp_path)
+    with open(TEST_ACCOUNTS[0], "rb") as a:
+        data = a.read()
+    cache.parse(data)
+    (entry,) = tmp_path.glob("*/*.pickle")
+    entry.write_bytes(b"not a pickle")
+
+    x = cache.parse(data)
+    assert x.to_json() == IXBRL.open(TEST_ACCOUNTS[0]).to_json()
+    assert pickle.loads(entry.read_bytes()).to_json() == x.to_json()  # noqa: S301
+
+
+def test_cache_eviction(tmp_path):
+    cache = ParseCache(tmp_path)
+    for account in TEST_ACCOUNTS:
+        cache.open(account)
+    entries = sorted(tmp_path.glob("*/*.pickle"), key=os.path.getmtime)
+    assert len(entries) == len(TEST_ACCOUNTS)
+    # make the order of use clear, oldest first
+    for i, entry in enumerate(entries):
+        os.utime(entry, (1_000_000 + i, 1_000_000 + i))
+    total = cache.size()
+
+    cache.max_size = total - 1
+    cache.evict()
+    remaining = list(tmp_path.glob("*/*.pickle"))
+    assert entries[0] not in remaining
+    assert entries[-1] in remaining
+    assert cache.size() <= cache.max_size * ixbrlparse.cache.EVICT_TO
+
+    cache.clear()
+    assert cache.size() == 0
+
+
+def test_cache_evicts_when_full(tmp_path):
+    cache = ParseCache(tmp_path, max_size=1)
+    cache.open(TEST_ACCOUNTS[0])
+    cache.open(TEST_ACCOUNTS[1])
+    assert cache.size() == 0
+
+
+def test_pickle_ixbrl():
+    x = IXBRL.open(TEST_ACCOUNTS[0], keep_source=False)
+    y = pickle.loads(pickle.dumps(x))  # noqa: S301
+    assert y.to_json() == x.to_json()
+
+
+def test_cli_cache(tmp_path):
+    runner = CliRunner()
+    for _ in range(2):
+        buffer = io.StringIO()
+        result = runner.invoke(
+            ixbrlparse_cli,
+            ["--outfile", buffer, "--cache", str(tmp_path), TEST_ACCOUNTS[0]],
+        )  # type: ignore
+        assert result.exit_code == 0
+        assert ",CurrentAssets,2909.0," in buffer.getvalue()
+    assert len(list(tmp_path.glob("*/*.pickle"))) == 1
+
+
+def test_cli_batch_cache(tmp_path):
+    runner = CliRunner()
+    cache_dir = tmp_path / "cache"
+    outputs = []
+    for _ in range(2):
+        outfile = tmp_path / "output.csv"
+        result = runner.invoke(
+            ixbrlparse_cli,
+            [
+                "batch",
+                "--workers",
+                "1",
+                "--outfile",
+                str(outfile),
+                "--cache",
+                str(cache_dir),
+                *TEST_ACCOUNTS[:2],
+            ],
+        )  # type: ignore
+        assert result.exit_code == 0
+        outputs.append(outfile.read_text())
+    assert outputs[0] == outputs[1]
+    assert len(list(cache_dir.glob("*/*.pickle"))) == 2
@@ -1,7 +1,10 @@
 import datetime
+import pickle
+import tracemalloc
 
 import pytest
 
+from ixbrlparse.components.formats import ixtNumDotDecimal
 from ixbrlparse.core import ixbrlContext, ixbrlNonNumeric, ixbrlNumeric
 
 
@@ -81,6 +84,78 @@ def test_context_segments():
     assert "with segment" in str(i)
 
 
+def test_context_dimensions():
+    segments = [
+        {
+            "tag": "explicitMember",
+            "value": "uk-core:OrdinaryShareClass1",
+            "dimension": "uk-core:ShareClassesDimension",
+            "xmlns": "http://xbrl.org/2006/xbrldi",
+        },
+        {"tag": "typedMember", "value": "1", "dimension": "uk-core:DirectorsDimension"},
+    ]
+    i = ixbrlContext(
+        _id="123456",
+        entity={},
+        segments=segments,
+        instant="2011-01-01",
+        startdate=None,
+        enddate=None,
+    )
+    assert i.dimensions == (
+        ("uk-core:ShareClassesDimension", "uk-core:OrdinaryShareClass1"),
+        ("uk-core:DirectorsDimension", "1"),
+    )
+    assert "dimensions" not in i.to_json()
+
+    j = ixbrlContext(
+        _id="7890",
+        entity={},
+        segments=[dict(s) for s in segments],
+        instant="2012-01-01",
+        startdate=None,
+        enddate=None,
+    )
+    assert j.dimensions[0] is i.dimensions[0]
+
+
+def _date_context(value):
+    return ixbrlContext(
+        _id="123456",
+        entity={},
+        segments=None,
+        instant=value,
+        startdate=None,
+        enddate=None,
+    )
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("2011-01-01", datetime.date(2011, 1, 1)),
+        (" 2011-12-31\n", datetime.date(2011, 12, 31)),
+        ("2011-1-5", datetime.date(2011, 1, 5)),
+    ],
+)
+def test_context_dates(value, expected):
+    assert _date_context(value).instant == expected
+
+
+@pytest.mark.parametrize("value", ["2011-02-30", "2011-13-01", "31/12/2011", "2011"])
+def test_context_dates_invalid(value):
+    with pytest.raises(
+        ValueError, match=r"does not match format|unconverted data|out of range"
+    ):
+        _date_context(value)
+
+
+def test_context_dates_cached():
+    first = _date_context("2011-06-30")
+    second = _date_context("2011-06-30")
+    assert first.instant is second.instant
+
+
 def test_nonnumeric():
     a = {"context": {}, "format_": "", "value": ""}
 
@@ -122,6 +197,50 @@ def test_numeric_value():
     assert ixbrlNumeric(value="1234").value == 1234
 
 
+def test_numeric_format_shared():
+    a = ixbrlNumeric(text="1,234", format="ixt2:numdotdecimal", scale="3", sign="-")
+    b = ixbrlNumeric(text="5,678", format="ixt2:numdotdecimal", scale=3, sign="-")
+    c = ixbrlNumeric(text="5,678", format="ixt2:numdotdecimal", scale=3)
+
+    assert a.format is b.format
+    assert a.format is not c.format
+    assert a.format is not None and a.format.namespace == "ixt2"
+    assert a.value == -1234000
+    assert b.value == -5678000
+    assert c.value == 5678000
+
+
+def test_nonnumeric_format_shared():
+    a = ixbrlNonNumeric(value="20 September 2020", format_="ixt:datelonguk")
+    b = ixbrlNonNumeric(value="21 September 2020", format_="ixt:datelonguk")
+    assert a.format is b.format
+
+
+def test_format_shared_frozen():
+    a = ixbrlNumeric(text="1,234", format="ixt2:numdotdecimal", scale=3)
+    with pytest.raises(AttributeError):
+        a.format.scale = 0
+    with pytest.raises(AttributeError):
+        del a.format.sign
+    b = ixbrlNumeric(text="5,678", format="ixt2:numdotdecimal", scale=3)
+    assert b.format.scale == 3
+    assert "_frozen" not in a.format.to_json()
+    assert pickle.loads(pickle.dumps(a.format)).to_json() == a.format.to_json()  # noqa: S301
+
+    # formats created directly can still be changed
+    f = ixtNumDotDecimal("ixt2:numdotdecimal")
+    f.scale = 3
+    assert f.scale == 3
+
+
+def test_format_shared_normalised():
+    a = ixbrlNumeric(text="1,234", format="ixt2:numdotdecimal")
+    b = ixbrlNumeric(text="1,234", format=" ixt2:numdotdecimal\n")
+    assert a.format is b.format
+    assert b.format.namespace == "ixt2"
+    assert b.format.format == "numdotdecimal"
+
+
 def test_numeric_value_error():
     with pytest.raises(ValueError):
         ixbrlNumeric(text="1234blahblab")
@@ -289,3 +408,37 @@ def test_format_notimplemented():
             ixbrlNonNumeric(value="blahdeblah", format_="blahdeblah").value
             == "blahdeblah"
         )
+
+
+def _bytes_per_fact(fact_class: type, count: int = 5000) -> float:
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        facts = [
+            fact_class(
+                name="ns5:Turnover",
+                text="1,234",
+                context="c1",
+                unit="GBP",
+                format="ixt2:numdotdecimal",
+            )
+            for _ in range(count)
+        ]
+        used = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+    assert len(facts) == count
+    return used / count
+
+
+def test_numeric_memory():
+    # the same class built with a per-instance __dict__, as it was before
+    dict_numeric = type("DictNumeric", (), {"__init__": ixbrlNumeric.__init__})
+
+    assert not hasattr(ixbrlNumeric(text="1"), "__dict__")
+    assert _bytes_per_fact(ixbrlNumeric) < _bytes_per_fact(dict_numeric)
+
+
+@pytest.mark.parametrize("fact_class", [ixbrlNumeric, ixbrlNonNumeric, ixbrlContext])
+def test_slots(fact_class):
+    assert "__slots__" in fact_class.__dict__
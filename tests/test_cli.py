@@ -1,13 +1,19 @@
+import csv
 import io
 import json
 import subprocess
 import sys
+import zipfile
+from pathlib import Path
 
 import pytest
 from click.testing import CliRunner
 
 import ixbrlparse.__main__ as ixmain
-from ixbrlparse.cli import ixbrlparse_cli
+import ixbrlparse.batch
+from ixbrlparse import IXBRL
+from ixbrlparse.batch import expand_paths, parse_files
+from ixbrlparse.cli import fit_segments, ixbrlparse_cli
 
 _ = ixmain
 
@@ -66,6 +72,47 @@ def test_cli_json():
     assert data["numeric"][2]["value"] == 2909.0
 
 
+@pytest.mark.parametrize(
+    "account",
+    ["tests/test_accounts/account_4.html", "tests/test_accounts/account_5.html"],
+)
+def test_cli_json_output(account):
+    # the output is the same as writing the whole document with json.dump()
+    expected = io.StringIO()
+    json.dump(IXBRL.open(account).to_json(), expected, indent=4)
+    assert "\\u00a3" in expected.getvalue()
+
+    buffer = io.StringIO()
+    runner = CliRunner()
+    result = runner.invoke(
+        ixbrlparse_cli,  # type: ignore
+        ["--outfile", buffer, "--format", "json", account],  # type: ignore
+    )
+    assert result.exit_code == 0
+    assert buffer.getvalue() == expected.getvalue()
+
+
+def test_cli_json_context_refs():
+    buffer = io.StringIO()
+    runner = CliRunner()
+    result = runner.invoke(
+        ixbrlparse_cli,  # type: ignore
+        [
+            "--outfile",
+            buffer,
+            "--format",
+            "json",
+            "--context-refs",
+            "tests/test_accounts/account_1.html",
+        ],  # type: ignore
+    )
+    assert result.exit_code == 0
+    data = json.loads(buffer.getvalue())
+    assert data["numeric"][2]["name"] == "CurrentAssets"
+    assert data["numeric"][2]["context"] == "icur1"
+    assert data["contexts"]["icur1"]["instant"] == "2017-10-31"
+
+
 @pytest.mark.parametrize("cli_command", cli_options)
 def test_cli_json_raw(tmp_path, cli_command):
     f = tmp_path / "output.json"
@@ -179,3 +226,283 @@ def test_cli_jsonl_raw(tmp_path, cli_command):
         else:
             msg = "CurrentAssets not found"
             raise AssertionError(msg)
+
+
+def test_expand_paths():
+    files = list(
+        expand_paths(
+            [
+                "tests/test_accounts/account_1.html",
+                "tests/test_accounts/*.xml",
+                "tests/test_accounts",
+            ]
+        )
+    )
+    assert files[0] == "tests/test_accounts/account_1.html"
+    assert "tests/test_accounts/account_1.xml" in files
+    assert "tests/test_accounts/account_6.xhtml" in files
+    assert len(files) == len(set(files))
+
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_cli_batch(tmp_path, workers):
+    outfile = tmp_path / "output.csv"
+    errors = tmp_path / "errors.csv"
+    runner = CliRunner()
+    result = runner.invoke(
+        ixbrlparse_cli,
+        [
+            "batch",
+            "--workers",
+            workers,
+            "--outfile",
+            str(outfile),
+            "--errors",
+            str(errors),
+            "tests/test_accounts/account_1.html",
+            "tests/test_accounts/account_errors.html",
+            "tests/test_accounts/*.xml",
+        ],
+    )  # type: ignore
+    assert result.exit_code == 1
+    with open(outfile) as f:
+        rows = list(csv.DictReader(f))
+    filenames = {row["filename"] for row in rows}
+    assert filenames == {
+        "tests/test_accounts/account_1.html",
+        "tests/test_accounts/account_1.xml",
+    }
+    assert any(
+        row["name"] == "CurrentAssets" and row["value"] == "2909.0" for row in rows
+    )
+    with open(errors) as f:
+        failed = [row["filename"] for row in csv.DictReader(f)]
+    assert failed == [
+        "tests/test_accounts/account_errors.html",
+        "tests/test_accounts/account_errors.xml",
+    ]
+
+
+def test_cli_batch_after_options(tmp_path):
+    # options for parsing a single file can't be given to a subcommand
+    outfile = tmp_path / "output.jsonl"
+    runner = CliRunner()
+    result = runner.invoke(
+        ixbrlparse_cli,
+        [
+            "--format",
+            "json",
+            "--outfile",
+            str(outfile),
+            "batch",
+            "--workers",
+            "1",
+            "tests/test_accounts/account_1.html",
+        ],
+    )  # type: ignore
+    assert result.exit_code == 2
+    assert "--format, --outfile can't be used with the batch command" in result.output
+    assert not outfile.exists()
+
+    result = runner.invoke(ixbrlparse_cli, ["--help", "batch"])  # type: ignore
+    assert result.exit_code == 0
+
+
+@pytest.mark.parametrize("name", ["batch", "sqlite"])
+def test_cli_file_named_like_command(tmp_path, monkeypatch, name):
+    (tmp_path / name).write_bytes(
+        Path("tests/test_accounts/account_1.html").read_bytes()
+    )
+    monkeypatch.chdir(tmp_path)
+    buffer = io.StringIO()
+    runner = CliRunner()
+    result = runner.invoke(
+        ixbrlparse_cli,
+        ["--outfile", buffer, "--", name],  # type: ignore
+    )
+    assert result.exit_code == 0
+    assert ",CurrentAssets,2909.0," in buffer.getvalue()
+
+
+def test_cli_batch_jsonl(tmp_path):
+    outfile = tmp_path / "output.jsonl"
+    runner = CliRunner()
+    result = runner.invoke(
+        ixbrlparse_cli,
+        [
+            "batch",
+            "--format",
+            "jsonl",
+            "--fields",
+            "numeric",
+            "--workers",
+            "1",
+            "--outfile",
+            str(outfile),
+            "tests/test_accounts/account_1.html",
+            "tests/test_accounts/account_2.html",
+        ],
+    )  # type: ignore
+    assert result.exit_code == 0
+    with open(outfile) as f:
+        rows = [json.loads(line) for line in f]
+    assert {row["filename"] for row in rows} == {
+        "tests/test_accounts/account_1.html",
+        "tests/test_accounts/account_2.html",
+    }
+    assert all(row["unit"] is not None for row in rows)
+
+
+def test_cli_batch_zip(tmp_path):
+    archive = tmp_path / "accounts.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        z.write("tests/test_accounts/account_1.html", "account_1.html")
+        z.write("tests/test_accounts/account_errors.html", "account_errors.html")
+    (tmp_path / "broken.zip").write_text("not a zip file")
+
+    outfile = tmp_path / "output.csv"
+    errors = tmp_path / "errors.csv"
+    runner = CliRunner()
+    result = runner.invoke(
+        ixbrlparse_cli,
+        [
+            "batch",
+            "--workers",
+            "2",
+            "--outfile",
+            str(outfile),
+            "--errors",
+            str(errors),
+            str(tmp_path),
+        ],
+    )  # type: ignore
+    assert result.exit_code == 1
+    with open(outfile) as f:
+        filenames = {row["filename"] for row in csv.DictReader(f)}
+    assert filenames == {str(archive / "account_1.html")}
+    with open(errors) as f:
+        failed = [row["filename"] for row in csv.DictReader(f)]
+    assert failed == [
+        str(archive / "account_errors.html"),
+        str(tmp_path / "broken.zip"),
+    ]
+
+
+def test_fit_segments():
+    row = {"segment:0": "a", "segment:1": "b", "segment:2": "c"}
+    assert fit_segments(row, 2)
+    assert row == {"segment:0": "a", "segment:1": "b; c"}
+
+    row = {"segment:0": "a"}
+    assert not fit_segments(row, 2)
+    assert row == {"segment:0": "a"}
+
+
+@pytest.mark.parametrize("segments", ["1", "4"])
+def test_cli_batch_segments(tmp_path, segments):
+    outfile = tmp_path / "output.csv"
+    runner = CliRunner()
+    result = runner.invoke(
+        ixbrlparse_cli,
+        [
+            "batch",
+            "--workers",
+            "1",
+            "--segments",
+            segments,
+            "--outfile",
+            str(outfile),
+            "tests/test_accounts/account_1.html",
+            "tests/test_accounts/account_5.html",
+        ],
+    )  # type: ignore
+    assert result.exit_code == 0
+    with open(outfile) as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+    segment_columns = [c for c in reader.fieldnames or [] if c.startswith("segment")]
+    assert len(segment_columns) == int(segments)
+    assert {row["filename"] for row in rows} == {
+        "tests/test_accounts/account_1.html",
+        "tests/test_accounts/account_5.html",
+    }
+    if segments == "1":
+        assert any("; " in row["segment:0"] for row in rows)
+
+
+def test_cli_stats():
+    buffer = io.StringIO()
+    runner = CliRunner()
+    result = runner.invoke(
+        ixbrlparse_cli,
+        ["--outfile", buffer, "--stats", "tests/test_accounts/account_1.html"],
+    )  # type: ignore
+    assert result.exit_code == 0
+    assert ",CurrentAssets,2909.0," in buffer.getvalue()
+    stats = json.loads(result.stderr)
+    assert stats["documents"] == 1
+    assert stats["facts"] == 40
+    assert list(stats["phases"]) == [
+        "soup",
+        "walk",
+        "schema",
+        "contexts",
+        "units",
+        "nonnumeric",
+        "numeric",
+    ]
+
+
+def test_cli_batch_stats(tmp_path):
+    runner = CliRunner()
+    result = runner.invoke(
+        ixbrlparse_cli,
+        [
+            "batch",
+            "--workers",
+            "1",
+            "--outfile",
+            str(tmp_path / "output.csv"),
+            "--stats",
+            "tests/test_accounts/account_1.html",
+            "tests/test_accounts/account_errors.html",
+            "tests/test_accounts/account_5.html",
+        ],
+    )  # type: ignore
+    assert result.exit_code == 1
+    stats = json.loads(result.stderr[result.stderr.index("{") :])
+    assert stats["documents"] == 2
+    assert stats["failed"] == 1
+    assert stats["facts"] == 40 + 105
+    assert {s["filename"] for s in stats["slowest"]} == {
+        "tests/test_accounts/account_1.html",
+        "tests/test_accounts/account_5.html",
+    }
+    assert stats["slowest"][0]["seconds"] >= stats["slowest"][1]["seconds"]
+
+
+def test_parse_files_max_pending(tmp_path, monkeypatch):
+    submitted = []
+
+    class Executor(ixbrlparse.batch.ProcessPoolExecutor):
+        def submit(self, fn, /, *args, **kwargs):
+            submitted.append(args[0])
+            return super().submit(fn, *args, **kwargs)
+
+    monkeypatch.setattr(ixbrlparse.batch, "ProcessPoolExecutor", Executor)
+    paths = []
+    for i in range(10):
+        path = tmp_path / f"account_{i:02}.html"
+        path.write_bytes(Path("tests/test_accounts/account_1.html").read_bytes())
+        paths.append(str(path))
+
+    results = parse_files(paths, workers=2, chunksize=1, max_pending=3)
+    first = next(results)
+    # only the first chunks, and one to replace the chunk collected, are sent
+    assert len(submitted) == 4
+    # results are still in the same order as the files
+    assert [first.filename, *(r.filename for r in results)] == paths
+    assert len(submitted) == 10
+
+    with pytest.raises(ValueError):
+        next(parse_files(paths, workers=2, max_pending=0))
@@ -1,8 +1,11 @@
-from datetime import date
+import re
+from datetime import date, datetime
 
 import pytest
 
 from ixbrlparse.components.formats import (
+    DATE_NON_ALPHANUMERIC_REGEX,
+    DATE_ORDINAL_SUFFIX_REGEX,
     ixbrlFormat,
     ixtDateDayMonthYear,
     ixtDateFormat,
@@ -106,3 +109,67 @@ def test_formats(formatclass, valuestring, expectedvalue, errorvalue):
     if errorvalue is not None:
         with pytest.raises(ValueError):
             assert f.parse_value(errorvalue) is None
+
+
+@pytest.mark.parametrize(
+    "formatclass, values",
+    (
+        (ixbrlFormat, ["235,100,356.79", "1 000", "-", "", "0.07", 100, 2.5]),
+        (ixtNumDotDecimal, ["235,100,356.79", "1 000", "-", "", "0.07", 100, 2.5]),
+        (ixtNumComma, ["235.100.345,79", "1 000", "-", "", "0,07"]),
+        (ixtNumComma, ["100.345,79", 100, 2.5]),
+    ),
+)
+@pytest.mark.parametrize("scale", (0, 3, -2))
+@pytest.mark.parametrize("sign", ("", "-"))
+def test_parse_values(formatclass, values, scale, sign):
+    f = formatclass("format", scale=scale, sign=sign)
+    assert f.parse_values(values) == [f.parse_value(v) for v in values]
+
+
+def test_parse_values_overridden_parse_value():
+    f = ixtNumWordsEn("format")
+    assert f.parse_values(["eighty-five", "no", "2"]) == [85, 0, 2]
+
+
+def test_parse_values_error():
+    f = ixtNumDotDecimal("format")
+    with pytest.raises(ValueError):
+        f.parse_values(["100", "blurdy-burg"])
+
+
+@pytest.mark.parametrize(
+    "dateclass, datestring",
+    (
+        (ixtDateLongUK, "29 February 2019"),
+        (ixtDateLongUK, "31st September 2019"),
+        (ixtDateShortUK, "05 Sept 2019"),
+        (ixtDateDayMonthYear, "13/13/2019"),
+        (ixtDateSlashUS, "2019/01/05"),
+    ),
+)
+def test_date_formats_same_error(dateclass, datestring):
+    # invalid dates give the same error as strptime
+    value = DATE_NON_ALPHANUMERIC_REGEX.sub("-", datestring.lower())
+    value = DATE_ORDINAL_SUFFIX_REGEX.sub(r"\1", value)
+    with pytest.raises(ValueError) as expected:
+        datetime.strptime(value, dateclass.date_format[-1])  # noqa: DTZ007
+    with pytest.raises(ValueError, match=re.escape(str(expected.value))):
+        dateclass("dateformat").parse_value(datestring)
+
+
+def test_date_formats_cached():
+    f = ixtDateLongUK("dateformat")
+    first = f.parse_value("05 January 2019")
+    assert f.parse_value("05 January 2019") is first
+    assert ixtDateShortUK("dateformat").parse_value("05 January 2019") == first
+
+
+def test_date_format_unsupported_directive():
+    # formats which can't be converted to a regex are parsed with strptime
+    class DayOfYearFormat(ixtDateFormat):
+        date_format = ("%d-%b-%Y", "%j-%Y")
+
+    f = DayOfYearFormat("dateformat")
+    assert f.parse_value("05 Jan 2019") == date(2019, 1, 5)
+    assert f.parse_value("032 2019") == date(2019, 2, 1)
@@ -0,0 +1,81 @@
+import subprocess
+import sys
+
+import pytest
+
+import ixbrlparse
+from ixbrlparse.plugins import IXBRLPluginManager
+
+# generous, as importing ixbrlparse itself should take a few milliseconds
+IMPORT_TIME_LIMIT = 0.1
+
+HEAVY_MODULES = ("bs4", "lxml", "word2number", "pluggy", "importlib.metadata")
+
+
+def import_times(statement: str) -> dict[str, float]:
+    """Run a statement in a new interpreter with `-X importtime`, returning
+    the cumulative import time of each module in seconds."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative) / 1_000_000
+    return times
+
+
+def test_import_time():
+    times = import_times("import ixbrlparse")
+    assert times["ixbrlparse"] < IMPORT_TIME_LIMIT
+    for module in HEAVY_MODULES:
+        assert module not in times
+
+
+@pytest.mark.parametrize(
+    "statement, not_imported",
+    (
+        ("from ixbrlparse import ixbrlFormat", ("bs4", "lxml", "word2number")),
+        ("from ixbrlparse import hookimpl", ("bs4", "lxml", "word2number")),
+        ("from ixbrlparse import IXBRL", ("word2number", "importlib.metadata")),
+        ("import ixbrlparse.cli", HEAVY_MODULES),
+    ),
+)
+def test_imports_lazy(statement, not_imported):
+    times = import_times(statement)
+    for module in not_imported:
+        assert module not in times
+
+
+def test_lazy_attributes():
+    assert "IXBRL" in dir(ixbrlparse)
+    assert ixbrlparse.ixbrlFormat.__name__ == "ixbrlFormat"
+    with pytest.raises(AttributeError):
+        _ = ixbrlparse.flurg
+
+
+def test_cli_import_logging():
+    # logging is only configured when the command is run
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import logging, ixbrlparse.cli; assert not logging.root.handlers",
+        ],
+        check=True,
+    )
+
+
+def test_entrypoints_loaded_once(monkeypatch):
+    calls = []
+    pm = IXBRLPluginManager("ixbrlparse")
+    monkeypatch.setattr(pm, "load_setuptools_entrypoints", calls.append)
+    assert calls == []
+    assert pm.generation == 0
+    assert pm.generation == 0
+    assert calls == ["ixbrlparse"]
@@ -1,18 +1,29 @@
+import gc
 import io
 import json
+import pickle
+import weakref
+import zipfile
 from datetime import date
 
 import pytest
 from bs4 import BeautifulSoup, Tag
 
-from ixbrlparse import IXBRL
+import ixbrlparse.core
+from ixbrlparse import IXBRL, IXBRLResult
+from ixbrlparse.components._base import ixbrlErrorSummary, ixbrlSource
 from ixbrlparse.core import (
     BaseParser,
+    BufferReader,
     IXBRLParseError,
+    IXBRLParser,
     ixbrlContext,
     ixbrlNonNumeric,
     ixbrlNumeric,
 )
+from ixbrlparse.serialise import orjson
+from ixbrlparse.stats import BatchStats, ParseStats, PhaseStats
+from ixbrlparse.streaming import LXMLStreamParser
 
 TEST_ACCOUNTS = [
     "tests/test_accounts/account_1.html",
@@ -373,6 +384,24 @@ def test_table_output():
         assert row["instant"] or (row["startdate"] and row["enddate"])
 
 
+@pytest.mark.parametrize("fields", ["numeric", "nonnumeric", "all"])
+def test_iter_table(fields):
+    x = IXBRL.open(TEST_ACCOUNTS[1])
+    rows = x.iter_table(fields)
+    assert not isinstance(rows, list)
+    assert list(rows) == x.to_table(fields)
+
+
+@pytest.mark.parametrize("account", [TEST_ACCOUNTS[1], TEST_ACCOUNTS[4]])
+@pytest.mark.parametrize("fields", ["numeric", "nonnumeric", "all"])
+def test_table_columns(account, fields):
+    x = IXBRL.open(account)
+    columns: dict[str, None] = {}
+    for row in x.to_table(fields):
+        columns = {**dict.fromkeys(row.keys()), **columns}
+    assert x.table_columns(fields) == list(columns)
+
+
 def test_table_output_numeric():
     x = IXBRL.open(TEST_ACCOUNTS[2])
     table = x.to_table("numeric")
@@ -432,14 +461,17 @@ def test_errors_raised_nonnumeric():
 
 
 def test_errors_raised_date():
+    # 0001-01-01 is a valid date, and no longer fails when converted to the
+    # local timezone, so only the unknown format is an error
     with open(TEST_ACCOUNTS[8]) as a:
-        with pytest.raises((OSError, ValueError)):
+        with pytest.raises(NotImplementedError):
             IXBRL(a)
 
     with open(TEST_ACCOUNTS[8]) as a:
         x = IXBRL(a, raise_on_error=False)
         assert isinstance(x.soup, BeautifulSoup)
-        assert len(x.errors) == 2
+        assert len(x.errors) == 1
+        assert x.contexts["dcur4"].startdate == date(1, 1, 1)
 
 
 def test_errors_raised_open():
@@ -467,3 +499,591 @@ def test_errors_raised_open_nonnumeric():
     x = IXBRL.open(TEST_ACCOUNTS[7], raise_on_error=False)
     assert isinstance(x.soup, BeautifulSoup)
     assert len(x.errors) == 2
+
+
+def _json_without_soup(x: IXBRL) -> dict:
+    return json.loads(json.dumps(x.to_json(), default=str))
+
+
+@pytest.mark.parametrize("account", TEST_ACCOUNTS + TEST_XML_ACCOUNTS)
+def test_lxml_stream_engine(account):
+    expected = IXBRL.open(account, raise_on_error=False)
+    x = IXBRL.open(account, raise_on_error=False, engine="lxml-stream")
+
+    assert x.soup is None
+    assert x.filetype == expected.filetype
+    assert len(x.errors) == len(expected.errors)
+    assert _json_without_soup(x) == _json_without_soup(expected)
+    for n in x.numeric + x.nonnumeric:
+        assert n.soup_tag is None
+
+
+def test_lxml_stream_engine_errors():
+    with pytest.raises(NotImplementedError):
+        IXBRL.open(TEST_ACCOUNTS[6], engine="lxml-stream")
+    with pytest.raises(KeyError):
+        IXBRL.open(TEST_ACCOUNTS[7], engine="lxml-stream")
+    with pytest.raises(NotImplementedError):
+        IXBRL.open(TEST_XML_ACCOUNTS[1], engine="lxml-stream")
+
+
+def test_lxml_stream_engine_str():
+    with open(TEST_ACCOUNTS[0]) as a:
+        x = IXBRL(a, engine="lxml-stream")
+        assert x.filetype == "ixbrl"
+        assert len(x.numeric) == len(IXBRL.open(TEST_ACCOUNTS[0]).numeric)
+
+    with pytest.raises(IXBRLParseError):
+        IXBRL(io.StringIO("blahblah"), engine="lxml-stream")
+    with pytest.raises(IXBRLParseError):
+        IXBRL(io.BytesIO(b""), engine="lxml-stream")
+
+
+@pytest.mark.parametrize("engine", ["bs4", "lxml-stream"])
+def test_late_context(engine):
+    content = """<html xmlns:ix="http://www.xbrl.org/2013/inlineXBRL"><body>
+        <ix:nonFraction name="ns5:Turnover" contextRef="c1" unitRef="GBP">
+            1,000
+        </ix:nonFraction>
+        <ix:header><ix:resources>
+            <xbrli:context xmlns:xbrli="http://www.xbrl.org/2003/instance" id="c1">
+                <xbrli:period><xbrli:instant>2020-01-31</xbrli:instant></xbrli:period>
+            </xbrli:context>
+            <xbrli:unit xmlns:xbrli="http://www.xbrl.org/2003/instance" id="GBP">
+                <xbrli:measure>iso4217:GBP</xbrli:measure>
+            </xbrli:unit>
+        </ix:resources></ix:header>
+    </body></html>"""
+    x = IXBRL(io.StringIO(content), engine=engine)
+    assert isinstance(x.numeric[0].context, ixbrlContext)
+    assert x.numeric[0].context.instant == date(2020, 1, 31)
+    assert x.numeric[0].unit == "iso4217:GBP"
+    assert x.numeric[0].value == 1000
+
+
+LATE_CONTEXT_XBRL = """<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance"
+    xmlns:uk-gaap="http://www.xbrl.org/uk/gaap/core/2009-09-01">
+    <xbrli:context id="c1">
+        <xbrli:period><xbrli:instant>2020-01-31</xbrli:instant></xbrli:period>
+    </xbrli:context>
+    <uk-gaap:Turnover contextRef="c1" unitRef="GBP" decimals="0">1000</uk-gaap:Turnover>
+    <uk-gaap:Profit contextRef="c2" unitRef="GBP" decimals="0">200</uk-gaap:Profit>
+    <uk-gaap:Name contextRef="c2">Company</uk-gaap:Name>
+    <xbrli:unit id="GBP"><xbrli:measure>iso4217:GBP</xbrli:measure></xbrli:unit>
+    <uk-gaap:Staff contextRef="c1" unitRef="GBP" decimals="0">5</uk-gaap:Staff>
+    <xbrli:context id="c2">
+        <xbrli:period><xbrli:instant>2021-01-31</xbrli:instant></xbrli:period>
+    </xbrli:context>
+    <uk-gaap:Loss contextRef="c3" unitRef="GBP" decimals="0">3</uk-gaap:Loss>
+</xbrli:xbrl>"""
+
+
+def test_iter_facts():
+    parser = LXMLStreamParser(io.StringIO(LATE_CONTEXT_XBRL))
+    facts = list(parser.iter_facts())
+    # facts waiting for a context or unit come after the facts read before it
+    assert [f.name for f in facts] == ["Staff", "Turnover", "Profit", "Name", "Loss"]
+    for fact in facts[:4]:
+        assert isinstance(fact.context, ixbrlContext)
+    assert facts[0].unit == "iso4217:GBP"
+    assert facts[2].context.instant == date(2021, 1, 31)
+    # the context is never defined
+    assert facts[4].context == "c3"
+    assert parser.numeric == []
+    assert parser.nonnumeric == []
+
+    expected = IXBRL(io.StringIO(LATE_CONTEXT_XBRL), engine="lxml-stream")
+    assert sorted(f.to_json()["name"] for f in facts) == sorted(
+        f.name for f in [*expected.numeric, *expected.nonnumeric]
+    )
+    assert {f.name: f.value for f in facts} == {
+        f.name: f.value for f in [*expected.numeric, *expected.nonnumeric]
+    }
+
+
+def test_iter_facts_max_spill():
+    parser = LXMLStreamParser(io.StringIO(LATE_CONTEXT_XBRL))
+    facts = list(parser.iter_facts(max_spill=1))
+    # Turnover and Profit had to be given out before their unit was read
+    assert [f.name for f in facts] == ["Turnover", "Profit", "Staff", "Name", "Loss"]
+    assert facts[0].unit == "GBP"
+    assert facts[1].unit == "GBP"
+    assert facts[1].context == "c2"
+    assert isinstance(facts[3].context, ixbrlContext)
+
+
+def test_iter_facts_undefined_context():
+    # most facts refer to contexts and units which are never defined
+    facts = "\n".join(
+        f'<uk-gaap:Turnover contextRef="{context}" unitRef="{unit}" decimals="0">'
+        f"{i}</uk-gaap:Turnover>"
+        for i, (context, unit) in enumerate(
+            [("c1", "USD"), ("c9", "GBP"), ("c9", "USD"), ("c1", "GBP")] * 250
+        )
+    )
+    content = LATE_CONTEXT_XBRL.replace("</xbrli:xbrl>", facts + "</xbrli:xbrl>")
+    parser = LXMLStreamParser(io.StringIO(content))
+    sizes = []
+    count = 0
+    for _ in parser.iter_facts(max_spill=10):
+        count += 1
+        sizes.append(
+            (len(parser._spill), sum(len(keys) for keys in parser._waiting.values()))
+        )
+    assert count == 1005
+    # every fact which leaves the spill buffer stops waiting for its references
+    assert max(spill for spill, _ in sizes) <= 10
+    assert max(waiting for _, waiting in sizes) <= 20
+    assert parser._spill == {}
+    assert parser._waiting == {}
+
+
+def test_on_fact():
+    facts = []
+    x = IXBRL.open(TEST_XML_ACCOUNTS[0], engine="lxml-stream", on_fact=facts.append)
+    expected = IXBRL.open(TEST_XML_ACCOUNTS[0], engine="lxml-stream")
+    assert x.numeric == []
+    assert x.nonnumeric == []
+    assert x.contexts.keys() == expected.contexts.keys()
+    # facts waiting for a context are given out once it is read, so the order
+    # can differ from the order in the document
+    assert sorted(json.dumps(f.to_json(), default=str) for f in facts) == sorted(
+        json.dumps(f.to_json(), default=str)
+        for f in [*expected.numeric, *expected.nonnumeric]
+    )
+    assert x.stats.facts == len(facts)
+
+
+def test_on_fact_engine():
+    with pytest.raises(ValueError):
+        IXBRL.open(TEST_XML_ACCOUNTS[0], on_fact=print)
+    with pytest.raises(ValueError):
+        IXBRL.open(
+            TEST_XML_ACCOUNTS[0], engine="lxml-stream", cache="cache", on_fact=print
+        )
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        IXBRL.open(TEST_ACCOUNTS[0], engine="flurg")
+
+
+@pytest.mark.parametrize("account", [TEST_ACCOUNTS[0], TEST_XML_ACCOUNTS[0]])
+def test_single_walk(account, monkeypatch):
+    walks = []
+    original_walk = IXBRLParser._walk
+
+    def counting_walk(self):
+        walks.append(self)
+        return original_walk(self)
+
+    monkeypatch.setattr(IXBRLParser, "_walk", counting_walk)
+    x = IXBRL.open(account)
+    assert len(walks) == 1
+    assert x.numeric
+    assert x.nonnumeric
+
+
+CONTINUATION_LINKS = 5000
+
+
+def _continuation_document(links: int, *, loop: bool = False) -> str:
+    continuations = "".join(
+        f'<ix:continuation id="c{i}" continuedAt="c{i + 1}">{i} </ix:continuation>'
+        for i in range(links - 1)
+    )
+    last_continued_at = ' continuedAt="c0"' if loop else ""
+    return f"""<html xmlns:ix="http://www.xbrl.org/2013/inlineXBRL"><body>
+        <ix:header><ix:resources>
+            <xbrli:context xmlns:xbrli="http://www.xbrl.org/2003/instance" id="d1">
+                <xbrli:period><xbrli:instant>2020-01-31</xbrli:instant></xbrli:period>
+            </xbrli:context>
+        </ix:resources></ix:header>
+        <ix:nonNumeric name="ns5:Report" contextRef="d1" continuedAt="c0">
+            start </ix:nonNumeric>
+        {continuations}
+        <ix:continuation id="c{links - 1}"{last_continued_at}>end</ix:continuation>
+    </body></html>"""
+
+
+@pytest.fixture(scope="module")
+def long_continuation_chain() -> str:
+    # a linear scan per link would make this quadratic in the document size
+    return _continuation_document(CONTINUATION_LINKS)
+
+
+@pytest.mark.parametrize("engine", ["bs4", "lxml-stream"])
+def test_long_continuation_chain(long_continuation_chain, engine):
+    x = IXBRL(io.StringIO(long_continuation_chain), engine=engine)
+
+    assert len(x.nonnumeric) == 1
+    value = x.nonnumeric[0].value
+    assert value.startswith("start 0 1 2 ")
+    assert value.endswith(f" {CONTINUATION_LINKS - 2} end")
+
+
+@pytest.mark.parametrize("engine", ["bs4", "lxml-stream"])
+def test_continuation_loop(engine):
+    content = _continuation_document(10, loop=True)
+    with pytest.raises(IXBRLParseError):
+        IXBRL(io.StringIO(content), engine=engine)
+
+    x = IXBRL(io.StringIO(content), raise_on_error=False, engine=engine)
+    assert len(x.errors) == 1
+    assert not x.nonnumeric
+
+
+@pytest.mark.parametrize("account", [TEST_ACCOUNTS[0], TEST_XML_ACCOUNTS[0]])
+def test_keep_source_false(account):
+    x = IXBRL.open(account)
+    y = IXBRL.open(account, keep_source=False)
+    assert y.soup is None
+    assert y.parser.soup is None
+    assert y.to_json() == x.to_json()
+    for fact in [*y.numeric, *y.nonnumeric]:
+        assert fact.soup_tag is None
+        assert fact.source is not None
+        assert fact.source.name is not None
+    assert y.numeric[0].source.name == (
+        f"{x.numeric[0].soup_tag.prefix}:{x.numeric[0].soup_tag.name}"
+        if x.numeric[0].soup_tag.prefix
+        else x.numeric[0].soup_tag.name
+    )
+
+
+def test_keep_source_false_errors(monkeypatch):
+    soups = []
+    make_soup = ixbrlparse.core.BeautifulSoup
+
+    def soup(*args, **kwargs):
+        result = make_soup(*args, **kwargs)
+        soups.append(weakref.ref(result))
+        return result
+
+    monkeypatch.setattr(ixbrlparse.core, "BeautifulSoup", soup)
+    x = IXBRL.open(TEST_ACCOUNTS[6], raise_on_error=False, keep_source=False)
+    assert x.soup is None
+    # the tracebacks of the errors don't keep the document alive
+    gc.collect()
+    assert len(soups) == 1
+    assert soups[0]() is None
+    assert x.errors[0].error.__traceback__ is None
+    assert len(x.errors) == 1
+    assert x.errors[0].element is None
+    assert x.errors[0].source.name == "ix:nonFraction"
+    assert x.errors[0].source.index == 150
+
+
+@pytest.mark.parametrize("account", [*TEST_ACCOUNTS[:7], *TEST_XML_ACCOUNTS])
+def test_keep_source_false_index(account):
+    # both engines give each element the same index in the document
+    x = IXBRL.open(account, raise_on_error=False, keep_source=False)
+    y = IXBRL.open(account, raise_on_error=False, engine="lxml-stream")
+    x_sources = [f.source for f in [*x.numeric, *x.nonnumeric]]
+    y_sources = [f.source for f in [*y.numeric, *y.nonnumeric]]
+    assert all(isinstance(s.index, int) for s in x_sources)
+    assert [(s.id, s.index) for s in x_sources] == [(s.id, s.index) for s in y_sources]
+    assert [e.source.index for e in x.errors] == [e.source.index for e in y.errors]
+    # line numbers are only known to the lxml-stream engine
+    assert all(s.line is None for s in x_sources)
+    assert all(isinstance(s.line, int) for s in y_sources)
+
+
+@pytest.mark.parametrize("account", [*TEST_ACCOUNTS[:6], *TEST_XML_ACCOUNTS[:1]])
+@pytest.mark.parametrize("engine", ["bs4", "lxml-stream"])
+def test_to_result(account, engine):
+    x = IXBRL.open(account, engine=engine)
+    result = x.to_result()
+    assert isinstance(result, IXBRLResult)
+    assert result.filetype == x.filetype
+    assert result.to_json() == x.to_json()
+    assert result.to_table("all") == x.to_table("all")
+    for fact in [*result.numeric, *result.nonnumeric]:
+        assert fact.soup_tag is None
+        assert fact.source is not None
+    if engine == "bs4":
+        # the original document keeps its source
+        assert x.soup is not None
+        assert all(fact.soup_tag is not None for fact in x.numeric)
+
+    y = pickle.loads(pickle.dumps(result))  # noqa: S301
+    assert y.to_json() == x.to_json()
+    assert y.facts.value("CurrentAssets") == x.facts.value("CurrentAssets")
+    # contexts are still shared between facts
+    for fact in y.numeric:
+        if isinstance(fact.context, ixbrlContext):
+            assert fact.context is y.contexts[fact.context.id]
+
+
+def test_to_result_errors():
+    x = IXBRL.open(TEST_ACCOUNTS[6], raise_on_error=False)
+    result = pickle.loads(pickle.dumps(x.to_result()))  # noqa: S301
+    assert result.errors == [
+        ixbrlErrorSummary(
+            type="NotImplementedError",
+            message=str(x.errors[0].error),
+            context=None,
+            source=ixbrlSource(name="ix:nonFraction", index=150),
+        )
+    ]
+    assert result.to_json()["errors"] == 1
+
+
+@pytest.mark.parametrize(
+    ("engine", "phases"),
+    [
+        (
+            "bs4",
+            ["soup", "walk", "schema", "contexts", "units", "nonnumeric", "numeric"],
+        ),
+        ("lxml-stream", ["parse"]),
+    ],
+)
+def test_stats(engine, phases):
+    x = IXBRL.open(TEST_ACCOUNTS[0], engine=engine)
+    assert list(x.stats.phases) == phases
+    assert x.stats.documents == 1
+    assert x.stats.facts == len(x.numeric) + len(x.nonnumeric)
+    assert x.stats.errors == 0
+    assert x.stats.seconds == sum(p.seconds for p in x.stats.phases.values())
+    if engine == "bs4":
+        assert x.stats.phases["numeric"].facts == len(x.numeric)
+        assert x.stats.phases["nonnumeric"].facts == len(x.nonnumeric)
+
+    stats = x.stats.to_json()
+    assert json.loads(json.dumps(stats)) == stats
+    assert x.to_result().stats is x.stats
+
+    y = IXBRL.open(TEST_ACCOUNTS[0], engine=engine, keep_source=False)
+    assert list(y.stats.phases) == [*phases, "release"]
+
+
+@pytest.mark.parametrize("engine", ["bs4", "lxml-stream"])
+def test_stats_given(engine):
+    # the same statistics can be passed to more than one document
+    stats = ParseStats()
+    x = IXBRL.open(TEST_ACCOUNTS[0], engine=engine, stats=stats)
+    assert x.stats is stats
+    with open(TEST_ACCOUNTS[0], "rb") as a:
+        y = IXBRL.from_bytes(a.read(), engine=engine, stats=stats)
+    assert y.stats is stats
+    assert stats.facts == 2 * (len(x.numeric) + len(x.nonnumeric))
+    with pytest.raises(ValueError):
+        IXBRL.open(TEST_ACCOUNTS[0], cache="cache", stats=stats)
+
+
+@pytest.mark.parametrize("engine", ["bs4", "lxml-stream"])
+def test_stats_errors(engine):
+    x = IXBRL.open(TEST_ACCOUNTS[6], raise_on_error=False, engine=engine)
+    assert x.stats.errors == len(x.errors) == 1
+    if engine == "bs4":
+        assert x.stats.phases["numeric"].errors == 1
+
+
+def test_stats_cache(tmp_path):
+    x = IXBRL.open(TEST_ACCOUNTS[0], cache=tmp_path)
+    assert "soup" in x.stats.phases
+    y = IXBRL.open(TEST_ACCOUNTS[0], cache=tmp_path)
+    assert list(y.stats.phases) == ["cache"]
+    assert y.stats.facts == x.stats.facts
+
+
+def test_batch_stats():
+    stats = BatchStats(slowest=2)
+    for i, seconds in enumerate([0.2, 0.5, 0.1, 0.3]):
+        stats.add(f"file{i}", ParseStats(phases={"parse": PhaseStats(seconds, i, 0)}))
+    stats.add("failed", None)
+    assert stats.total.documents == 4
+    assert stats.total.facts == 0 + 1 + 2 + 3
+    assert stats.failed == 1
+    assert [filename for filename, _ in stats.slowest] == ["file1", "file3"]
+    assert stats.to_json()["slowest"][0] == {
+        "filename": "file1",
+        "seconds": 0.5,
+        "facts": 1,
+        "errors": 0,
+    }
+
+
+@pytest.mark.parametrize("account", [TEST_ACCOUNTS[6], TEST_XML_ACCOUNTS[1]])
+def test_lxml_stream_engine_source(account):
+    x = IXBRL.open(account, raise_on_error=False, engine="lxml-stream")
+    for fact in [*x.numeric, *x.nonnumeric]:
+        assert fact.source is not None
+        assert isinstance(fact.source.line, int)
+    assert len(x.errors) == 1
+    assert x.errors[0].source is not None
+
+
+@pytest.mark.parametrize("engine", ["bs4", "lxml-stream"])
+def test_iter_zip(tmp_path, engine):
+    archive = tmp_path / "accounts.zip"
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as z:
+        z.write(TEST_ACCOUNTS[0], "2024/account_1.html")
+        z.write(TEST_XML_ACCOUNTS[0], "2024/account_1.xml")
+        z.writestr("2024/readme.txt", "not an account")
+        z.writestr("2025/", "")
+
+    results = list(IXBRL.iter_zip(archive, engine=engine))
+    assert [name for name, _ in results] == [
+        "2024/account_1.html",
+        "2024/account_1.xml",
+    ]
+    for (_, x), account in zip(
+        results, [TEST_ACCOUNTS[0], TEST_XML_ACCOUNTS[0]], strict=True
+    ):
+        assert x.to_json() == IXBRL.open(account).to_json()
+
+
+@pytest.mark.parametrize("engine", ["bs4", "lxml-stream"])
+@pytest.mark.parametrize("account", [TEST_ACCOUNTS[0], TEST_XML_ACCOUNTS[0]])
+@pytest.mark.parametrize("buffer_type", [bytes, bytearray, memoryview])
+def test_from_bytes(engine, account, buffer_type):
+    with open(account, "rb") as a:
+        data = a.read()
+    x = IXBRL.from_bytes(buffer_type(data), engine=engine)
+    assert x.to_json() == IXBRL.open(account, engine=engine).to_json()
+
+
+@pytest.mark.parametrize("engine", ["bs4", "lxml-stream"])
+@pytest.mark.parametrize("account", [TEST_ACCOUNTS[0], TEST_XML_ACCOUNTS[0]])
+def test_open_mmap(engine, account):
+    x = IXBRL.open(account, engine=engine, mmap=True)
+    assert x.to_json() == IXBRL.open(account, engine=engine).to_json()
+
+
+def test_open_mmap_empty(tmp_path):
+    empty = tmp_path / "empty.html"
+    empty.write_bytes(b"")
+    with pytest.raises(IXBRLParseError):
+        IXBRL.open(empty, mmap=True, engine="lxml-stream")
+
+
+def test_buffer_reader():
+    data = b"<xbrl></xbrl>"
+    with BufferReader(data) as reader:
+        # the whole of a bytes object isn't copied
+        assert reader.read() is data
+    with BufferReader(memoryview(data)) as reader:
+        assert reader.read(5) == b"<xbrl"
+        assert reader.read() == b"></xbrl>"
+        assert reader.read() == b""
+
+    buffer = bytearray(data)
+    reader = BufferReader(buffer)
+    reader.close()
+    # the buffer is no longer exported, so can be resized
+    buffer.extend(b"\n")
+
+
+@pytest.mark.parametrize("account", [TEST_ACCOUNTS[4], TEST_XML_ACCOUNTS[0]])
+@pytest.mark.parametrize("indent", [None, 2, 4])
+@pytest.mark.parametrize(
+    "use_orjson",
+    [
+        False,
+        pytest.param(
+            True, marks=pytest.mark.skipif(orjson is None, reason="needs orjson")
+        ),
+    ],
+)
+def test_write_json(account, indent, use_orjson):
+    if use_orjson and indent not in (None, 2):
+        pytest.skip("indent not supported by orjson")
+    x = IXBRL.open(account)
+    expected = x.to_json()
+
+    buffer = io.StringIO()
+    x.write_json(buffer, indent=indent, inline_contexts=True, use_orjson=use_orjson)
+    assert json.loads(buffer.getvalue()) == expected
+    if indent is not None:
+        # non-ASCII characters such as "£" are escaped, as by json.dump()
+        assert buffer.getvalue() == json.dumps(expected, indent=indent)
+
+    buffer = io.StringIO()
+    x.write_json(buffer, indent=indent, use_orjson=use_orjson)
+    data = json.loads(buffer.getvalue())
+    assert data["contexts"] == expected["contexts"]
+    for fact, expected_fact in zip(data["numeric"], expected["numeric"], strict=True):
+        assert fact["context"] == expected_fact["context"]["id"]
+        assert data["contexts"][fact["context"]] == expected_fact["context"]
+
+
+def test_write_json_orjson_indent():
+    x = IXBRL.open(TEST_ACCOUNTS[0])
+    with pytest.raises((ValueError, ImportError)):
+        x.write_json(io.StringIO(), indent=4, use_orjson=True)
+
+
+@pytest.mark.parametrize("engine", ["bs4", "lxml-stream"])
+def test_fact_index(engine):
+    x = IXBRL.open(TEST_ACCOUNTS[0], engine=engine)
+    facts = x.facts
+    assert facts is x.facts
+    assert len(facts) == len(x.numeric) + len(x.nonnumeric)
+
+    current_assets = facts.by_name("CurrentAssets")
+    assert [f.value for f in current_assets] == [2909.0, 4585.0]
+    assert facts.by_name("uk-core:CurrentAssets") == current_assets
+    assert facts.by_name("uk-bus:CurrentAssets") == ()
+    assert facts.by_name("NotAConcept") == ()
+
+    assert all(f.context.id == "icur1" for f in facts.by_context("icur1"))
+    assert len(facts.by_context("icur1")) == len(
+        [f for f in facts if f.context.id == "icur1"]
+    )
+    assert facts.by_period("2017-10-31") == facts.by_period(date(2017, 10, 31))
+    assert all(
+        date(2017, 10, 31) in (f.context.instant, f.context.enddate)
+        for f in facts.by_period("2017-10-31")
+    )
+    assert len(facts.by_schema("uk-core")) == len(
+        [f for f in x.numeric + x.nonnumeric if f.schema == "uk-core"]
+    )
+
+
+def test_fact_index_value():
+    x = IXBRL.open(TEST_ACCOUNTS[0])
+    assert x.facts.current_period == date(2017, 10, 31)
+    assert x.facts.value("CurrentAssets") == 2909.0
+    assert x.facts.value("uk-core:CurrentAssets") == 2909.0
+    assert x.facts.value("CurrentAssets", "2016-10-31") == 4585.0
+    assert x.facts.value("CurrentAssets", "2015-10-31") is None
+    assert x.facts.value("NotAConcept", default=0) == 0
+    assert x.facts.get("CurrentAssets").context.id == "icur1"
+
+
+def test_fact_index_dimensions():
+    x = IXBRL.open(TEST_ACCOUNTS[4])
+    for name in {f.name for f in x.numeric if f.context.segments}:
+        fact = x.facts.get(name)
+        assert fact is None or not fact.context.segments
+
+
+@pytest.mark.parametrize("engine", ["bs4", "lxml-stream"])
+def test_fact_index_by_dimension(engine):
+    x = IXBRL.open(TEST_ACCOUNTS[4], engine=engine)
+    dimension = "core:EquityClassesDimension"
+    member = "core:RetainedEarningsAccumulatedLosses"
+    expected = [
+        f
+        for f in x.numeric + x.nonnumeric
+        if (dimension, member) in f.context.dimensions
+    ]
+    assert expected
+    facts = x.facts.by_dimension(dimension, member)
+    assert set(map(id, facts)) == set(map(id, expected))
+    assert x.facts.by_dimension("EquityClassesDimension", member) == facts
+    assert (
+        x.facts.by_dimension(
+            "EquityClassesDimension", "RetainedEarningsAccumulatedLosses"
+        )
+        == facts
+    )
+    assert set(map(id, facts)) < set(map(id, x.facts.by_dimension(dimension)))
+    assert x.facts.by_dimension(dimension, "core:NotAMember") == ()
+
+    contexts = x.facts.contexts_by_dimension(dimension, member)
+    assert {c.id for c in contexts} == {
+        c.id for c in x.contexts.values() if (dimension, member) in c.dimensions
+    }
@@ -4,8 +4,14 @@ import pytest
 
 from ixbrlparse import hookimpl
 from ixbrlparse.components._base import ixbrlFormat
-from ixbrlparse.components.formats import ixtDateDayMonthYear, ixtZeroDash
-from ixbrlparse.components.transform import get_format
+from ixbrlparse.components.formats import (
+    ixtDateDayMonthYear,
+    ixtNumComma,
+    ixtNumDotDecimal,
+    ixtZeroDash,
+)
+from ixbrlparse.components.numeric import ixbrlNumeric, parse_numeric_values
+from ixbrlparse.components.transform import format_registry, get_format
 from ixbrlparse.plugins import pm
 
 
@@ -118,6 +124,37 @@ def test_registering_duplicate_plugin_first():
         pm.unregister(name="flurg")
 
 
+def test_format_registry_cached():
+    formats = format_registry.formats
+    assert get_format("zerodash") == ixtZeroDash
+    assert format_registry.formats is formats
+
+
+def test_format_registry_invalidated():
+    class FlurgFormat(ixbrlFormat):
+        format_names = ("flurg",)
+
+    class TestPlugin:
+        @hookimpl
+        def ixbrl_add_formats(self) -> list[type[ixbrlFormat]]:
+            return [FlurgFormat]
+
+    with pytest.raises(NotImplementedError):
+        get_format("flurg")
+
+    pm.register(TestPlugin(), name="flurg")
+    try:
+        assert get_format("flurg") == FlurgFormat
+        assert get_format("ixt:flurg") == FlurgFormat
+    finally:
+        pm.unregister(name="flurg")
+
+    with pytest.raises(NotImplementedError):
+        get_format("flurg")
+    with pytest.raises(NotImplementedError):
+        get_format("ixt:flurg")
+
+
 @pytest.mark.parametrize(
     "datestring, expecteddate",
     (
@@ -147,3 +184,80 @@ def test_plugin_override_date(datestring, expecteddate):
         assert format_class("datedaymonthyear").parse_value(datestring) == expecteddate
     finally:
         pm.unregister(name="flurg")
+
+
+def test_plugin_parse_values():
+    calls = []
+
+    class TestPlugin:
+        @hookimpl
+        def ixbrl_parse_values(self, format_, values):
+            calls.append((format_, list(values)))
+            if format_.format != "numdotdecimal":
+                return None
+            return [float(v.replace(",", "")) * 2 for v in values]
+
+    facts = [
+        ixbrlNumeric(text="1,000", format="ixt:numdotdecimal", parse=False),
+        ixbrlNumeric(text="500", format="ixt:zerodash", parse=False),
+        ixbrlNumeric(text="2,000", format="ixt:numdotdecimal", parse=False),
+    ]
+    pm.register(TestPlugin(), name="flurg")
+    try:
+        assert parse_numeric_values(facts) == [None, None, None]
+    finally:
+        pm.unregister(name="flurg")
+
+    assert [f.value for f in facts] == [2000, 0, 4000]
+    assert [values for _, values in calls] == [["1,000", "2,000"], ["500"]]
+
+
+def test_plugin_parse_values_error():
+    class TestPlugin:
+        @hookimpl
+        def ixbrl_parse_values(self, format_, values):  # noqa: ARG002
+            msg = "Batch failed"
+            raise ValueError(msg)
+
+    facts = [
+        ixbrlNumeric(text="1,000", parse=False),
+        ixbrlNumeric(text="blurdy-burg", parse=False),
+    ]
+    pm.register(TestPlugin(), name="flurg")
+    try:
+        errors = parse_numeric_values(facts)
+    finally:
+        pm.unregister(name="flurg")
+
+    # the values are parsed one at a time with the format instead
+    assert facts[0].value == 1000
+    assert errors[0] is None
+    assert facts[1].value is None
+    assert isinstance(errors[1], ValueError)
+
+
+@pytest.mark.parametrize("base", (ixtNumComma, ixtNumDotDecimal))
+def test_plugin_override_parse_value(base):
+    class FlurgFormat(base):
+        def parse_value(self, value):  # noqa: ARG002
+            return 42.0
+
+    class TestPlugin:
+        @hookimpl
+        def ixbrl_add_formats(self) -> list[type[ixbrlFormat]]:
+            return [FlurgFormat]
+
+    format_name = f"ixt:{base.format_names[0]}"
+    pm.register(TestPlugin(), name="flurg")
+    try:
+        facts = [
+            ixbrlNumeric(text=text, format=format_name, parse=False)
+            for text in ("1.234,5", "1,0")
+        ]
+        assert parse_numeric_values(facts) == [None, None]
+        single = [ixbrlNumeric(text=f.text, format=format_name).value for f in facts]
+    finally:
+        pm.unregister(name="flurg")
+
+    # the batch gives the same values as parsing each value on its own
+    assert [f.value for f in facts] == single == [42.0, 42.0]
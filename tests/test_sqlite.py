@@ -0,0 +1,111 @@
+import sqlite3
+import zipfile
+
+import pytest
+from click.testing import CliRunner
+
+from ixbrlparse import IXBRL
+from ixbrlparse.cli import ixbrlparse_cli
+from ixbrlparse.sqlite import DEFAULT_CHUNK_SIZE, TABLES, SQLiteWriter, document_tables
+
+
+def test_document_tables():
+    x = IXBRL.open("tests/test_accounts/account_1.html")
+    tables = document_tables(x)
+    assert set(tables) == set(TABLES)
+    for table, rows in tables.items():
+        assert all(len(row) == len(TABLES[table]) for row in rows)
+    assert len(tables["contexts"]) == len(x.contexts)
+    assert len(tables["numeric"]) == len(x.numeric)
+    assert len(tables["nonnumeric"]) == len(x.nonnumeric)
+    assert ("GBP", "iso4217:GBP") in tables["units"]
+    assert (
+        "dcur1",
+        0,
+        "explicitMember",
+        "uk-bus:EntityOfficersDimension",
+        "uk-bus:Director1",
+    ) in tables["segments"]
+
+    numeric = document_tables(x, "numeric")
+    assert numeric["nonnumeric"] == []
+    assert numeric["numeric"] == tables["numeric"]
+
+
+def test_sqlite_writer(tmp_path):
+    database = tmp_path / "accounts.db"
+    x = IXBRL.open("tests/test_accounts/account_1.html")
+    with SQLiteWriter(database, chunksize=1) as writer:
+        assert writer.add_document("account_1.html", x) == 1
+        assert writer.add("missing.html", error="FileNotFoundError") == 2
+
+    with SQLiteWriter(database) as writer:
+        assert writer.add_document("account_1.html", x) == 3
+
+    db = sqlite3.connect(database)
+    assert db.execute(
+        "SELECT document_id, filename, schema, error FROM documents"
+    ).fetchall() == [
+        (1, "account_1.html", x.schema, None),
+        (2, "missing.html", None, "FileNotFoundError"),
+        (3, "account_1.html", x.schema, None),
+    ]
+    assert db.execute(
+        "SELECT n.value, n.unit, c.instant FROM numeric n "
+        "JOIN contexts c USING (document_id, context_id) "
+        "WHERE n.document_id = 1 AND n.name = 'CurrentAssets' "
+        "ORDER BY c.instant DESC LIMIT 1"
+    ).fetchone() == (2909.0, "iso4217:GBP", "2017-10-31")
+    assert db.execute(
+        "SELECT COUNT(*) FROM nonnumeric WHERE document_id = 3"
+    ).fetchone() == (len(x.nonnumeric),)
+    indexes = {
+        row[0]
+        for row in db.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    }
+    assert "numeric_name" in indexes
+
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_cli_sqlite(tmp_path, workers):
+    database = tmp_path / "accounts.db"
+    with zipfile.ZipFile(tmp_path / "accounts.zip", "w") as z:
+        z.write("tests/test_accounts/account_1.html", "account_1.html")
+
+    runner = CliRunner()
+    result = runner.invoke(
+        ixbrlparse_cli,
+        [
+            "sqlite",
+            "--workers",
+            workers,
+            str(database),
+            "tests/test_accounts/account_1.html",
+            "tests/test_accounts/account_errors.html",
+            str(tmp_path / "accounts.zip"),
+        ],
+    )  # type: ignore
+    assert result.exit_code == 1
+
+    db = sqlite3.connect(database)
+    documents = db.execute(
+        "SELECT filename, error IS NOT NULL FROM documents ORDER BY document_id"
+    ).fetchall()
+    assert documents == [
+        ("tests/test_accounts/account_1.html", 0),
+        ("tests/test_accounts/account_errors.html", 1),
+        (str(tmp_path / "accounts.zip" / "account_1.html"), 0),
+    ]
+    counts = db.execute(
+        "SELECT document_id, COUNT(*) FROM numeric GROUP BY document_id"
+    ).fetchall()
+    assert counts[0][1] == counts[1][1]
+    assert [c[0] for c in counts] == [1, 3]
+
+
+def test_cli_sqlite_help():
+    runner = CliRunner()
+    result = runner.invoke(ixbrlparse_cli, ["sqlite", "--help"])  # type: ignore
+    assert result.exit_code == 0
+    # the default is given in the help text, as the CLI doesn't import the writer
+    assert f"(defaults to {DEFAULT_CHUNK_SIZE})" in " ".join(result.output.split())